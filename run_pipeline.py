@@ -26,6 +26,9 @@ USAGE:
     
     # Dry run (show what would be executed)
     python run_pipeline.py --dry-run
+    
+    # Rerun phases even if their outputs are cached
+    python run_pipeline.py --force
 
 REQUIREMENTS:
     - Python 3.7+
@@ -33,12 +36,24 @@ REQUIREMENTS:
     - PostgreSQL + PostGIS (for database steps)
 """
 
+import asyncio
+import gc
+import hashlib
+import importlib
+import importlib.util
+import json
+import multiprocessing
+import os
 import sys
 import subprocess
+import threading
 import time
+import traceback
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple, Optional
-import argparse
+from types import SimpleNamespace
+from typing import Dict, FrozenSet, List, Optional, Sequence, Set, Tuple
 
 
 # =============================================================================
@@ -58,22 +73,59 @@ class Colors:
     END = '\033[0m'
 
 
+# Escape codes only help on a terminal; keep redirected logs plain
+_USE_COLOR = sys.stdout.isatty()
+
+_STYLE_END = Colors.END if _USE_COLOR else ""
+_HEADER_STYLE = f"{Colors.BOLD}{Colors.CYAN}" if _USE_COLOR else ""
+
+# Line prefixes for the print_* helpers, built once at import time
+_PREFIX = {
+    'success': (Colors.GREEN if _USE_COLOR else "") + "✓ ",
+    'error': (Colors.RED if _USE_COLOR else "") + "✗ ",
+    'warning': (Colors.YELLOW if _USE_COLOR else "") + "⚠ ",
+    'info': (Colors.BLUE if _USE_COLOR else "") + "ℹ ",
+}
+_SUFFIX = _STYLE_END + "\n"
+
+
 # =============================================================================
 # BUILD PIPELINE CONFIGURATION
 # =============================================================================
 
 class BuildPhase:
-    """Configuration for a build phase."""
+    """
+    Configuration for a build phase.
+    
+    Dependencies are declared by the script_path of the prerequisite
+    phases, since several scripts can share the same phase_id.
+    
+    Outputs list the files a phase generates. Only phases that declare
+    outputs are eligible for the build cache; database phases leave them
+    empty because their results depend on the database contents.
+    
+    In-process phases call the script's main() inside the orchestrator
+    itself, reusing its NumPy import; meant for small NumPy generators.
+    Scripts that may launch numba parallel kernels must not run in-process:
+    they would run on an executor thread, and once numba's threading layer
+    is started from a non-main thread the interpreter cannot exit.
+    """
     
     def __init__(self, phase_id: int, name: str, script_path: str,
                  args: List[str], success_message: str,
-                 requires_database: bool = False):
+                 requires_database: bool = False,
+                 depends_on: Optional[List[str]] = None,
+                 outputs: Optional[List[str]] = None,
+                 in_process: bool = False):
         self.phase_id = phase_id
         self.name = name
         self.script_path = script_path
         self.args = args
         self.success_message = success_message
         self.requires_database = requires_database
+        self.depends_on = depends_on or []
+        self.outputs = outputs or []
+        self.in_process = in_process
 
 
 # Define all build phases
@@ -84,7 +136,9 @@ BUILD_PHASES = [
         script_path="src/ingestion/generate_sun_path.py",
         args=["--samples", "1000", "--output-dir", "data/sun_orbit"],
         success_message="Kinematics Built (Sun's orbit)",
-        requires_database=False
+        requires_database=False,
+        outputs=["data/sun_orbit/sun_galactic_orbit.speck",
+                 "data/sun_orbit/sun_galactic_orbit.csv"]
     ),
     BuildPhase(
         phase_id=1,
@@ -92,7 +146,9 @@ BUILD_PHASES = [
         script_path="src/ingestion/generate_cmb_arrow.py",
         args=["--output-dir", "data/cmb_vector"],
         success_message="Vectors Built (CMB arrow)",
-        requires_database=False
+        requires_database=False,
+        outputs=["data/cmb_vector/cmb_velocity_arrow.obj"],
+        in_process=True
     ),
     BuildPhase(
         phase_id=2,
@@ -108,7 +164,8 @@ BUILD_PHASES = [
         script_path="src/ingestion/export_to_speck.py",
         args=["--output", "data/gaia_observed.speck"],
         success_message="Gaia Exported (.speck format)",
-        requires_database=True
+        requires_database=True,
+        depends_on=["src/ingestion/ingest_gaia.py"]
     ),
     BuildPhase(
         phase_id=4,
@@ -116,7 +173,10 @@ BUILD_PHASES = [
         script_path="src/ingestion/generate_laniakea.py",
         args=["--galaxies", "5000", "--flow-rate", "0.2", "--output-dir", "data/laniakea"],
         success_message="Structure Built (Laniakea)",
-        requires_database=False
+        requires_database=False,
+        outputs=["data/laniakea/laniakea_galaxies.speck",
+                 "data/laniakea/laniakea_flows.speck",
+                 "data/laniakea/attractors.json"]
     ),
     BuildPhase(
         phase_id=5,
@@ -124,47 +184,226 @@ BUILD_PHASES = [
         script_path="src/ingestion/export_binary_octree.py",
         args=["--max-depth", "5", "--output-dir", "data/octree"],
         success_message="Octree Generated (binary format)",
-        requires_database=True
+        requires_database=True,
+        depends_on=["src/ingestion/ingest_gaia.py"]
     )
 ]
 
 
+def select_phases(phases: Sequence[BuildPhase], include_database: bool,
+                  selected_phases: Optional[FrozenSet[int]] = None
+                  ) -> Tuple[BuildPhase, ...]:
+    """
+    Filter phases by phase ID and database requirement.
+    
+    Args:
+        phases: Candidate phases in declaration order
+        include_database: Whether database-dependent phases may run
+        selected_phases: Phase IDs to keep (None = all)
+    
+    Returns:
+        Phases that should run, in declaration order
+    """
+    return tuple(
+        phase for phase in phases
+        if (selected_phases is None or phase.phase_id in selected_phases)
+        and (include_database or not phase.requires_database)
+    )
+
+
+def compute_execution_levels(phases: Sequence[BuildPhase]) -> List[List[BuildPhase]]:
+    """
+    Group phases into levels that can run concurrently (Kahn's algorithm).
+    
+    Every phase in a level only depends on phases from earlier levels.
+    Dependencies on phases that are not part of this run are treated as
+    already satisfied (e.g. `--phases 5` against an ingested database).
+    Phases keep their declaration order within each level.
+    
+    Args:
+        phases: Phases selected for this run
+    
+    Returns:
+        List of levels, each a list of phases
+    
+    Raises:
+        ValueError: If the dependencies contain a cycle
+    """
+    selected = {p.script_path for p in phases}
+    remaining = {
+        p.script_path: {d for d in p.depends_on if d in selected}
+        for p in phases
+    }
+    
+    levels = []
+    pending = list(phases)
+    while pending:
+        level = [p for p in pending if not remaining[p.script_path]]
+        if not level:
+            cycle = ', '.join(p.script_path for p in pending)
+            raise ValueError(f"Circular phase dependencies: {cycle}")
+        
+        done = {p.script_path for p in level}
+        pending = [p for p in pending if p.script_path not in done]
+        for p in pending:
+            remaining[p.script_path] -= done
+        levels.append(level)
+    
+    return levels
+
+
+def critical_path(phases: Sequence[BuildPhase],
+                  durations: Dict[str, float]) -> Tuple[float, List[BuildPhase]]:
+    """
+    Find the longest chain of dependent phases, weighted by duration.
+    
+    Phases must be in topological order (as produced by
+    compute_execution_levels), so one pass suffices:
+    finish[v] = duration[v] + max(finish[u] for u in dependencies of v).
+    
+    Args:
+        phases: Phases in topological order
+        durations: Wall time in seconds keyed by script_path
+    
+    Returns:
+        Tuple of (critical path length in seconds, phases on that path)
+    """
+    finish = {}
+    previous = {}
+    for phase in phases:
+        start, before = 0.0, None
+        for dep in phase.depends_on:
+            if dep in finish and finish[dep] > start:
+                start, before = finish[dep], dep
+        finish[phase.script_path] = start + durations.get(phase.script_path, 0.0)
+        previous[phase.script_path] = before
+    
+    if not finish:
+        return 0.0, []
+    
+    by_path = {p.script_path: p for p in phases}
+    end = max(finish, key=finish.get)
+    path = []
+    node = end
+    while node is not None:
+        path.append(by_path[node])
+        node = previous[node]
+    
+    return finish[end], path[::-1]
+
+
 # =============================================================================
 # UTILITY FUNCTIONS
 # =============================================================================
 
+# Serializes output lines from phases that run in parallel
+_output_lock = threading.Lock()
+
+
 def print_header(text: str):
     """Print a formatted header."""
-    line = "=" * 70
-    print(f"\n{Colors.BOLD}{Colors.CYAN}{line}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.CYAN}{text.center(70)}{Colors.END}")
-    print(f"{Colors.BOLD}{Colors.CYAN}{line}{Colors.END}\n")
+    line = _HEADER_STYLE + "=" * 70 + _STYLE_END
+    sys.stdout.write(f"\n{line}\n{_HEADER_STYLE}{text.center(70)}{_STYLE_END}\n{line}\n\n")
+
+
+def _emit(kind: str, text: str):
+    """Write one status line using the precomputed prefix for its kind."""
+    sys.stdout.write(_PREFIX[kind] + text + _SUFFIX)
 
 
 def print_success(text: str):
     """Print a success message."""
-    print(f"{Colors.GREEN}✓ {text}{Colors.END}")
+    _emit('success', text)
 
 
 def print_error(text: str):
     """Print an error message."""
-    print(f"{Colors.RED}✗ {text}{Colors.END}")
+    _emit('error', text)
 
 
 def print_warning(text: str):
     """Print a warning message."""
-    print(f"{Colors.YELLOW}⚠ {text}{Colors.END}")
+    _emit('warning', text)
 
 
 def print_info(text: str):
     """Print an info message."""
-    print(f"{Colors.BLUE}ℹ {text}{Colors.END}")
+    _emit('info', text)
 
 
 # =============================================================================
 # ENVIRONMENT VALIDATION
 # =============================================================================
 
+# Directories and files the build needs, besides the phase scripts
+REQUIRED_DIRS = [
+    "src/ingestion",
+    "src/db",
+    "src/assets",
+    "data"
+]
+REQUIRED_FILES = [
+    "src/db/schema.sql",
+    "requirements.txt"
+]
+
+
+def required_paths() -> List[str]:
+    """Every path check_environment() requires: directories, files and phase scripts."""
+    return REQUIRED_DIRS + REQUIRED_FILES + [phase.script_path for phase in BUILD_PHASES]
+
+
+def find_existing_paths(paths: List[str]) -> Set[str]:
+    """
+    Check which paths exist using one directory listing per parent.
+    
+    Paths are grouped by parent directory and each parent is listed once
+    with os.scandir, replacing one stat() call per path. The six phase
+    scripts in src/ingestion/ share a single listing.
+    
+    Args:
+        paths: Relative or absolute paths to check
+    
+    Returns:
+        Set of the input paths that exist
+    """
+    listings: Dict[str, Set[str]] = {}
+    existing = set()
+    
+    for path in paths:
+        parent, name = os.path.split(os.path.normpath(path))
+        parent = parent or os.curdir
+        
+        if parent not in listings:
+            try:
+                with os.scandir(parent) as entries:
+                    listings[parent] = {entry.name for entry in entries}
+            except OSError:
+                listings[parent] = set()
+        
+        if name in listings[parent]:
+            existing.add(path)
+    
+    return existing
+
+
+def _package_version(name: str) -> str:
+    """
+    Look up the installed version of a package without importing it.
+    
+    Args:
+        name: Distribution name
+    
+    Returns:
+        Version string, or 'unknown' if it cannot be determined
+    """
+    try:
+        from importlib import metadata
+        return metadata.version(name)
+    except ImportError:
+        return 'unknown'
+
+
 def check_environment() -> bool:
     """
     Validate environment and dependencies.
@@ -178,104 +417,512 @@ def check_environment() -> bool:
     
     # Check Python version
     python_version = sys.version_info
+    version_text = f"{python_version.major}.{python_version.minor}.{python_version.micro}"
     if python_version >= (3, 7):
-        print_success(f"Python version: {python_version.major}.{python_version.minor}.{python_version.micro}")
+        print_success(f"Python version: {version_text}")
     else:
-        print_error(f"Python version: {python_version.major}.{python_version.minor}.{python_version.micro} (requires 3.7+)")
+        print_error(f"Python version: {version_text} (requires 3.7+)")
         all_valid = False
     
+    script_paths = [phase.script_path for phase in BUILD_PHASES]
+    existing = find_existing_paths(required_paths())
+    
     # Check for required directories
-    required_dirs = [
-        "src/ingestion",
-        "src/db",
-        "src/assets",
-        "data"
-    ]
-    
-    for dir_path in required_dirs:
-        path = Path(dir_path)
-        if path.exists():
+    for dir_path in REQUIRED_DIRS:
+        if dir_path in existing:
             print_success(f"Directory exists: {dir_path}")
         else:
             print_error(f"Directory missing: {dir_path}")
             all_valid = False
     
     # Check for required files
-    required_files = [
-        "src/db/schema.sql",
-        "requirements.txt"
-    ]
-    
-    for file_path in required_files:
-        path = Path(file_path)
-        if path.exists():
+    for file_path in REQUIRED_FILES:
+        if file_path in existing:
             print_success(f"File exists: {file_path}")
         else:
             print_error(f"File missing: {file_path}")
             all_valid = False
     
-    # Check for NumPy
-    try:
-        import numpy
-        print_success(f"NumPy installed: {numpy.__version__}")
-    except ImportError:
+    # Check for NumPy without importing it: it is only imported when an
+    # in-process phase actually runs (fully cached runs never need it)
+    if importlib.util.find_spec('numpy') is not None:
+        print_success(f"NumPy installed: {_package_version('numpy')}")
+    else:
         print_error("NumPy not installed (run: pip install --user numpy)")
         all_valid = False
     
     # Check for all build scripts
-    for phase in BUILD_PHASES:
-        path = Path(phase.script_path)
-        if path.exists():
-            print_success(f"Script exists: {phase.script_path}")
+    for script_path in script_paths:
+        if script_path in existing:
+            print_success(f"Script exists: {script_path}")
         else:
-            print_error(f"Script missing: {phase.script_path}")
+            print_error(f"Script missing: {script_path}")
             all_valid = False
     
     return all_valid
 
 
+# =============================================================================
+# BUILD CACHE
+# =============================================================================
+
+# Manifests of phases whose outputs are up to date
+BUILD_CACHE_DIR = Path("data/.build_cache")
+
+
+def phase_cache_key(phase: BuildPhase) -> str:
+    """
+    Compute the cache key of a phase from its script and arguments.
+    
+    Args:
+        phase: BuildPhase to key
+    
+    Returns:
+        Hex digest identifying (script_path, script mtime, args)
+    """
+    mtime_ns = os.stat(phase.script_path).st_mtime_ns
+    key = hashlib.blake2b(digest_size=16)
+    key.update(phase.script_path.encode())
+    key.update(str(mtime_ns).encode())
+    key.update(json.dumps(phase.args).encode())
+    return key.hexdigest()
+
+
+def file_digest(path: str) -> str:
+    """
+    Hash the contents of a file.
+    
+    Args:
+        path: File to hash
+    
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.blake2b()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def is_phase_cached(phase: BuildPhase, cache_dir: Path = BUILD_CACHE_DIR) -> bool:
+    """
+    Check whether a phase's outputs are intact from an identical earlier run.
+    
+    Args:
+        phase: BuildPhase to check
+        cache_dir: Directory holding the manifests
+    
+    Returns:
+        True if the manifest exists and every output matches its hash
+    """
+    if not phase.outputs:
+        return False
+    
+    try:
+        manifest_path = cache_dir / f"{phase_cache_key(phase)}.json"
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        return all(
+            file_digest(path) == manifest[path]
+            for path in phase.outputs
+        )
+    except (OSError, ValueError, KeyError):
+        return False
+
+
+def write_phase_manifest(phase: BuildPhase, cache_dir: Path = BUILD_CACHE_DIR):
+    """
+    Record the outputs of a successful phase in the build cache.
+    
+    Phases without declared outputs are not cached.
+    
+    Args:
+        phase: BuildPhase that just succeeded
+        cache_dir: Directory holding the manifests
+    """
+    if not phase.outputs:
+        return
+    
+    try:
+        manifest = {path: file_digest(path) for path in phase.outputs}
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        manifest_path = cache_dir / f"{phase_cache_key(phase)}.json"
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+    except OSError as e:
+        print_warning(f"Could not update build cache: {e}")
+
+
+def environment_sentinel(cache_dir: Path = BUILD_CACHE_DIR) -> Optional[Path]:
+    """
+    Locate the marker left by a successful environment check.
+    
+    The name is keyed by the requirements.txt mtime, the Python version,
+    the configured phases, which required paths exist and whether NumPy
+    is installed, so any of those changing forces a new check. The path
+    and NumPy probes are the cheap part of check_environment() (one
+    directory listing per parent, no imports), so they run every time.
+    
+    Args:
+        cache_dir: Directory holding the marker
+    
+    Returns:
+        Path of the marker, or None if requirements.txt cannot be read
+    """
+    try:
+        mtime_ns = os.stat("requirements.txt").st_mtime_ns
+    except OSError:
+        return None
+    
+    key = hashlib.blake2b(digest_size=16)
+    key.update(mtime_ns.to_bytes(8, 'little'))
+    key.update(sys.version.encode())
+    for phase in BUILD_PHASES:
+        key.update(json.dumps([phase.script_path, phase.args]).encode())
+    key.update(json.dumps(sorted(find_existing_paths(required_paths()))).encode())
+    key.update(b'numpy' if importlib.util.find_spec('numpy') is not None else b'')
+    return cache_dir / f"env_validated_{key.hexdigest()}"
+
+
 # =============================================================================
 # SCRIPT EXECUTION
 # =============================================================================
 
-def run_script(script_path: str, args: List[str], dry_run: bool = False) -> Tuple[bool, Optional[str]]:
+def script_module_name(script_path: str) -> str:
     """
-    Execute a Python script with arguments.
+    Derive the importable module name of a build script.
+    
+    Args:
+        script_path: Path to Python script relative to the repository root
+    
+    Returns:
+        Dotted module name (e.g. 'src.ingestion.generate_sun_path')
+    """
+    return '.'.join(Path(script_path).with_suffix('').parts)
+
+
+class _PrefixedStream:
+    """Text stream wrapper that prepends a prefix to every output line."""
+    
+    def __init__(self, stream, prefix: str, lock: Optional[threading.Lock] = None):
+        self._stream = stream
+        self._prefix = prefix
+        self._lock = lock
+        self._pending = ""
+    
+    def write(self, text: str) -> int:
+        # Complete lines go out in one write so concurrent workers never
+        # split each other's lines
+        self._pending += text
+        if '\n' in self._pending:
+            complete, _, self._pending = self._pending.rpartition('\n')
+            self._emit(complete + '\n')
+        return len(text)
+    
+    def flush(self):
+        if self._pending:
+            self._emit(self._pending)
+            self._pending = ""
+        self._stream.flush()
+    
+    def _emit(self, text: str):
+        lines = text.splitlines(keepends=True)
+        text = ''.join(self._prefix + line for line in lines)
+        if self._lock is None:
+            self._stream.write(text)
+            self._stream.flush()
+        else:
+            with self._lock:
+                self._stream.write(text)
+                self._stream.flush()
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+
+class _ThreadRoutedStream:
+    """Stand-in for sys.stdout/sys.stderr that lets each thread pick its target."""
+    
+    def __init__(self, default):
+        self.default = default
+        self._local = threading.local()
+    
+    def route(self, stream):
+        """Send the calling thread's output to `stream` (None = default)."""
+        self._local.stream = stream
+    
+    def _target(self):
+        return getattr(self._local, 'stream', None) or self.default
+    
+    def write(self, text: str) -> int:
+        return self._target().write(text)
+    
+    def flush(self):
+        self._target().flush()
+    
+    def __getattr__(self, name):
+        return getattr(self._target(), name)
+
+
+# Number of in-process phases currently routing their output
+_routed_phases = 0
+_routing_lock = threading.Lock()
+
+
+@contextmanager
+def _route_thread_output(prefix: str):
+    """
+    Prefix the calling thread's stdout/stderr for the duration of the block.
+    
+    sys.stdout and sys.stderr are replaced by _ThreadRoutedStream while at
+    least one in-process phase is running, so other threads (and the
+    orchestrator's own messages) keep writing unprefixed.
+    """
+    global _routed_phases
+    with _routing_lock:
+        if _routed_phases == 0:
+            sys.stdout = _ThreadRoutedStream(sys.stdout)
+            sys.stderr = _ThreadRoutedStream(sys.stderr)
+        _routed_phases += 1
+        stdout, stderr = sys.stdout, sys.stderr
+    
+    out = _PrefixedStream(stdout.default, prefix, _output_lock)
+    err = _PrefixedStream(stderr.default, prefix, _output_lock)
+    stdout.route(out)
+    stderr.route(err)
+    try:
+        yield
+    finally:
+        out.flush()
+        err.flush()
+        stdout.route(None)
+        stderr.route(None)
+        with _routing_lock:
+            _routed_phases -= 1
+            if _routed_phases == 0:
+                sys.stdout, sys.stderr = stdout.default, stderr.default
+
+
+def _call_main(module_name: str, args: List[str]) -> Optional[int]:
+    """
+    Import a build script and call its main().
+    
+    Args:
+        module_name: Dotted module name of the script
+        args: List of command-line arguments passed to main()
+    
+    Returns:
+        Exit code of the script, or None if it has no main() entry point
+    """
+    try:
+        module = importlib.import_module(module_name)
+        entry_point = getattr(module, 'main', None)
+        if not callable(entry_point):
+            return None
+        entry_point(args)
+        return 0
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except Exception:
+        traceback.print_exc()
+        return 1
+
+
+def _run_module_main(module_name: str, args: List[str], prefix: str = "") -> Optional[int]:
+    """
+    Import a build script and call its main() inside a pool worker.
+    
+    Args:
+        module_name: Dotted module name of the script
+        args: List of command-line arguments passed to main()
+        prefix: Optional text prepended to every output line
+    
+    Returns:
+        Exit code of the script, or None if it has no main() entry point
+    """
+    saved_stdout, saved_stderr = sys.stdout, sys.stderr
+    sys.stdout = _PrefixedStream(saved_stdout, prefix)
+    sys.stderr = _PrefixedStream(saved_stderr, prefix)
+    try:
+        return _call_main(module_name, args)
+    finally:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        sys.stdout, sys.stderr = saved_stdout, saved_stderr
+
+
+# Number of in-process phases running with the garbage collector resumed
+_gc_lock = threading.Lock()
+_gc_phases = 0
+_gc_resumed = False
+
+
+@contextmanager
+def _resume_gc():
+    """
+    Re-enable the cyclic garbage collector while an in-process phase runs.
+    
+    BuildOrchestrator.run() pauses the collector for its own bookkeeping;
+    build scripts run arbitrary NumPy code and keep the normal collector.
+    The pause is restored once the last in-process phase finishes.
+    """
+    global _gc_phases, _gc_resumed
+    with _gc_lock:
+        if _gc_phases == 0 and not gc.isenabled():
+            gc.enable()
+            _gc_resumed = True
+        _gc_phases += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_phases -= 1
+            if _gc_phases == 0 and _gc_resumed:
+                gc.disable()
+                _gc_resumed = False
+
+
+def _run_in_process(module_name: str, args: List[str], prefix: str = "") -> Optional[int]:
+    """
+    Call a build script's main() in the orchestrator process.
+    
+    Args:
+        module_name: Dotted module name of the script
+        args: List of command-line arguments passed to main()
+        prefix: Optional text prepended to every output line
+    
+    Returns:
+        Exit code of the script, or None if it has no main() entry point
+    """
+    with _route_thread_output(prefix), _resume_gc():
+        return _call_main(module_name, args)
+
+
+# Thread-count variables honoured by the BLAS/OpenMP backends NumPy uses
+BLAS_THREAD_VARS = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+
+
+@contextmanager
+def limit_blas_threads(concurrent_phases: int):
+    """
+    Share the CPUs between phases that run at the same time.
+    
+    Without a limit every phase's BLAS starts one thread per CPU. The
+    variables are read when NumPy is first imported, so this must be
+    entered before any phase starts. Values set by the user are left
+    alone; the ones set here are removed again on exit, so callers of
+    main(argv) keep their environment.
+    
+    Args:
+        concurrent_phases: Largest number of phases running at once
+    """
+    threads = str(max(1, (os.cpu_count() or 1) // max(1, concurrent_phases)))
+    added = [var for var in BLAS_THREAD_VARS if var not in os.environ]
+    for var in added:
+        os.environ[var] = threads
+    try:
+        yield
+    finally:
+        for var in added:
+            os.environ.pop(var, None)
+
+
+def create_worker_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Create the pool of Python workers that execute build scripts.
+    
+    Workers are forked from a forkserver that has already imported NumPy,
+    so each phase skips interpreter startup and the NumPy import.
+    
+    Args:
+        max_workers: Number of worker processes
+    
+    Returns:
+        Process pool executor
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context('forkserver')
+        context.set_forkserver_preload(['numpy'])
+    else:
+        context = multiprocessing.get_context()
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+def run_script(script_path: str, args: List[str], dry_run: bool = False,
+               prefix: str = "",
+               pool: Optional[Executor] = None,
+               in_process: bool = False) -> Tuple[bool, Optional[str]]:
+    """
+    Execute a Python script with arguments, streaming its output.
+    
+    With in_process the script's main() is called in this process; with a
+    worker pool it is called inside a pool worker. Otherwise (or if the
+    script has no main()) it runs in a fresh interpreter, whose stdout and
+    stderr are merged and echoed line by line as they arrive.
     
     Args:
         script_path: Path to Python script
         args: List of command-line arguments
         dry_run: If True, only show what would be executed
+        prefix: Optional text prepended to every output line (used to tell
+            apart phases that run in parallel)
+        pool: Optional worker pool from create_worker_pool()
+        in_process: Call the script's main() in the orchestrator process
     
     Returns:
         Tuple of (success: bool, error_message: Optional[str])
     """
-    cmd = [sys.executable, script_path] + args
+    # -u: unbuffered child stdout, otherwise lines arrive in 4-8 KiB blocks
+    cmd = [sys.executable, '-u', script_path] + args
     
     if dry_run:
         print_info(f"Would execute: {' '.join(cmd)}")
         return True, None
     
     try:
-        # Execute script
-        result = subprocess.run(
+        returncode = None
+        if in_process:
+            returncode = _run_in_process(script_module_name(script_path), args, prefix)
+        elif pool is not None:
+            # Workers write to the same terminal; emit our pending output first
+            sys.stdout.flush()
+            returncode = pool.submit(
+                _run_module_main, script_module_name(script_path), args, prefix
+            ).result()
+        
+        if returncode is not None:
+            if returncode != 0:
+                return False, f"Script failed with exit code {returncode}"
+            return True, None
+        
+        # Execute script. close_fds=False (with no cwd, env or preexec_fn)
+        # lets subprocess use posix_spawn instead of fork+exec; our own
+        # descriptors are non-inheritable, so nothing leaks to the child
+        with subprocess.Popen(
             cmd,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            check=True
-        )
+            bufsize=1,
+            close_fds=False
+        ) as proc:
+            # Print output as it is produced
+            for line in proc.stdout:
+                with _output_lock:
+                    sys.stdout.write(prefix + line)
+                    sys.stdout.flush()
+            returncode = proc.wait()
         
-        # Print output
-        if result.stdout:
-            print(result.stdout)
+        if returncode != 0:
+            return False, f"Script failed with exit code {returncode}"
         
         return True, None
-        
-    except subprocess.CalledProcessError as e:
-        error_msg = f"Script failed with exit code {e.returncode}"
-        if e.stderr:
-            error_msg += f"\n{e.stderr}"
-        return False, error_msg
     
     except Exception as e:
         return False, str(e)
@@ -290,7 +937,10 @@ class BuildOrchestrator:
     
     def __init__(self, include_database: bool = False, 
                  selected_phases: Optional[List[int]] = None,
-                 dry_run: bool = False):
+                 dry_run: bool = False,
+                 max_workers: Optional[int] = None,
+                 use_workers: bool = True,
+                 use_cache: bool = True):
         """
         Initialize orchestrator.
         
@@ -298,86 +948,208 @@ class BuildOrchestrator:
             include_database: Whether to include database-dependent steps
             selected_phases: Optional list of phase IDs to run (None = all)
             dry_run: If True, only show what would be executed
+            max_workers: Maximum phases to run concurrently (None = CPU count)
+            use_workers: Run scripts in a persistent worker pool instead of
+                starting a fresh interpreter per phase
+            use_cache: Skip phases whose outputs are cached from an
+                identical earlier run
         """
         self.include_database = include_database
-        self.selected_phases = selected_phases
+        self.selected_phases = frozenset(selected_phases) if selected_phases else None
         self.dry_run = dry_run
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.use_workers = use_workers
+        self.use_cache = use_cache
+        
+        # The phase filter only depends on the options above
+        self._phases_to_run = select_phases(BUILD_PHASES, include_database,
+                                            self.selected_phases)
         
         self.completed_phases = []
+        self.phase_durations: Dict[str, float] = {}
         self.failed_phase = None
         self.start_time = None
     
-    def should_run_phase(self, phase: BuildPhase) -> bool:
-        """
-        Determine if a phase should be executed.
-        
-        Args:
-            phase: BuildPhase to check
-        
-        Returns:
-            True if phase should run
-        """
-        # Check if phase is in selected phases
-        if self.selected_phases is not None:
-            if phase.phase_id not in self.selected_phases:
-                return False
-        
-        # Check database requirement
-        if phase.requires_database and not self.include_database:
-            return False
-        
-        return True
-    
     def run(self) -> bool:
         """
         Execute the full build pipeline.
         
+        The cyclic garbage collector is paused for the orchestrator's own
+        bookkeeping: it creates many short-lived objects but no cycles worth
+        collecting midway, so one collection at the end is enough. It is
+        resumed while in-process phases run (see _resume_gc()).
+        
         Returns:
             True if all phases succeeded, False otherwise
         """
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._run()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+            gc.collect()
+    
+    def _run(self) -> bool:
+        """Execute the pipeline (see run())."""
         self.start_time = time.time()
         
         print_header("EPISTEMIC ENGINE - BUILD PIPELINE")
         
         print_info(f"Configuration:")
         print(f"  - Include database steps: {self.include_database}")
-        print(f"  - Selected phases: {self.selected_phases or 'All'}")
+        selected = sorted(self.selected_phases) if self.selected_phases else 'All'
+        print(f"  - Selected phases: {selected}")
         print(f"  - Dry run: {self.dry_run}")
+        print(f"  - Max parallel jobs: {self.max_workers}")
+        print(f"  - Build cache: {self.use_cache}")
         print()
         
-        # Filter phases to run
-        phases_to_run = [p for p in BUILD_PHASES if self.should_run_phase(p)]
+        phases_to_run = self._phases_to_run
         
         if not phases_to_run:
             print_warning("No phases selected to run!")
             return False
         
-        print_info(f"Will execute {len(phases_to_run)} build phases\n")
+        levels = compute_execution_levels(phases_to_run)
+        
+        print_info(f"Will execute {len(phases_to_run)} build phases "
+                   f"in {len(levels)} levels\n")
+        
+        if self.dry_run:
+            return self._preview(levels, len(phases_to_run))
+        
+        # Levels give a topological order; the scheduler itself only waits
+        # on each phase's own dependencies
+        ordered = [phase for level in levels for phase in level]
+        widest = max(len(level) for level in levels)
         
-        # Execute each phase
-        for i, phase in enumerate(phases_to_run, 1):
-            print_header(f"STEP {i}/{len(phases_to_run)}: {phase.name}")
+        with limit_blas_threads(min(widest, self.max_workers)):
+            pool = None
+            if self.use_workers:
+                pool = create_worker_pool(min(self.max_workers, len(phases_to_run)))
             
-            if self.dry_run:
+            try:
+                return asyncio.run(self._run_scheduled(ordered, pool))
+            finally:
+                if pool is not None:
+                    pool.shutdown()
+    
+    def _preview(self, levels: List[List[BuildPhase]], total: int) -> bool:
+        """
+        Show what each phase would execute, in execution order.
+        
+        Args:
+            levels: Phases grouped by compute_execution_levels()
+            total: Number of phases to run
+        
+        Returns:
+            True (nothing is executed)
+        """
+        step = 0
+        for level in levels:
+            for phase in level:
+                step += 1
+                print_header(f"STEP {step}/{total}: {phase.name}")
+                
+                if self.use_cache and is_phase_cached(phase):
+                    print_success("cached (outputs unchanged)")
+                    continue
+                
                 print_info(f"Script: {phase.script_path}")
                 print_info(f"Args: {' '.join(phase.args)}")
-            
-            # Execute phase
-            success, error_msg = run_script(phase.script_path, phase.args, self.dry_run)
-            
-            if success:
-                print_success(phase.success_message)
-                self.completed_phases.append(phase)
-            else:
-                print_error(f"FAILED: {phase.name}")
-                if error_msg:
-                    print_error(f"Error: {error_msg}")
-                self.failed_phase = phase
-                return False
+                run_script(phase.script_path, phase.args, dry_run=True)
         
-        # All phases completed successfully
         return True
     
+    async def _run_scheduled(self, phases: Sequence[BuildPhase],
+                             pool: Optional[Executor]) -> bool:
+        """
+        Execute phases as soon as their own dependencies have finished.
+        
+        Each phase waits on the "done" events of the phases it depends on,
+        instead of on every phase of the previous level. At most
+        max_workers phases run at once. After a failure no new phases are
+        started; phases that are already running finish normally.
+        
+        Args:
+            phases: Phases in topological order
+            pool: Optional worker pool passed to run_script()
+        
+        Returns:
+            True if all phases succeeded, False otherwise
+        """
+        loop = asyncio.get_running_loop()
+        done = {p.script_path: asyncio.Event() for p in phases}
+        slots = asyncio.Semaphore(self.max_workers)
+        total = len(phases)
+        step = 0
+        
+        # Prefix output lines whenever phases may overlap
+        prefixed = self.max_workers > 1 and total > 1
+        
+        async def run_phase(phase: BuildPhase, threads: ThreadPoolExecutor):
+            nonlocal step
+            try:
+                for dep in phase.depends_on:
+                    if dep in done:
+                        await done[dep].wait()
+                
+                async with slots:
+                    if self.failed_phase is not None:
+                        return
+                    
+                    step += 1
+                    cached = self.use_cache and is_phase_cached(phase)
+                    with _output_lock:
+                        print_header(f"STEP {step}/{total}: {phase.name}")
+                        if cached:
+                            print_success("cached (outputs unchanged)")
+                            self.completed_phases.append(phase)
+                            return
+                        sys.stdout.flush()
+                    
+                    prefix = f"[{Path(phase.script_path).stem}] " if prefixed else ""
+                    started = time.perf_counter()
+                    success, error_msg = await loop.run_in_executor(
+                        threads, run_script, phase.script_path, phase.args,
+                        False, prefix, pool, phase.in_process and self.use_workers
+                    )
+                    self.phase_durations[phase.script_path] = time.perf_counter() - started
+                    
+                    with _output_lock:
+                        self._record_result(phase, success, error_msg)
+                        sys.stdout.flush()
+            finally:
+                # Also set on failure so dependents wake up and bail out
+                done[phase.script_path].set()
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as threads:
+            await asyncio.gather(*(run_phase(p, threads) for p in phases))
+        
+        return self.failed_phase is None
+    
+    def _record_result(self, phase: BuildPhase, success: bool, error_msg: Optional[str]):
+        """
+        Report the outcome of a phase and update the run state.
+        
+        Args:
+            phase: Phase that finished
+            success: Whether the phase succeeded
+            error_msg: Error message for a failed phase
+        """
+        if success:
+            print_success(phase.success_message)
+            self.completed_phases.append(phase)
+            write_phase_manifest(phase)
+        else:
+            print_error(f"FAILED: {phase.name}")
+            if error_msg:
+                print_error(f"Error: {error_msg}")
+            if self.failed_phase is None:
+                self.failed_phase = phase
+    
     def print_summary(self, success: bool):
         """
         Print build summary.
@@ -397,6 +1169,7 @@ class BuildOrchestrator:
             for phase in self.completed_phases:
                 print(f"  ✓ {phase.success_message}")
             print()
+            self.print_timings()
             print_info("Next steps:")
             print("  1. Review generated data in data/ directory")
             print("  2. Launch OpenSpace with epistemic_engine_profile.asset")
@@ -407,19 +1180,58 @@ class BuildOrchestrator:
             print()
             print(f"Completed phases: {len(self.completed_phases)}/{len(BUILD_PHASES)}")
             print()
+            self.print_timings()
             print_warning("Troubleshooting:")
             print("  1. Check error messages above")
             print("  2. Verify dependencies: pip install -r requirements.txt")
             print("  3. For database steps: Ensure PostgreSQL is running")
             print("  4. Check individual script with: python <script> --help")
+    
+    def print_timings(self):
+        """Print per-phase wall times and the critical path of the run."""
+        timed = [p for p in self._phases_to_run if p.script_path in self.phase_durations]
+        if not timed:
+            return
+        
+        ordered = [p for level in compute_execution_levels(timed) for p in level]
+        path_time, path = critical_path(ordered, self.phase_durations)
+        total_time = sum(self.phase_durations[p.script_path] for p in timed)
+        
+        print("Phase timings:")
+        for phase in timed:
+            print(f"  {self.phase_durations[phase.script_path]:7.2f}s  {phase.name}")
+        print()
+        print(f"Critical path: {path_time:.2f}s "
+              f"({' → '.join(Path(p.script_path).stem for p in path)})")
+        if path_time > 0:
+            print(f"Parallelism: {total_time / path_time:.2f} "
+                  f"(total phase time / critical path)")
+        print()
 
 
 # =============================================================================
 # MAIN ENTRY POINT
 # =============================================================================
 
-def main():
-    """Main entry point."""
+def build_parser():
+    """
+    Build the full argparse parser (used for --help and usage errors).
+    
+    Returns:
+        Configured ArgumentParser
+    """
+    import argparse
+    
+    def positive_int(value: str) -> int:
+        """argparse type for --jobs: an integer of at least 1."""
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+        if number < 1:
+            raise argparse.ArgumentTypeError(f"must be at least 1, got {number}")
+        return number
+    
     parser = argparse.ArgumentParser(
         description="Epistemic Engine Build Pipeline Orchestrator",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -440,6 +1252,9 @@ EXAMPLES:
   # Dry run (show what would be executed)
   python run_pipeline.py --dry-run
   
+  # Rerun phases even if their outputs are cached
+  python run_pipeline.py --force
+  
 PHASES:
   1 - Kinematics (Sun's orbit, CMB vector)
   2 - Gaia Ingestion (requires database)
@@ -454,8 +1269,83 @@ PHASES:
                        help='Comma-separated list of phase IDs to run (e.g., "1,4")')
     parser.add_argument('--dry-run', action='store_true',
                        help='Show what would be executed without running')
+    parser.add_argument('--jobs', type=positive_int,
+                       help='Maximum phases to run in parallel (default: CPU count)')
+    parser.add_argument('--force', action='store_true',
+                       help='Rerun every phase, ignoring the build cache')
+    parser.add_argument('--no-workers', action='store_true',
+                       help='Start a fresh interpreter per phase instead of using the worker pool')
+    parser.add_argument('--force-check', action='store_true',
+                       help='Re-run the environment check even if it passed before')
     
-    args = parser.parse_args()
+    return parser
+
+
+# Command-line flags and value options, mapped to their attribute names
+_CLI_FLAGS = {
+    '--with-database': 'with_database',
+    '--dry-run': 'dry_run',
+    '--force': 'force',
+    '--no-workers': 'no_workers',
+    '--force-check': 'force_check',
+}
+_CLI_OPTIONS = {
+    '--phases': 'phases',
+    '--jobs': 'jobs',
+}
+
+
+def parse_args(argv: Optional[List[str]] = None) -> SimpleNamespace:
+    """
+    Parse command-line arguments.
+    
+    The common case is parsed by hand so a cached no-op run does not pay
+    for importing argparse. Anything else (--help, unknown or abbreviated
+    options, invalid values) is handed to build_parser(), which prints
+    the help text or usage error.
+    
+    Args:
+        argv: Arguments to parse (None = sys.argv[1:])
+    
+    Returns:
+        Namespace with the same attributes argparse would produce
+    """
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    args = SimpleNamespace(**{name: False for name in _CLI_FLAGS.values()},
+                           **{name: None for name in _CLI_OPTIONS.values()})
+    
+    i = 0
+    while i < len(argv):
+        option, has_value, value = argv[i].partition('=')
+        if option in _CLI_FLAGS and not has_value:
+            setattr(args, _CLI_FLAGS[option], True)
+        elif option in _CLI_OPTIONS:
+            if not has_value:
+                i += 1
+                if i == len(argv) or argv[i].startswith('-'):
+                    return build_parser().parse_args(argv)
+                value = argv[i]
+            setattr(args, _CLI_OPTIONS[option], value)
+        else:
+            return build_parser().parse_args(argv)
+        i += 1
+    
+    if args.jobs is not None:
+        try:
+            args.jobs = int(args.jobs)
+        except ValueError:
+            return build_parser().parse_args(argv)
+        if args.jobs < 1:
+            return build_parser().parse_args(argv)
+    
+    return args
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    args = parse_args(argv)
     
     # Parse selected phases
     selected_phases = None
@@ -466,16 +1356,27 @@ PHASES:
             print_error("Invalid phase list. Use comma-separated numbers (e.g., '1,4')")
             sys.exit(1)
     
-    # Check environment
-    if not check_environment():
-        print_error("\nEnvironment check failed! Please fix errors above.")
-        sys.exit(1)
+    # Check environment, unless this exact setup already passed
+    sentinel = environment_sentinel()
+    if args.force_check or sentinel is None or not sentinel.exists():
+        if not check_environment():
+            print_error("\nEnvironment check failed! Please fix errors above.")
+            sys.exit(1)
+        if sentinel is not None:
+            try:
+                sentinel.parent.mkdir(parents=True, exist_ok=True)
+                sentinel.touch()
+            except OSError:
+                pass
     
     # Run build pipeline
     orchestrator = BuildOrchestrator(
         include_database=args.with_database,
         selected_phases=selected_phases,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        max_workers=args.jobs,
+        use_workers=not args.no_workers,
+        use_cache=not args.force
     )
     
     success = orchestrator.run()
@@ -50,12 +50,35 @@ CREATE TABLE IF NOT EXISTS cosmic_objects (
     ingested_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
--- 4. CREATE INDEXES FOR PERFORMANCE
+-- 4. STORED COORDINATE COLUMNS
+-- The components of location (RA, Dec, Distance), extracted once at write
+-- time so exports read plain columns instead of calling ST_X/ST_Y/ST_Z on
+-- every row. Added with ALTER TABLE so existing databases pick them up.
+ALTER TABLE cosmic_objects
+    ADD COLUMN IF NOT EXISTS ra_deg DOUBLE PRECISION
+        GENERATED ALWAYS AS (ST_X(location::geometry)) STORED,
+    ADD COLUMN IF NOT EXISTS dec_deg DOUBLE PRECISION
+        GENERATED ALWAYS AS (ST_Y(location::geometry)) STORED,
+    ADD COLUMN IF NOT EXISTS distance_pc DOUBLE PRECISION
+        GENERATED ALWAYS AS (ST_Z(location::geometry)) STORED;
+
+-- 5. CREATE INDEXES FOR PERFORMANCE
 -- Spatial Index for Cone Searches (Crucial for Octree generation later)
 CREATE INDEX IF NOT EXISTS idx_cosmic_location ON cosmic_objects USING GIST (location);
 
 -- Epistemic Index for "Truth Slider" Filtering
 CREATE INDEX IF NOT EXISTS idx_cosmic_truth ON cosmic_objects (truth_label);
 
--- 5. VERIFICATION COMMENT
+-- Block-range index for coordinate range scans (small; suits bulk-loaded data)
+CREATE INDEX IF NOT EXISTS idx_cosmic_coords ON cosmic_objects
+    USING BRIN (ra_deg, dec_deg, distance_pc);
+
+-- Sky-order index: geohash interleaves the RA/Dec bits (Z-order). Run once
+-- after a bulk load to store the heap in this order, so sequential scans by
+-- bulk exports read spatially clustered rows:
+--   CLUSTER cosmic_objects USING idx_cosmic_geohash;
+CREATE INDEX IF NOT EXISTS idx_cosmic_geohash ON cosmic_objects
+    (ST_GeoHash(location::geometry, 20));
+
+-- 6. VERIFICATION COMMENT
 COMMENT ON TABLE cosmic_objects IS 'The Truth Store: Enforces Epistemic Invariants on all celestial data.';
@@ -13,6 +13,10 @@ OCTREE STRUCTURE:
 - LOD hierarchy: Parent nodes store brightest 10% of stars
 - Splitting rule: If stars > 50,000 AND depth < MAX_DEPTH → split
 - Binary format for fast I/O
+- Stars are fetched once and sorted along a Morton (Z-order) curve, so
+  every node is a contiguous slice (no per-node queries)
+- The root's 8 subtrees are built in parallel worker processes that read
+  the catalog from shared memory
 
 BINARY FILE FORMAT (.bin):
     Header:
@@ -24,11 +28,42 @@ BINARY FILE FORMAT (.bin):
         - magnitude (float32): Apparent magnitude
         - epistemic_status (int32): 0=OBSERVED, 1=INFERRED, 2=SIMULATED
 
+COMPRESSED FORMAT (--compress, requires blosc):
+    Header:
+        - num_stars (int32): Number of stars in this node
+        - compressed_size (int32): Size of the Blosc payload in bytes
+    Body:
+        - The records above, Blosc-compressed (lz4, 4-byte shuffle)
+
+HALF-PRECISION LOD FORMAT (--half-lod):
+    Header (32 bytes, every node file):
+        - num_stars (int32): Number of stars in this node
+        - lod_format (uint8): 0 = float32 records as above, 1 = float16 positions
+        - 3 padding bytes
+        - origin (3 x float32): Position frame origin
+        - extent (3 x float32): Position frame size
+    Body (per star, lod_format 1, used for LOD parent nodes):
+        - position (3 x float16): (position - origin) / extent, in [0, 1]
+        - magnitude (float32): Apparent magnitude
+        - epistemic_status (int32): 0=OBSERVED, 1=INFERRED, 2=SIMULATED
+    Leaves keep lod_format 0 and full float32 positions.
+
 FILE NAMING: {depth}-{x}-{y}-{z}.bin
     Example: 0-0-0-0.bin (root), 1-0-0-0.bin (first child), etc.
 
+PACKED SUBTREES (--pack):
+    Instead of one file per node, each subtree is written to one .pack
+    file named after its root node (e.g. 0-0-0-0.pack, or 1-3.pack for a
+    root octant built by a worker):
+        - payload: the node files above, concatenated
+        - index (per node): node_id (uint64), offset (uint64), nbytes (uint32)
+        - footer: index offset (uint64), node count (uint32)
+    node_id is 1 << (3 * depth) | path (see node_id()).
+
 DEPENDENCIES:
     pip install --user psycopg2-binary numpy
+    pip install --user blosc  # Optional, for --compress
+    pip install --user numba  # Optional, compiles the Morton key kernel
 
 USAGE:
     # Export octree from database
@@ -36,13 +71,28 @@ USAGE:
     
     # Export specific epistemic level
     python export_binary_octree.py --epistemic-filter OBSERVED --max-depth 4
+    
+    # Export Blosc-compressed node files
+    python export_binary_octree.py --compress
+    
+    # Store LOD parent positions as float16
+    python export_binary_octree.py --half-lod
+    
+    # Write one packed file per subtree instead of one file per node
+    python export_binary_octree.py --pack
 """
 
 import argparse
+import contextlib
+import mmap
+import multiprocessing
+import os
 import struct
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from pathlib import Path
-from typing import List, Tuple, Dict, Optional
+from typing import List, Tuple, Dict, Optional, Union
 from dataclasses import dataclass
 
 try:
@@ -53,6 +103,16 @@ except ImportError as e:
     print("Install with: pip install --user psycopg2-binary numpy")
     sys.exit(1)
 
+try:
+    import blosc  # Optional: compressed node files (--compress)
+except ImportError:
+    blosc = None
+
+try:
+    import numba  # Optional: compiled Morton key kernel
+except ImportError:
+    numba = None
+
 
 @dataclass
 class BoundingBox:
@@ -116,14 +176,228 @@ class BoundingBox:
         )
 
 
-@dataclass
-class Star:
-    """Star data for binary export."""
-    position_x: float
-    position_y: float
-    position_z: float
-    magnitude: float
-    epistemic_status: int  # 0=OBSERVED, 1=INFERRED, 2=SIMULATED
+# Header of a .bin node file: number of stars
+NODE_HEADER = struct.Struct('<i')
+# A whole .bin file for a node without stars (common in sparse octants)
+EMPTY_NODE_BYTES = NODE_HEADER.pack(0)
+
+# Header of a compressed .bin node file: number of stars, payload size
+COMPRESSED_NODE_HEADER = struct.Struct('<ii')
+
+# One star record of the .bin body (20 bytes, see BINARY FILE FORMAT)
+STAR_RECORD = np.dtype([
+    ('position', '<f4', 3),      # x, y, z
+    ('magnitude', '<f4'),
+    ('epistemic_status', '<i4')  # 0=OBSERVED, 1=INFERRED, 2=SIMULATED
+])
+
+# Header of a --half-lod node file: number of stars, lod_format, frame
+# origin and extent (see HALF-PRECISION LOD FORMAT)
+LOD_NODE_HEADER = struct.Struct('<iB3x3f3f')
+LOD_FORMAT_FLOAT32 = 0
+LOD_FORMAT_FLOAT16 = 1
+
+# One star record of a lod_format 1 body (14 bytes)
+HALF_STAR_RECORD = np.dtype([
+    ('position', '<f2', 3),      # frame-relative x, y, z in [0, 1]
+    ('magnitude', '<f4'),
+    ('epistemic_status', '<i4')
+])
+
+
+def read_node_binary(path: Path, compressed: bool = False,
+                     half_lod: bool = False) -> np.ndarray:
+    """
+    Read the star records of a .bin node file.
+    
+    Args:
+        path: Node file path
+        compressed: Whether the file was written with --compress
+        half_lod: Whether the file was written with --half-lod
+    
+    Returns:
+        Structured array of STAR_RECORD (float16 positions are promoted
+        back to float32 world coordinates); plain node files are
+        memory-mapped read-only rather than read
+    """
+    if not compressed and not half_lod:
+        with open(path, 'rb') as f:
+            num_stars, = NODE_HEADER.unpack(f.read(NODE_HEADER.size))
+        if not num_stars:
+            return np.empty(0, dtype=STAR_RECORD)
+        # Zero-copy view of the records; pages are loaded as they are used
+        return np.memmap(path, dtype=STAR_RECORD, mode='r',
+                         offset=NODE_HEADER.size, shape=(num_stars,))
+    
+    data = Path(path).read_bytes()
+    if half_lod:
+        num_stars, lod_format, *frame = LOD_NODE_HEADER.unpack_from(data)
+        if lod_format == LOD_FORMAT_FLOAT32:
+            return np.frombuffer(data, dtype=STAR_RECORD, count=num_stars,
+                                 offset=LOD_NODE_HEADER.size)
+        half = np.frombuffer(data, dtype=HALF_STAR_RECORD, count=num_stars,
+                             offset=LOD_NODE_HEADER.size)
+        origin = np.array(frame[:3], dtype=np.float32)
+        extent = np.array(frame[3:], dtype=np.float32)
+        records = np.empty(num_stars, dtype=STAR_RECORD)
+        records['position'] = origin + half['position'].astype(np.float32) * extent
+        records['magnitude'] = half['magnitude']
+        records['epistemic_status'] = half['epistemic_status']
+        return records
+    
+    if blosc is None:
+        raise RuntimeError("Reading compressed node files requires blosc")
+    num_stars, compressed_size = COMPRESSED_NODE_HEADER.unpack_from(data)
+    records = np.empty(num_stars, dtype=STAR_RECORD)
+    if num_stars:
+        payload = data[COMPRESSED_NODE_HEADER.size:COMPRESSED_NODE_HEADER.size + compressed_size]
+        blosc.decompress_ptr(payload, records.ctypes.data)
+    return records
+
+
+def _morton_grid(bounds: BoundingBox, levels: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Per-axis grid origin and cells-per-unit scale of a Morton grid."""
+    cells = 1 << levels
+    lo = np.array([bounds.min_x, bounds.min_y, bounds.min_z], dtype=np.float64)
+    hi = np.array([bounds.max_x, bounds.max_y, bounds.max_z], dtype=np.float64)
+    extent = hi - lo
+    scale = np.divide(cells, extent, out=np.zeros(3), where=extent > 0)
+    return lo, scale
+
+
+def _morton_keys_numpy(xs: np.ndarray, ys: np.ndarray, zs: np.ndarray,
+                       lo: np.ndarray, scale: np.ndarray, levels: int) -> np.ndarray:
+    """NumPy Morton keys: one array pass per axis and interleaved bit."""
+    top = (1 << levels) - 1
+    
+    # Grid cell of each star along each axis (stars outside the bounds
+    # are clamped to the edge cells)
+    axes = []
+    for axis, values in enumerate((xs, ys, zs)):
+        cell = np.floor((values.astype(np.float64) - lo[axis]) * scale[axis])
+        axes.append(np.clip(cell, 0, top).astype(np.uint64))
+    
+    # Interleave one bit per axis per level, most significant level first
+    keys = np.zeros(len(xs), dtype=np.uint64)
+    one = np.uint64(1)
+    for bit in range(levels - 1, -1, -1):
+        for axis in axes:
+            keys = (keys << one) | ((axis >> np.uint64(bit)) & one)
+    return keys
+
+
+if numba is not None:
+    # Script runs compile without the on-disk cache: its entries re-import
+    # the module that wrote them, and src.ingestion is not importable from here
+    @numba.njit(parallel=True, cache=__name__ != '__main__')
+    def _morton_keys_compiled(xs, ys, zs, lo, scale, levels):
+        """Compiled Morton keys: one fused loop over the stars, no temporaries."""
+        top = (1 << levels) - 1
+        keys = np.empty(xs.shape[0], dtype=np.uint64)
+        for i in numba.prange(xs.shape[0]):
+            cx = min(max(np.floor((np.float64(xs[i]) - lo[0]) * scale[0]), 0.0), top)
+            cy = min(max(np.floor((np.float64(ys[i]) - lo[1]) * scale[1]), 0.0), top)
+            cz = min(max(np.floor((np.float64(zs[i]) - lo[2]) * scale[2]), 0.0), top)
+            ix, iy, iz = np.int64(cx), np.int64(cy), np.int64(cz)
+            
+            # At most 3 * MAX_MORTON_DEPTH = 63 bits, so int64 is exact
+            key = np.int64(0)
+            for bit in range(levels - 1, -1, -1):
+                key = (key << 3) | (((ix >> bit) & 1) << 2) | (((iy >> bit) & 1) << 1) | ((iz >> bit) & 1)
+            keys[i] = key
+        return keys
+
+
+def morton_keys(xs: np.ndarray, ys: np.ndarray, zs: np.ndarray,
+                bounds: BoundingBox, levels: int) -> np.ndarray:
+    """
+    Compute Z-order (Morton) keys of star positions.
+    
+    Each key interleaves the bits of the star's grid cell at the given
+    depth, x/y/z bits in octant order (see BoundingBox.get_octant), so
+    each 3-bit digit is the octant index at that level. Uses the compiled
+    kernel when numba is installed.
+    
+    Args:
+        xs, ys, zs: Star positions
+        bounds: Bounding box defining the grid
+        levels: Grid depth (bits per axis)
+    
+    Returns:
+        uint64 key per star
+    """
+    lo, scale = _morton_grid(bounds, levels)
+    if numba is not None:
+        return _morton_keys_compiled(xs, ys, zs, lo, scale, levels)
+    return _morton_keys_numpy(xs, ys, zs, lo, scale, levels)
+
+
+def node_id(depth: int, path: int) -> int:
+    """
+    Unique integer id of an octree node in a .pack index.
+    
+    The octant path (3 bits per level) gets a leading 1 bit marking the
+    depth, so paths of different depths never collide: the root is 1,
+    its children 0o10-0o17.
+    """
+    return (1 << (3 * depth)) | path
+
+
+def node_filename(depth: int, path: int) -> str:
+    """
+    File name of an octree node.
+    
+    The octant path is an integer holding 3 bits per level (root first),
+    so its octal digits are the octant indices: depth 2, path 0o35 is
+    "2-3-5.bin". The root is "0-0-0-0.bin".
+    """
+    if depth == 0:
+        return "0-0-0-0.bin"
+    return f"{depth}-{'-'.join(format(path, f'0{depth}o'))}.bin"
+
+
+class NodePack:
+    """Appends the node files of one subtree to a single .pack file."""
+    
+    INDEX_ENTRY = struct.Struct('<QQI')  # node_id, offset, nbytes
+    FOOTER = struct.Struct('<QI')        # index offset, node count
+    BUFFER_SIZE = 1 << 20                # Nodes are small; batch the writes
+    
+    def __init__(self, path: Path):
+        self.file = open(path, 'wb', buffering=self.BUFFER_SIZE)
+        self.index = []
+        self.offset = 0
+    
+    def add(self, node: int, blob: bytes):
+        """Append one node file, as its node_id() and bytes."""
+        self.file.write(blob)
+        self.index.append((node, self.offset, len(blob)))
+        self.offset += len(blob)
+    
+    def close(self):
+        """Write the index and footer, then close the file."""
+        try:
+            self.file.write(b''.join(self.INDEX_ENTRY.pack(*entry) for entry in self.index))
+            self.file.write(self.FOOTER.pack(self.offset, len(self.index)))
+        finally:
+            self.file.close()
+
+
+def read_node_pack(path: Path) -> Dict[int, bytes]:
+    """
+    Read a .pack file written with --pack.
+    
+    Returns:
+        {node_id: node file bytes}, in the order the nodes were written
+    """
+    data = Path(path).read_bytes()
+    index_offset, count = NodePack.FOOTER.unpack_from(data, len(data) - NodePack.FOOTER.size)
+    nodes = {}
+    for k in range(count):
+        node, offset, nbytes = NodePack.INDEX_ENTRY.unpack_from(
+            data, index_offset + k * NodePack.INDEX_ENTRY.size)
+        nodes[node] = data[offset:offset + nbytes]
+    return nodes
 
 
 class BinaryOctreeBuilder:
@@ -136,12 +410,19 @@ class BinaryOctreeBuilder:
         'SIMULATED': 2
     }
     
+    # Catalog arrays shared with subtree worker processes
+    CATALOG_COLUMNS = ('xs', 'ys', 'zs', 'mags', 'status', 'morton_keys')
+    
     # Octree parameters
     MAX_STARS_PER_NODE = 50000  # Split if more than this
     LOD_PARENT_FRACTION = 0.10  # Keep brightest 10% in parent
+    FETCH_BLOCK_SIZE = 100000    # Rows per round-trip when loading stars
+    MAX_MORTON_DEPTH = 21        # 3 bits per level must fit a uint64 key
+    MMAP_THRESHOLD = 256 * 1024  # Node files above this size are written via mmap
     
     def __init__(self, db_config: Dict[str, str], max_depth: int = 5,
-                 epistemic_filter: Optional[str] = None):
+                 epistemic_filter: Optional[str] = None, compress: bool = False,
+                 workers: int = 1, half_lod: bool = False, pack: bool = False):
         """
         Initialize octree builder.
         
@@ -149,13 +430,35 @@ class BinaryOctreeBuilder:
             db_config: Database connection parameters
             max_depth: Maximum octree depth (default: 5)
             epistemic_filter: Optional filter for epistemic status
+            compress: Blosc-compress node files (requires blosc)
+            workers: Processes building subtrees in parallel (1 = sequential)
+            half_lod: Store LOD parent positions as float16 (--half-lod format)
+            pack: Write one .pack file per subtree instead of one file per node
         """
+        if compress and blosc is None:
+            raise RuntimeError("Compressed export requires blosc "
+                               "(pip install --user blosc)")
+        if compress and half_lod:
+            raise ValueError("--compress and --half-lod cannot be combined")
         self.db_config = db_config
         self.max_depth = max_depth
         self.epistemic_filter = epistemic_filter
+        self.compress = compress
+        self.workers = workers
+        self.half_lod = half_lod
+        self.pack = pack
+        self.node_pack: Optional[NodePack] = None  # Open while building with pack
         self.conn = None
         self.cursor = None
         
+        # Star catalog (parallel arrays, filled by fetch_all_stars)
+        self.xs = np.empty(0, dtype=np.float32)
+        self.ys = np.empty(0, dtype=np.float32)
+        self.zs = np.empty(0, dtype=np.float32)
+        self.mags = np.empty(0, dtype=np.float32)
+        self.status = np.empty(0, dtype=np.int32)
+        self.morton_keys = np.empty(0, dtype=np.uint64)
+        
         # Statistics
         self.total_nodes = 0
         self.total_stars_exported = 0
@@ -179,19 +482,21 @@ class BinaryOctreeBuilder:
         """
         query = """
             SELECT 
-                MIN(ST_X(location::geometry)) AS min_x,
-                MAX(ST_X(location::geometry)) AS max_x,
-                MIN(ST_Y(location::geometry)) AS min_y,
-                MAX(ST_Y(location::geometry)) AS max_y,
-                MIN(ST_Z(location::geometry)) AS min_z,
-                MAX(ST_Z(location::geometry)) AS max_z
+                MIN(ra_deg) AS min_x,
+                MAX(ra_deg) AS max_x,
+                MIN(dec_deg) AS min_y,
+                MAX(dec_deg) AS max_y,
+                MIN(distance_pc) AS min_z,
+                MAX(distance_pc) AS max_z
             FROM cosmic_objects
         """
         
+        params = []
         if self.epistemic_filter:
-            query += f" WHERE truth_label = '{self.epistemic_filter}'"
+            query += " WHERE truth_label = %s"
+            params.append(self.epistemic_filter)
         
-        self.cursor.execute(query)
+        self.cursor.execute(query, params)
         row = self.cursor.fetchone()
         
         # Convert RA/Dec/Distance to Cartesian bounds (already in DB as POINTZ)
@@ -209,78 +514,223 @@ class BinaryOctreeBuilder:
         
         return bounds
     
-    def query_stars_in_bounds(self, bounds: BoundingBox) -> List[Star]:
+    @classmethod
+    def epistemic_status_sql(cls) -> str:
+        """SQL expression mapping truth_label to its EPISTEMIC_MAP code."""
+        cases = ' '.join(f"WHEN '{label}' THEN {code}"
+                         for label, code in cls.EPISTEMIC_MAP.items())
+        return f"CASE truth_label {cases} ELSE 0 END"
+    
+    def fetch_all_stars(self) -> int:
         """
-        Query stars within bounding box.
+        Load all stars into in-memory NumPy arrays in a single query.
         
-        Args:
-            bounds: Bounding box to query
+        Rows are streamed through a server-side cursor in blocks, so the
+        full result set is never held as one Python list. Octree nodes are
+        then partitioned in memory instead of re-querying the database.
         
         Returns:
-            List of Star objects
+            Number of stars loaded
         """
         query = """
             SELECT 
-                ST_X(location::geometry) AS x,
-                ST_Y(location::geometry) AS y,
-                ST_Z(location::geometry) AS z,
+                ra_deg AS x,
+                dec_deg AS y,
+                distance_pc AS z,
                 magnitude_g,
-                truth_label
+                {status} AS epistemic_status
             FROM cosmic_objects
-            WHERE 
-                ST_X(location::geometry) BETWEEN %s AND %s
-                AND ST_Y(location::geometry) BETWEEN %s AND %s
-                AND ST_Z(location::geometry) BETWEEN %s AND %s
-        """
-        
-        params = [
-            bounds.min_x, bounds.max_x,
-            bounds.min_y, bounds.max_y,
-            bounds.min_z, bounds.max_z
-        ]
+        """.format(status=self.epistemic_status_sql())
         
+        params = []
         if self.epistemic_filter:
-            query += " AND truth_label = %s"
+            query += " WHERE truth_label = %s"
             params.append(self.epistemic_filter)
         
-        self.cursor.execute(query, params)
-        rows = self.cursor.fetchall()
-        
-        stars = []
-        for row in rows:
-            x, y, z, mag, truth_label = row
-            stars.append(Star(
-                position_x=float(x),
-                position_y=float(y),
-                position_z=float(z),
-                magnitude=float(mag) if mag is not None else 15.0,
-                epistemic_status=self.EPISTEMIC_MAP.get(truth_label, 0)
-            ))
-        
-        return stars
-    
-    def select_lod_subset(self, stars: List[Star], fraction: float) -> List[Star]:
+        # No ORDER BY: sort_by_morton() reorders the stars in memory, so a
+        # server-side sort would be discarded. On a table CLUSTERed on
+        # idx_cosmic_geohash the sequential scan already returns sky order
+        
+        xs, ys, zs, mags, status = [], [], [], [], []
+        with self.conn.cursor('octree_stars') as cursor:
+            cursor.itersize = self.FETCH_BLOCK_SIZE
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(self.FETCH_BLOCK_SIZE)
+                if not rows:
+                    break
+                
+                x, y, z, mag, epistemic_status = zip(*rows)
+                xs.append(np.array(x, dtype=np.float32))
+                ys.append(np.array(y, dtype=np.float32))
+                zs.append(np.array(z, dtype=np.float32))
+                # Missing magnitudes (None -> NaN) are treated as faint
+                mag = np.array(mag, dtype=np.float32)
+                mags.append(np.where(np.isnan(mag), 15.0, mag).astype(np.float32))
+                status.append(np.array(epistemic_status, dtype=np.int32))
+        
+        def concat(blocks, dtype):
+            return np.concatenate(blocks) if blocks else np.empty(0, dtype=dtype)
+        
+        self.xs = concat(xs, np.float32)
+        self.ys = concat(ys, np.float32)
+        self.zs = concat(zs, np.float32)
+        self.mags = concat(mags, np.float32)
+        self.status = concat(status, np.int32)
+        
+        print(f"✓ Loaded {len(self.xs)} stars")
+        return len(self.xs)
+    
+    def sort_by_morton(self, bounds: BoundingBox):
+        """
+        Reorder the catalog along a Z-order (Morton) curve.
+        
+        Stars are sorted by their morton_keys() at max_depth. After
+        sorting, every octree node is a contiguous slice of the
+        arrays: the stars whose keys share the node's prefix.
+        
+        Args:
+            bounds: Global bounding box defining the grid
+        """
+        if self.max_depth > self.MAX_MORTON_DEPTH:
+            raise ValueError(f"max_depth must be at most {self.MAX_MORTON_DEPTH}")
+        keys = morton_keys(self.xs, self.ys, self.zs, bounds, self.max_depth)
+        
+        order = np.argsort(keys, kind='stable')
+        self.morton_keys = keys[order]
+        self.xs = self.xs[order]
+        self.ys = self.ys[order]
+        self.zs = self.zs[order]
+        self.mags = self.mags[order]
+        self.status = self.status[order]
+    
+    def child_slices(self, node: slice, depth: int) -> List[slice]:
+        """
+        Split a node into its 8 child octants.
+        
+        Requires sort_by_morton(): the children's stars are consecutive
+        runs of the node's slice, found by binary search on the next
+        3-bit digit of the Morton key.
+        
+        Args:
+            node: Slice of the sorted arrays holding the node's stars
+            depth: Depth of the node
+        
+        Returns:
+            List of 8 slices, one per octant
+        """
+        shift = np.uint64(3 * (self.max_depth - depth - 1))
+        octants = (self.morton_keys[node] >> shift) & np.uint64(7)
+        edges = node.start + np.searchsorted(octants, np.arange(1, 8))
+        bounds = [node.start] + edges.tolist() + [node.stop]
+        return [slice(bounds[k], bounds[k + 1]) for k in range(8)]
+    
+    def select_lod_subset(self, node: slice, fraction: float) -> np.ndarray:
         """
         Select brightest fraction of stars for LOD parent node.
         
         Args:
-            stars: Full star list
+            node: Slice of the arrays holding the node's stars
             fraction: Fraction to keep (e.g., 0.10 for 10%)
         
         Returns:
-            Subset of brightest stars
+            Row indices of the brightest stars, brightest first
         """
-        if not stars:
-            return []
+        mags = self.mags[node]
+        if len(mags) == 0:
+            return np.empty(0, dtype=np.intp)
         
-        # Sort by magnitude (lower = brighter)
-        sorted_stars = sorted(stars, key=lambda s: s.magnitude)
+        # Take brightest fraction (lower magnitude = brighter); argpartition
+        # finds them in O(n), then only the kept stars are sorted
+        keep_count = max(1, int(len(mags) * fraction))
+        brightest = np.argpartition(mags, keep_count - 1)[:keep_count]
+        brightest = brightest[np.argsort(mags[brightest], kind='stable')]
+        return node.start + brightest
+    
+    def _gather_records(self, records: np.ndarray, idx: Union[slice, np.ndarray],
+                        mags: np.ndarray, frame: Optional[Tuple[np.ndarray, np.ndarray]] = None):
+        """Gather the stars of a node into a STAR_RECORD (or HALF_STAR_RECORD) array."""
+        for axis, values in enumerate((self.xs, self.ys, self.zs)):
+            if frame is None:
+                records['position'][:, axis] = values[idx]
+            else:
+                origin, extent = frame
+                records['position'][:, axis] = (values[idx] - origin[axis]) / extent[axis]
+        records['magnitude'] = mags
+        records['epistemic_status'] = self.status[idx]
+    
+    def position_frame(self, idx: Union[slice, np.ndarray]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Origin and extent of the box around a node's stars.
         
-        # Take brightest fraction
-        keep_count = max(1, int(len(sorted_stars) * fraction))
-        return sorted_stars[:keep_count]
+        float16 positions are stored relative to this frame, so their
+        precision scales with the node rather than with the catalog.
+        """
+        positions = np.stack([self.xs[idx], self.ys[idx], self.zs[idx]], axis=1)
+        if len(positions) == 0:
+            return np.zeros(3, dtype=np.float32), np.ones(3, dtype=np.float32)
+        origin = positions.min(axis=0).astype(np.float32)
+        extent = (positions.max(axis=0) - origin).astype(np.float32)
+        extent[extent <= 0] = 1.0
+        return origin, extent
+    
+    def _node_layout(self, idx: Union[slice, np.ndarray], num_stars: int,
+                     position_dtype) -> Tuple[bytes, np.dtype, Optional[Tuple[np.ndarray, np.ndarray]]]:
+        """Header bytes, record dtype and position frame of a node file."""
+        if np.dtype(position_dtype) == np.float16:
+            origin, extent = self.position_frame(idx)
+            header = LOD_NODE_HEADER.pack(num_stars, LOD_FORMAT_FLOAT16, *origin, *extent)
+            return header, HALF_STAR_RECORD, (origin, extent)
+        if self.half_lod:
+            header = LOD_NODE_HEADER.pack(num_stars, LOD_FORMAT_FLOAT32, 0, 0, 0, 1, 1, 1)
+            return header, STAR_RECORD, None
+        return NODE_HEADER.pack(num_stars), STAR_RECORD, None
     
-    def export_node_binary(self, stars: List[Star], output_path: Path):
+    def _fill_node_buffer(self, buffer, header: bytes, record: np.dtype,
+                          idx: Union[slice, np.ndarray], mags: np.ndarray,
+                          frame: Optional[Tuple[np.ndarray, np.ndarray]]):
+        """Write the header and star records of a node into a sized buffer."""
+        buffer[:len(header)] = header
+        records = np.frombuffer(buffer, dtype=record, offset=len(header))
+        self._gather_records(records, idx, mags, frame)
+    
+    def _compressed_node_bytes(self, idx: Union[slice, np.ndarray], mags: np.ndarray) -> bytes:
+        """A node file as a Blosc-compressed payload (see COMPRESSED FORMAT)."""
+        records = np.empty(len(mags), dtype=STAR_RECORD)
+        self._gather_records(records, idx, mags)
+        
+        # Every record field is 4 bytes wide, so shuffling 4-byte items
+        # groups the exponent bytes of the floats together
+        payload = b''
+        if len(records):
+            payload = blosc.compress_ptr(
+                records.ctypes.data, records.nbytes // 4, typesize=4,
+                shuffle=blosc.SHUFFLE, cname='lz4'
+            )
+        
+        return COMPRESSED_NODE_HEADER.pack(len(records), len(payload)) + payload
+    
+    def node_bytes(self, idx: Union[slice, np.ndarray], position_dtype=np.float32) -> bytes:
+        """
+        The contents of a node file, assembled in memory.
+        
+        Args:
+            idx: Slice or row indices of the node's stars
+            position_dtype: See export_node_binary()
+        """
+        mags = self.mags[idx]
+        if not len(mags) and not (self.compress or self.half_lod):
+            return EMPTY_NODE_BYTES
+        if self.compress:
+            return self._compressed_node_bytes(idx, mags)
+        
+        header, record, frame = self._node_layout(idx, len(mags), position_dtype)
+        payload = bytearray(len(header) + len(mags) * record.itemsize)
+        self._fill_node_buffer(payload, header, record, idx, mags, frame)
+        return payload
+    
+    def export_node_binary(self, idx: Union[slice, np.ndarray], output_path: Path,
+                           position_dtype=np.float32):
         """
         Export stars to binary file.
         
@@ -291,79 +741,175 @@ class BinaryOctreeBuilder:
                 - float32 magnitude
                 - int32 epistemic_status
         
+        With compression enabled the records are written in the
+        compressed format instead, and with half_lod in the half-precision
+        LOD format (see module docstring).
+        
         Args:
-            stars: List of stars to export
+            idx: Slice or row indices of the stars to export
             output_path: Output .bin file path
+            position_dtype: np.float16 writes frame-relative half-precision
+                positions (lod_format 1)
         """
-        output_path.parent.mkdir(parents=True, exist_ok=True)
+        mags = self.mags[idx]
+        num_stars = len(mags)
+        header, record, frame = self._node_layout(idx, num_stars, position_dtype)
+        size = len(header) + num_stars * record.itemsize
         
-        with open(output_path, 'wb') as f:
-            # Header: number of stars
-            f.write(struct.pack('i', len(stars)))
-            
-            # Body: star data
-            for star in stars:
-                # Pack: 3 floats (position) + 1 float (magnitude) + 1 int (status)
-                # Format: 'ffffi' = 3 * float32 + 1 * float32 + 1 * int32
-                packed = struct.pack(
-                    'ffffi',
-                    star.position_x,
-                    star.position_y,
-                    star.position_z,
-                    star.magnitude,
-                    star.epistemic_status
-                )
-                f.write(packed)
-        
-        self.total_stars_exported += len(stars)
-    
-    def build_octree(self, bounds: BoundingBox, depth: int, 
-                    octant_path: Tuple[int, ...], output_dir: Path):
+        if not self.compress and size > self.MMAP_THRESHOLD:
+            # Large node: size the file and gather the records straight
+            # into its mapped pages
+            with open(output_path, 'w+b') as f:
+                f.truncate(size)
+                with mmap.mmap(f.fileno(), size) as mm:
+                    self._fill_node_buffer(mm, header, record, idx, mags, frame)
+        else:
+            # Small or compressed node: assemble in memory and write it
+            # with one call
+            with open(output_path, 'wb') as f:
+                f.write(self.node_bytes(idx, position_dtype))
+        
+        self.total_stars_exported += num_stars
+    
+    def _export_stars(self, idx: Union[slice, np.ndarray], depth: int, path: int,
+                      output_dir: Path, position_dtype=np.float32):
+        """Write a node's stars to its .bin file, or to the open .pack file."""
+        if self.node_pack is None:
+            self.export_node_binary(idx, output_dir / node_filename(depth, path),
+                                    position_dtype)
+            return
+        
+        self.node_pack.add(node_id(depth, path), self.node_bytes(idx, position_dtype))
+        self.total_stars_exported += len(self.mags[idx])
+    
+    @contextlib.contextmanager
+    def _subtree_pack(self, output_dir: Path, depth: int, path: int):
+        """With pack enabled, collect the nodes written inside into one .pack file."""
+        if not self.pack:
+            yield
+            return
+        
+        pack_name = node_filename(depth, path).replace('.bin', '.pack')
+        self.node_pack = NodePack(output_dir / pack_name)
+        try:
+            yield
+        finally:
+            self.node_pack.close()
+            self.node_pack = None
+    
+    def export_node(self, node: slice, depth: int, path: int,
+                    output_dir: Path) -> Optional[List[slice]]:
         """
-        Recursively build octree structure.
+        Export one octree node.
         
         Args:
-            bounds: Bounding box for current node
+            node: Slice of the Morton-sorted arrays holding this node's stars
             depth: Current depth in octree
-            octant_path: Path tuple (e.g., (0,), (0, 3), (0, 3, 7))
+            path: Octant path, 3 bits per level (see node_filename())
             output_dir: Base output directory
-        """
-        # Query stars in this node
-        stars = self.query_stars_in_bounds(bounds)
-        num_stars = len(stars)
         
-        # Generate node filename
-        if depth == 0:
-            node_file = output_dir / "0-0-0-0.bin"  # Root
-        else:
-            # Format: depth-x-y-z.bin (octant path encoded)
-            path_str = '-'.join(map(str, octant_path))
-            node_file = output_dir / f"{depth}-{path_str}.bin"
+        Returns:
+            The 8 child slices if the node was split, None for a leaf
+        """
+        num_stars = node.stop - node.start
+        node_name = node_filename(depth, path)
         
-        print(f"  Depth {depth}, Octant {octant_path}: {num_stars} stars")
+        print(f"  Depth {depth}, Node {node_name}: {num_stars} stars")
         
         # Check if we should split
         should_split = (
             num_stars > self.MAX_STARS_PER_NODE and
             depth < self.max_depth
         )
+        self.total_nodes += 1
         
-        if should_split:
-            # LOD: Save brightest 10% in parent node for distant viewing
-            lod_stars = self.select_lod_subset(stars, self.LOD_PARENT_FRACTION)
-            self.export_node_binary(lod_stars, node_file)
-            self.total_nodes += 1
-            
-            # Recursively build children
-            for octant_idx in range(8):
-                child_bounds = bounds.get_octant(octant_idx)
-                child_path = octant_path + (octant_idx,)
-                self.build_octree(child_bounds, depth + 1, child_path, output_dir)
-        
-        else:
+        if not should_split:
             # Leaf node: export all stars
-            self.export_node_binary(stars, node_file)
-            self.total_nodes += 1
+            self._export_stars(node, depth, path, output_dir)
+            return None
+        
+        # LOD: Save brightest 10% in parent node for distant viewing
+        # (float16 positions are enough at that distance with --half-lod)
+        lod_idx = self.select_lod_subset(node, self.LOD_PARENT_FRACTION)
+        position_dtype = np.float16 if self.half_lod else np.float32
+        self._export_stars(lod_idx, depth, path, output_dir, position_dtype)
+        return self.child_slices(node, depth)
+    
+    def build_octree(self, node: slice, output_dir: Path,
+                     depth: int = 0, path: int = 0):
+        """
+        Build the octree (or a subtree) depth-first from an explicit stack.
+        
+        With pack enabled, the whole subtree goes into one .pack file.
+        
+        Args:
+            node: Slice of the Morton-sorted arrays holding the subtree's stars
+            output_dir: Base output directory
+            depth: Depth of the subtree root
+            path: Octant path of the subtree root (see node_filename())
+        """
+        with self._subtree_pack(output_dir, depth, path):
+            stack = [(node, depth, path)]
+            while stack:
+                node, depth, path = stack.pop()
+                children = self.export_node(node, depth, path, output_dir)
+                if children is None:
+                    continue
+                
+                # Push in reverse so octant 0 is built first
+                for octant_idx in range(7, -1, -1):
+                    stack.append((children[octant_idx], depth + 1, (path << 3) | octant_idx))
+    
+    def build_octree_parallel(self, node: slice, output_dir: Path):
+        """
+        Build the octree with the root's subtrees in worker processes.
+        
+        The root is exported here; its 8 subtrees are independent and
+        write disjoint files, so each is built by a worker that maps the
+        catalog from shared memory instead of receiving a pickled copy.
+        
+        Args:
+            node: Slice of the Morton-sorted arrays holding all stars
+            output_dir: Base output directory
+        """
+        with self._subtree_pack(output_dir, 0, 0):
+            children = self.export_node(node, 0, 0, output_dir)
+        if children is None:
+            return
+        
+        blocks, catalog = share_catalog(self)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, 8),
+                mp_context=subtree_context(),
+                initializer=_init_subtree_worker,
+                initargs=(catalog, self.subtree_settings())
+            ) as pool:
+                futures = [
+                    pool.submit(_build_subtree, child.start, child.stop,
+                                octant_idx, output_dir)
+                    for octant_idx, child in enumerate(children)
+                ]
+                for future in futures:
+                    nodes, stars = future.result()
+                    self.total_nodes += nodes
+                    self.total_stars_exported += stars
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+    
+    def subtree_settings(self) -> Dict[str, object]:
+        """Parameters a subtree worker needs to rebuild this builder."""
+        return {
+            'max_depth': self.max_depth,
+            'compress': self.compress,
+            'half_lod': self.half_lod,
+            'pack': self.pack,
+            'MAX_STARS_PER_NODE': self.MAX_STARS_PER_NODE,
+            'LOD_PARENT_FRACTION': self.LOD_PARENT_FRACTION,
+            'MMAP_THRESHOLD': self.MMAP_THRESHOLD,
+        }
     
     def build(self, output_dir: Path):
         """
@@ -380,14 +926,30 @@ class BinaryOctreeBuilder:
         print(f"LOD parent fraction: {self.LOD_PARENT_FRACTION * 100}%")
         if self.epistemic_filter:
             print(f"Epistemic filter: {self.epistemic_filter}")
+        if self.compress:
+            print("Compression: blosc (lz4, shuffle)")
+        if self.half_lod:
+            print("LOD parent positions: float16")
+        if self.pack:
+            print("Output: one .pack file per subtree")
+        print(f"Workers: {self.workers}")
         print()
         
         # Get global bounds
         global_bounds = self.get_global_bounds()
         
+        # Load all stars once and sort them along the Morton curve, so
+        # every node is a contiguous slice
+        num_stars = self.fetch_all_stars()
+        self.sort_by_morton(global_bounds)
+        
         # Build octree
         print("\nBuilding octree...")
-        self.build_octree(global_bounds, depth=0, octant_path=(), output_dir=output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        if self.workers > 1:
+            self.build_octree_parallel(slice(0, num_stars), output_dir)
+        else:
+            self.build_octree(slice(0, num_stars), output_dir)
         
         # Statistics
         print(f"\n{'='*60}")
@@ -406,7 +968,100 @@ class BinaryOctreeBuilder:
             self.conn.close()
 
 
-def main():
+# =============================================================================
+# SUBTREE WORKERS
+# =============================================================================
+
+# Builder and shared-memory blocks of a subtree worker process
+_worker_builder: Optional[BinaryOctreeBuilder] = None
+_worker_blocks: List[shared_memory.SharedMemory] = []
+
+
+def subtree_context():
+    """
+    Multiprocessing context for subtree workers.
+    
+    Workers are started from a forkserver (or spawned where forkserver is
+    unavailable) rather than forked from the builder: the compiled Morton
+    kernel starts numba's thread pool in this process, and forking a
+    process with a running thread pool can deadlock.
+    """
+    if 'forkserver' in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('forkserver')
+    return multiprocessing.get_context('spawn')
+
+
+def share_catalog(builder: BinaryOctreeBuilder):
+    """
+    Copy the builder's catalog arrays into shared memory.
+    
+    Returns:
+        (blocks, catalog): the SharedMemory blocks, which the caller must
+        close and unlink, and a picklable {column: (name, dtype, length)}
+        description for attach_catalog()
+    """
+    blocks = []
+    catalog = {}
+    try:
+        for column in builder.CATALOG_COLUMNS:
+            array = getattr(builder, column)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            blocks.append(block)
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+            catalog[column] = (block.name, array.dtype.str, len(array))
+    except BaseException:
+        for block in blocks:
+            block.close()
+            block.unlink()
+        raise
+    return blocks, catalog
+
+
+def attach_catalog(builder: BinaryOctreeBuilder, catalog: Dict[str, Tuple[str, str, int]]):
+    """
+    Point the builder's catalog arrays at blocks created by share_catalog().
+    
+    Returns:
+        The attached SharedMemory blocks (keep them open while in use)
+    """
+    blocks = []
+    for column, (name, dtype, length) in catalog.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        setattr(builder, column, np.ndarray(length, dtype=dtype, buffer=block.buf))
+    return blocks
+
+
+def _init_subtree_worker(catalog: Dict[str, Tuple[str, str, int]],
+                         settings: Dict[str, object]):
+    """Worker initializer: rebuild the builder over the shared catalog."""
+    global _worker_builder, _worker_blocks
+    builder = BinaryOctreeBuilder({}, max_depth=settings['max_depth'],
+                                  compress=settings['compress'],
+                                  half_lod=settings['half_lod'],
+                                  pack=settings['pack'])
+    for name in ('MAX_STARS_PER_NODE', 'LOD_PARENT_FRACTION', 'MMAP_THRESHOLD'):
+        setattr(builder, name, settings[name])
+    _worker_blocks = attach_catalog(builder, catalog)
+    _worker_builder = builder
+
+
+def _build_subtree(start: int, stop: int, octant: int,
+                   output_dir: Path) -> Tuple[int, int]:
+    """
+    Build the subtree of one root octant in a worker process.
+    
+    Returns:
+        (nodes, stars) written for the subtree
+    """
+    builder = _worker_builder
+    builder.total_nodes = 0
+    builder.total_stars_exported = 0
+    builder.build_octree(slice(start, stop), output_dir, depth=1, path=octant)
+    return builder.total_nodes, builder.total_stars_exported
+
+
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Export star catalog to binary octree format",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -425,6 +1080,15 @@ EXAMPLES:
   
   # Export only OBSERVED stars
   python export_binary_octree.py --epistemic-filter OBSERVED
+  
+  # Blosc-compress node files (requires blosc)
+  python export_binary_octree.py --compress
+  
+  # Halve LOD parent position bytes (float16, frame-relative)
+  python export_binary_octree.py --half-lod
+  
+  # One .pack file per subtree instead of thousands of node files
+  python export_binary_octree.py --pack
         """
     )
     
@@ -433,6 +1097,17 @@ EXAMPLES:
     parser.add_argument('--epistemic-filter', 
                        choices=['OBSERVED', 'INFERRED', 'SIMULATED'],
                        help='Filter by epistemic status')
+    parser.add_argument('--compress', action='store_true',
+                       help='Blosc-compress node files (requires blosc)')
+    parser.add_argument('--half-lod', action='store_true',
+                       help='Store LOD parent positions as float16 '
+                            '(adds a 32-byte header to every node file)')
+    parser.add_argument('--pack', action='store_true',
+                       help='Write one .pack file per subtree instead of '
+                            'one .bin file per node')
+    parser.add_argument('--workers', type=int, default=min(8, os.cpu_count() or 1),
+                       help='Processes building subtrees in parallel '
+                            '(default: CPU count, at most 8)')
     parser.add_argument('--output-dir', default='../../data/octree',
                        help='Output directory (default: ../../data/octree)')
     parser.add_argument('--db-host', default='localhost',
@@ -446,7 +1121,7 @@ EXAMPLES:
     parser.add_argument('--db-password', default='',
                        help='Database password')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Database configuration
     db_config = {
@@ -457,11 +1132,24 @@ EXAMPLES:
         'password': args.db_password
     }
     
+    if args.compress and blosc is None:
+        print("ERROR: --compress requires blosc")
+        print("Install with: pip install --user blosc")
+        sys.exit(1)
+    
+    if args.compress and args.half_lod:
+        print("ERROR: --compress and --half-lod cannot be combined")
+        sys.exit(1)
+    
     # Build octree
     builder = BinaryOctreeBuilder(
         db_config=db_config,
         max_depth=args.max_depth,
-        epistemic_filter=args.epistemic_filter
+        epistemic_filter=args.epistemic_filter,
+        compress=args.compress,
+        workers=args.workers,
+        half_lod=args.half_lod,
+        pack=args.pack
     )
     
     try:
@@ -17,8 +17,13 @@ OUTPUT FORMAT (.speck):
     datavar 1 lum       # Luminosity (for sizing)
     <x> <y> <z> <colorb_v> <lum> # One star per line
 
+BINARY OUTPUT (--binary):
+    <name>.bin         float32 little-endian x y z colorb_v lum, 20 bytes per star
+    <name>.bin.header  The .speck header above, plus the record layout
+
 DEPENDENCIES:
     pip install --user psycopg2-binary numpy
+    pip install --user numba  # Optional, compiles the coordinate kernel
 
 USAGE:
     # Export all OBSERVED stars
@@ -26,12 +31,21 @@ USAGE:
     
     # Export only bright stars
     python export_to_speck.py --magnitude-limit 10.0 --output ../../data/gaia_bright.speck
+    
+    # Write a gzip-compressed .speck.gz
+    python export_to_speck.py --gzip
+    
+    # Write binary records with a text header sidecar
+    python export_to_speck.py --binary --output ../../data/gaia_observed.bin
 """
 
 import argparse
+import gzip
+import math
+import os
 import sys
 from datetime import datetime
-from typing import Dict, List
+from typing import Dict
 
 try:
     import numpy as np
@@ -41,6 +55,44 @@ except ImportError as e:
     print("Install with: pip install --user psycopg2-binary numpy")
     sys.exit(1)
 
+try:
+    import numba  # Optional: compiled coordinate kernel
+except ImportError:
+    numba = None
+
+
+def _spherical_to_cartesian_numpy(ra_deg, dec_deg, distance_pc):
+    """NumPy conversion, one array pass per operation."""
+    ra = np.deg2rad(ra_deg)
+    dec = np.deg2rad(dec_deg)
+    cos_dec = np.cos(dec)
+    x = distance_pc * cos_dec * np.cos(ra)
+    y = distance_pc * cos_dec * np.sin(ra)
+    z = distance_pc * np.sin(dec)
+    return x, y, z
+
+
+if numba is not None:
+    # fastmath without nnan/ninf, so missing values stay NaN. Script runs
+    # compile without the on-disk cache: its entries re-import the module
+    # that wrote them, and src.ingestion is not importable from here
+    @numba.njit(parallel=True, fastmath={'reassoc', 'contract', 'afn', 'arcp', 'nsz'},
+                cache=__name__ != '__main__')
+    def _spherical_to_cartesian_compiled(ra_deg, dec_deg, distance_pc):
+        """Compiled conversion: one fused loop over the stars, no temporaries."""
+        n = ra_deg.shape[0]
+        x = np.empty(n)
+        y = np.empty(n)
+        z = np.empty(n)
+        for i in numba.prange(n):
+            ra = math.radians(ra_deg[i])
+            dec = math.radians(dec_deg[i])
+            distance_cos_dec = distance_pc[i] * math.cos(dec)
+            x[i] = distance_cos_dec * math.cos(ra)
+            y[i] = distance_cos_dec * math.sin(ra)
+            z[i] = distance_pc[i] * math.sin(dec)
+        return x, y, z
+
 
 class SpeckExporter:
     """Exports cosmic_objects to .speck format for OpenSpace."""
@@ -52,6 +104,24 @@ class SpeckExporter:
         'SIMULATED': 0.2    # Red (low brightness for datavar)
     }
     
+    # Epistemic status codes (index into EPISTEMIC_COLORS order)
+    EPISTEMIC_LABELS = tuple(EPISTEMIC_COLORS)
+    STATUS_COLORS = np.array(list(EPISTEMIC_COLORS.values()))
+    
+    # Columns returned by query_stars (in SELECT order)
+    STAR_COLUMNS = ('epistemic_status', 'ra', 'dec', 'distance_pc',
+                    'magnitude_g', 'color_bp_rp')
+    
+    FETCH_BLOCK_SIZE = 100000  # Rows per round-trip when streaming results
+    FORMAT_BLOCK_SIZE = 100000  # Rows formatted and written per call
+    # Stored for stars without a G magnitude: treated as faint (luminosity 0)
+    MISSING_MAGNITUDE = 15.0
+    # x y z colorb_v lum; colorb_v is constant per epistemic status and is
+    # filled in once per run of equal status
+    ROW_FORMAT = "%.6e %.6e %.6e {colorb_v:.3f} %.6f\n"
+    # Record of --binary output: the same five columns as float32
+    BINARY_RECORD = np.dtype('<f4')
+    
     def __init__(self, db_config: Dict[str, str]):
         """
         Initialize exporter.
@@ -73,16 +143,21 @@ class SpeckExporter:
             print(f"✗ Database connection failed: {e}")
             sys.exit(1)
     
-    def query_stars(self, epistemic_filter: str = 'OBSERVED', magnitude_limit: float = None) -> List[Dict]:
+    def query_stars(self, epistemic_filter: str = 'OBSERVED',
+                    magnitude_limit: float = None) -> Dict[str, np.ndarray]:
         """
         Query stars from database.
         
+        Rows are streamed through a server-side cursor in blocks and
+        collected into one NumPy array per column, so the result set is
+        never materialized as a list of per-row objects.
+        
         Args:
             epistemic_filter: Filter by truth_label (default: OBSERVED)
             magnitude_limit: Optional magnitude cutoff
         
         Returns:
-            List of star dictionaries with Cartesian coordinates
+            Dictionary of column arrays (see STAR_COLUMNS), brightest first
         """
         print(f"\n{'='*60}")
         print("QUERYING DATABASE")
@@ -91,17 +166,18 @@ class SpeckExporter:
         if magnitude_limit:
             print(f"Magnitude limit: G < {magnitude_limit}")
         
-        # Build query
-        query = """
+        # Build query (column order matches STAR_COLUMNS); truth_label
+        # is mapped to its status code in the database
+        status_cases = ' '.join(f"WHEN '{label}' THEN {code}"
+                                for code, label in enumerate(self.EPISTEMIC_LABELS))
+        query = f"""
             SELECT 
-                id,
-                truth_label,
-                ST_X(location::geometry) AS ra,
-                ST_Y(location::geometry) AS dec,
-                ST_Z(location::geometry) AS distance_pc,
-                magnitude_g,
-                color_index_bp_rp,
-                provenance
+                CASE truth_label {status_cases} END AS epistemic_status,
+                ra_deg AS ra,
+                dec_deg AS dec,
+                distance_pc,
+                COALESCE(magnitude_g, {self.MISSING_MAGNITUDE}) AS magnitude_g,
+                color_index_bp_rp
             FROM cosmic_objects
             WHERE truth_label = %s
         """
@@ -115,33 +191,43 @@ class SpeckExporter:
         query += " ORDER BY magnitude_g ASC"
         
         try:
-            self.cursor.execute(query, params)
-            rows = self.cursor.fetchall()
+            blocks = {name: [] for name in self.STAR_COLUMNS}
+            with self.conn.cursor('speck_stars') as cursor:
+                cursor.itersize = self.FETCH_BLOCK_SIZE
+                cursor.execute(query, params)
+                while True:
+                    rows = cursor.fetchmany(self.FETCH_BLOCK_SIZE)
+                    if not rows:
+                        break
+                    for name, values in zip(self.STAR_COLUMNS, zip(*rows)):
+                        blocks[name].append(np.array(values, dtype=self.column_dtype(name)))
             
-            stars = []
-            for row in rows:
-                stars.append({
-                    'id': row[0],
-                    'truth_label': row[1],
-                    'ra': row[2],
-                    'dec': row[3],
-                    'distance_pc': row[4],
-                    'magnitude_g': row[5],
-                    'color_bp_rp': row[6],
-                    'provenance': row[7]
-                })
+            stars = {
+                name: (np.concatenate(arrays) if arrays else
+                       np.empty(0, dtype=self.column_dtype(name)))
+                for name, arrays in blocks.items()
+            }
             
-            print(f"✓ Retrieved {len(stars)} stars")
+            print(f"✓ Retrieved {len(stars['ra'])} stars")
             return stars
             
         except Exception as e:
             print(f"✗ Query failed: {e}")
             sys.exit(1)
     
-    def spherical_to_cartesian(self, ra_deg: float, dec_deg: float, distance_pc: float) -> tuple:
+    @staticmethod
+    def column_dtype(name: str):
+        """NumPy dtype of a query_stars() column."""
+        return np.int32 if name == 'epistemic_status' else np.float64
+    
+    def spherical_to_cartesian(self, ra_deg, dec_deg, distance_pc) -> tuple:
         """
         Convert spherical (RA, Dec, Distance) to Cartesian (X, Y, Z).
         
+        Accepts scalars or NumPy arrays. Scalars use the math module (no
+        ufunc dispatch); arrays are converted in one pass, by the compiled
+        kernel when numba is installed.
+        
         Args:
             ra_deg: Right Ascension in degrees
             dec_deg: Declination in degrees
@@ -150,22 +236,25 @@ class SpeckExporter:
         Returns:
             (x, y, z) in parsecs
         """
-        # Convert to radians
-        ra = np.radians(ra_deg)
-        dec = np.radians(dec_deg)
-        
-        # Spherical to Cartesian
-        x = distance_pc * np.cos(dec) * np.cos(ra)
-        y = distance_pc * np.cos(dec) * np.sin(ra)
-        z = distance_pc * np.sin(dec)
-        
-        return (x, y, z)
+        if np.ndim(ra_deg) == 0 and np.ndim(dec_deg) == 0 and np.ndim(distance_pc) == 0:
+            ra = math.radians(ra_deg)
+            dec = math.radians(dec_deg)
+            distance_cos_dec = distance_pc * math.cos(dec)
+            return (distance_cos_dec * math.cos(ra), distance_cos_dec * math.sin(ra),
+                    distance_pc * math.sin(dec))
+        if numba is not None and np.ndim(ra_deg) == 1:
+            return _spherical_to_cartesian_compiled(
+                np.asarray(ra_deg, dtype=np.float64),
+                np.asarray(dec_deg, dtype=np.float64),
+                np.asarray(distance_pc, dtype=np.float64))
+        return _spherical_to_cartesian_numpy(ra_deg, dec_deg, distance_pc)
     
-    def magnitude_to_luminosity(self, magnitude: float) -> float:
+    def magnitude_to_luminosity(self, magnitude):
         """
         Convert apparent magnitude to relative luminosity for sizing.
         
-        Brighter stars (lower magnitude) get larger size.
+        Brighter stars (lower magnitude) get larger size. Accepts a scalar
+        or a NumPy array.
         
         Args:
             magnitude: Apparent magnitude
@@ -176,15 +265,17 @@ class SpeckExporter:
         # Normalize magnitude to 0-1 range
         # Bright stars: mag ~ 0, Faint stars: mag ~ 15
         # Invert so bright = 1.0, faint = 0.0
-        normalized = 1.0 - (magnitude / 15.0)
-        return max(0.0, min(1.0, normalized))  # Clamp to [0, 1]
+        normalized = 1.0 - (np.asarray(magnitude, dtype=np.float64) / 15.0)
+        return np.clip(normalized, 0.0, 1.0)  # Clamp to [0, 1]
     
-    def export_to_speck(self, stars: List[Dict], output_path: str):
+    def export_to_speck(self, stars: Dict[str, np.ndarray], output_path: str):
         """
         Export stars to .speck format.
         
+        Paths ending in .gz are written gzip-compressed (fast level).
+        
         Args:
-            stars: List of star dictionaries
+            stars: Column arrays as returned by query_stars()
             output_path: Output file path
         """
         print(f"\n{'='*60}")
@@ -192,52 +283,101 @@ class SpeckExporter:
         print(f"{'='*60}")
         print(f"Output file: {output_path}")
         
-        with open(output_path, 'w') as f:
+        if str(output_path).endswith('.gz'):
+            output = gzip.open(output_path, 'wt', compresslevel=1)
+        else:
+            output = open(output_path, 'w')
+        
+        with output as f:
             # Header
-            f.write("# OpenSpace .speck format\n")
-            f.write("# Epistemic Engine - Gaia DR3 OBSERVED Data\n")
-            f.write(f"# Generated: {datetime.now().isoformat()}\n")
-            f.write(f"# Number of stars: {len(stars)}\n")
-            f.write("#\n")
-            f.write("# EPISTEMIC STATUS: OBSERVED (L0)\n")
-            f.write("#  SOURCE: Gaia DR3\n")
-            f.write("#  COLOR: White/Blue (Constitution Layer 3)\n")
-            f.write("#\n")
-            f.write("# Data variables:\n")
-            f.write("datavar 0 colorb_v  # Epistemic color (1.0 = OBSERVED)\n")
-            f.write("datavar 1 lum       # Luminosity (magnitude-based sizing)\n")
-            f.write("#\n")
-            f.write("# Format: x y z colorb_v lum\n")
-            f.write("# Coordinates: Cartesian (parsecs), ICRS frame\n")
-            f.write("#\n")
+            f.write(self.speck_header(len(stars['ra'])))
+            
+            # Convert all stars at once
+            x, y, z = self.spherical_to_cartesian(
+                stars['ra'], stars['dec'], stars['distance_pc']
+            )
             
-            # Data rows
-            count = 0
-            for star in stars:
-                # Convert to Cartesian
-                x, y, z = self.spherical_to_cartesian(
-                    star['ra'],
-                    star['dec'],
-                    star['distance_pc']
-                )
-                
-                # Epistemic color
-                colorb_v = self.EPISTEMIC_COLORS[star['truth_label']]
-                
-                # Luminosity (for sizing)
-                lum = self.magnitude_to_luminosity(star['magnitude_g'])
-                
-                # Write row
-                f.write(f"{x:.6e} {y:.6e} {z:.6e} {colorb_v:.3f} {lum:.6f}\n")
-                count += 1
+            # Luminosity (for sizing)
+            lum = self.magnitude_to_luminosity(stars['magnitude_g'])
+            
+            # Data rows, in runs of equal epistemic status: the run's color
+            # is baked into the row template, then each block of rows is
+            # formatted with one % operation and written with a single call
+            status = stars['epistemic_status']
+            data = np.column_stack([x, y, z, lum])
+            count = len(data)
+            edges = [0, *(np.flatnonzero(np.diff(status)) + 1).tolist(), count]
+            for run_start, run_stop in zip(edges[:-1], edges[1:]):
+                if run_start == run_stop:
+                    continue
+                row_format = self.ROW_FORMAT.format(
+                    colorb_v=self.STATUS_COLORS[status[run_start]])
+                for start in range(run_start, run_stop, self.FORMAT_BLOCK_SIZE):
+                    block = data[start:min(start + self.FORMAT_BLOCK_SIZE, run_stop)]
+                    f.write((row_format * len(block)) % tuple(block.ravel().tolist()))
             
         print(f"✓ Exported {count} stars to {output_path}")
         
         # File statistics
-        import os
         file_size = os.path.getsize(output_path)
         print(f"  File size: {file_size / 1024 / 1024:.2f} MB")
     
+    def export_to_speck_binary(self, stars: Dict[str, np.ndarray], output_path: str):
+        """
+        Export stars as binary float32 records plus a text header sidecar.
+        
+        Writes the same x y z colorb_v lum columns as export_to_speck(),
+        without formatting any numbers as text (see BINARY OUTPUT).
+        
+        Args:
+            stars: Column arrays as returned by query_stars()
+            output_path: Output .bin file path; the header goes to
+                output_path + '.header'
+        """
+        print(f"\n{'='*60}")
+        print("EXPORTING TO BINARY .SPECK RECORDS")
+        print(f"{'='*60}")
+        print(f"Output file: {output_path}")
+        
+        x, y, z = self.spherical_to_cartesian(
+            stars['ra'], stars['dec'], stars['distance_pc']
+        )
+        colorb_v = self.STATUS_COLORS[stars['epistemic_status']]
+        lum = self.magnitude_to_luminosity(stars['magnitude_g'])
+        
+        records = np.column_stack([x, y, z, colorb_v, lum]).astype(self.BINARY_RECORD)
+        records.tofile(output_path)
+        
+        with open(f"{output_path}.header", 'w') as f:
+            f.write(self.speck_header(len(records)))
+            f.write(f"# Binary records: {os.path.basename(output_path)}\n")
+            f.write("#  Layout: float32 little-endian x y z colorb_v lum (20 bytes per star)\n")
+        
+        print(f"✓ Exported {len(records)} stars to {output_path}")
+        print(f"  File size: {os.path.getsize(output_path) / 1024 / 1024:.2f} MB")
+    
+    @staticmethod
+    def speck_header(num_stars: int) -> str:
+        """Comment and datavar lines that start a .speck file."""
+        return (
+            "# OpenSpace .speck format\n"
+            "# Epistemic Engine - Gaia DR3 OBSERVED Data\n"
+            f"# Generated: {datetime.now().isoformat()}\n"
+            f"# Number of stars: {num_stars}\n"
+            "#\n"
+            "# EPISTEMIC STATUS: OBSERVED (L0)\n"
+            "#  SOURCE: Gaia DR3\n"
+            "#  COLOR: White/Blue (Constitution Layer 3)\n"
+            "#\n"
+            "# Data variables:\n"
+            "datavar 0 colorb_v  # Epistemic color (1.0 = OBSERVED)\n"
+            "datavar 1 lum       # Luminosity (magnitude-based sizing)\n"
+            "#\n"
+            "# Format: x y z colorb_v lum\n"
+            "# Coordinates: Cartesian (parsecs), ICRS frame\n"
+            "#\n"
+        )
+    
     def close(self):
         """Close database connection."""
         if self.cursor:
@@ -246,7 +386,7 @@ class SpeckExporter:
             self.conn.close()
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Export cosmic_objects to OpenSpace .speck format",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -265,11 +405,23 @@ EXAMPLES:
   
   # Custom database
   python export_to_speck.py --db-name epistemic_engine --output gaia.speck
+  
+  # gzip-compressed output (writes gaia_observed.speck.gz)
+  python export_to_speck.py --gzip
+  
+  # Binary float32 records (writes gaia_observed.bin and gaia_observed.bin.header)
+  python export_to_speck.py --binary
         """
     )
     
     parser.add_argument('--output', default='../../data/gaia_observed.speck',
                        help='Output .speck file path')
+    output_format = parser.add_mutually_exclusive_group()
+    output_format.add_argument('--gzip', action='store_true',
+                       help='Write gzip-compressed output (adds .gz to --output)')
+    output_format.add_argument('--binary', action='store_true',
+                       help='Write float32 records and a .header sidecar '
+                            '(.speck in --output becomes .bin)')
     parser.add_argument('--epistemic-filter', default='OBSERVED',
                        choices=['OBSERVED', 'INFERRED', 'SIMULATED'],
                        help='Filter by epistemic status (default: OBSERVED)')
@@ -286,7 +438,11 @@ EXAMPLES:
     parser.add_argument('--db-password', default='',
                        help='Database password')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.gzip and not args.output.endswith('.gz'):
+        args.output += '.gz'
+    if args.binary and args.output.endswith('.speck'):
+        args.output = args.output[:-len('.speck')] + '.bin'
     
     # Database configuration
     db_config = {
@@ -310,12 +466,15 @@ EXAMPLES:
             magnitude_limit=args.magnitude_limit
         )
         
-        if not stars:
+        if len(stars['ra']) == 0:
             print("⚠️  No stars found matching criteria")
             sys.exit(0)
         
         # 3. Export to .speck
-        exporter.export_to_speck(stars, args.output)
+        if args.binary:
+            exporter.export_to_speck_binary(stars, args.output)
+        else:
+            exporter.export_to_speck(stars, args.output)
         
         print(f"\n✓ Export complete!")
         print(f"  Load in OpenSpace with: asset.require('{args.output}')")
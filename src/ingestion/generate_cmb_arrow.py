@@ -20,6 +20,7 @@ CONSTITUTION COMPLIANCE:
   arrow representation is procedural.
 """
 
+import math
 import numpy as np
 import argparse
 from pathlib import Path
@@ -34,6 +35,15 @@ class ArrowMeshGenerator:
     CMB_DIRECTION_L = 264.021  # Galactic longitude (degrees)
     CMB_DIRECTION_B = 48.253   # Galactic latitude (degrees)
     
+    # Vertex coordinates are written with %.6e (7 significant digits).
+    # float32 carries only about 7.2 digits, which is not enough to round
+    # every coordinate to the same last digit, so vertices stay float64
+    VERTEX_DTYPE = np.float64
+    
+    # OBJ element lines
+    VERTEX_FORMAT = "v %.6e %.6e %.6e\n"
+    FACE_FORMAT = "f %d %d %d\n"
+    
     def __init__(self, length=1e20, shaft_radius=1e18, head_radius=3e18, head_length=3e19):
         """
         Initialize arrow generator.
@@ -49,6 +59,17 @@ class ArrowMeshGenerator:
         self.head_radius = head_radius
         self.head_length = head_length
         
+        # Direction vector (normalized) and the rotation taking the default
+        # +Z arrow onto it; both depend only on the class constants
+        direction = self.galactic_to_cartesian(
+            self.CMB_DIRECTION_L,
+            self.CMB_DIRECTION_B
+        )
+        self.direction = direction / np.linalg.norm(direction)
+        self.rotation_matrix = self._rotation_matrix_from_vectors(
+            np.array([0, 0, 1]), self.direction
+        )
+        
     def galactic_to_cartesian(self, l_deg, b_deg, r=1.0):
         """
         Convert Galactic coordinates to Cartesian (X, Y, Z).
@@ -61,12 +82,14 @@ class ArrowMeshGenerator:
         Returns:
             np.array: [x, y, z] Cartesian coordinates
         """
-        l_rad = np.radians(l_deg)
-        b_rad = np.radians(b_deg)
+        # Scalar angles: math functions skip NumPy's array dispatch
+        l_rad = math.radians(l_deg)
+        b_rad = math.radians(b_deg)
         
-        x = r * np.cos(b_rad) * np.cos(l_rad)
-        y = r * np.cos(b_rad) * np.sin(l_rad)
-        z = r * np.sin(b_rad)
+        cos_b = math.cos(b_rad)
+        x = r * cos_b * math.cos(l_rad)
+        y = r * cos_b * math.sin(l_rad)
+        z = r * math.sin(b_rad)
         
         return np.array([x, y, z])
     
@@ -78,23 +101,8 @@ class ArrowMeshGenerator:
             segments: Number of radial segments for cylinder/cone
         
         Returns:
-            dict: Vertices, faces, and normals
+            dict: Vertices ((N, 3) array), faces ((F, 3) index array), and direction
         """
-        vertices = []
-        faces = []
-        
-        # Direction vector (normalized)
-        direction = self.galactic_to_cartesian(
-            self.CMB_DIRECTION_L,
-            self.CMB_DIRECTION_B
-        )
-        direction = direction / np.linalg.norm(direction)
-        
-        # Create rotation matrix to align arrow with direction
-        # Default arrow points along +Z axis, rotate to match direction
-        z_axis = np.array([0, 0, 1])
-        rotation_matrix = self._rotation_matrix_from_vectors(z_axis, direction)
-        
         # Generate shaft (cylinder)
         shaft_length = self.length - self.head_length
         shaft_vertices, shaft_faces = self._generate_cylinder(
@@ -112,54 +120,49 @@ class ArrowMeshGenerator:
             offset=np.array([0, 0, shaft_length])
         )
         
-        # Combine meshes
-        vertices = shaft_vertices + head_vertices
+        # Combine meshes; the shaft's top ring (shaft_radius) and the cone's
+        # base ring (head_radius) differ, so the parts share no vertices
+        vertices = np.vstack([shaft_vertices, head_vertices])
         
         # Offset face indices for head
-        offset_head_faces = [[f[0] + len(shaft_vertices), 
-                             f[1] + len(shaft_vertices), 
-                             f[2] + len(shaft_vertices)] 
-                            for f in head_faces]
-        faces = shaft_faces + offset_head_faces
+        faces = np.vstack([shaft_faces, head_faces + len(shaft_vertices)])
         
-        # Apply rotation to align with CMB direction
-        vertices = [rotation_matrix @ v for v in vertices]
+        # Apply rotation to align with CMB direction (one matrix product
+        # for all vertices, which are rows); the arrow is built along +Z
+        vertices = vertices @ self.rotation_matrix.T
         
         return {
             'vertices': vertices,
             'faces': faces,
-            'direction': direction,
+            'direction': self.direction,
             'metadata': self._generate_metadata()
         }
     
+    def _circle(self, radius, segments):
+        """(segments, 2) array of x, y points evenly spaced on a circle."""
+        angles = 2 * np.pi * np.arange(segments) / segments
+        return radius * np.column_stack([np.cos(angles), np.sin(angles)])
+    
     def _generate_cylinder(self, radius, height, segments, offset):
         """Generate cylinder mesh."""
-        vertices = []
-        faces = []
-        
-        # Generate vertices
-        for i in range(segments):
-            angle = 2 * np.pi * i / segments
-            x = radius * np.cos(angle)
-            y = radius * np.sin(angle)
-            
-            # Bottom circle
-            vertices.append(offset + np.array([x, y, 0]))
-            # Top circle
-            vertices.append(offset + np.array([x, y, height]))
-        
-        # Generate side faces
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            
-            # Two triangles per quad
-            v0 = 2 * i
-            v1 = 2 * i + 1
-            v2 = 2 * next_i + 1
-            v3 = 2 * next_i
-            
-            faces.append([v0, v1, v2])
-            faces.append([v0, v2, v3])
+        xy = self._circle(radius, segments)
+        
+        # Bottom and top circle, interleaved: vertex 2*i is bottom point i,
+        # 2*i + 1 the top point above it
+        vertices = np.empty((2 * segments + 1, 3), dtype=self.VERTEX_DTYPE)
+        vertices[0:-1:2, :2] = xy
+        vertices[0:-1:2, 2] = 0
+        vertices[1:-1:2, :2] = xy
+        vertices[1:-1:2, 2] = height
+        
+        # Side faces: two triangles per quad
+        i = np.arange(segments)
+        next_i = (i + 1) % segments
+        v0, v1, v2, v3 = 2 * i, 2 * i + 1, 2 * next_i + 1, 2 * next_i
+        side_faces = np.stack([
+            np.column_stack([v0, v1, v2]),
+            np.column_stack([v0, v2, v3])
+        ], axis=1).reshape(-1, 3)
         
         # Bottom cap (optional - commented out for hollow cylinder)
         # center_bottom = len(vertices)
@@ -168,35 +171,26 @@ class ArrowMeshGenerator:
         #     next_i = (i + 1) % segments
         #     faces.append([center_bottom, 2 * i, 2 * next_i])
         
-        # Top cap
-        center_top = len(vertices)
-        vertices.append(offset + np.array([0, 0, height]))
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            faces.append([center_top, 2 * next_i + 1, 2 * i + 1])
+        # Top cap (its center is the last vertex)
+        center_top = 2 * segments
+        vertices[center_top] = (0, 0, height)
+        vertices += offset
+        cap_faces = np.column_stack([np.full(segments, center_top), v2, v1])
         
-        return vertices, faces
+        return vertices, np.vstack([side_faces, cap_faces])
     
     def _generate_cone(self, radius, height, segments, offset):
         """Generate cone mesh."""
-        vertices = []
-        faces = []
-        
-        # Base circle vertices
-        for i in range(segments):
-            angle = 2 * np.pi * i / segments
-            x = radius * np.cos(angle)
-            y = radius * np.sin(angle)
-            vertices.append(offset + np.array([x, y, 0]))
-        
-        # Apex vertex
-        apex_idx = len(vertices)
-        vertices.append(offset + np.array([0, 0, height]))
+        # Base circle vertices, then the apex
+        vertices = np.zeros((segments + 1, 3), dtype=self.VERTEX_DTYPE)
+        vertices[:segments, :2] = self._circle(radius, segments)
+        apex_idx = segments
+        vertices[apex_idx, 2] = height
+        vertices += offset
         
         # Side faces
-        for i in range(segments):
-            next_i = (i + 1) % segments
-            faces.append([i, next_i, apex_idx])
+        i = np.arange(segments)
+        faces = np.column_stack([i, (i + 1) % segments, np.full(segments, apex_idx)])
         
         # Base (optional - commented out for hollow cone)
         # center_base = len(vertices)
@@ -211,23 +205,23 @@ class ArrowMeshGenerator:
         """
         Create rotation matrix to rotate vec1 to vec2.
         
-        Using Rodrigues' rotation formula.
+        Using Rodrigues' rotation formula for two unit vectors,
+        R = I + [v]x + [v]x^2 / (1 + c) with v = a x b and c = a . b,
+        which needs no sine, cosine or norm of v.
         """
-        a = vec1 / np.linalg.norm(vec1)
-        b = vec2 / np.linalg.norm(vec2)
+        a = vec1 / math.sqrt(float(vec1 @ vec1))
+        b = vec2 / math.sqrt(float(vec2 @ vec2))
         
         v = np.cross(a, b)
         c = np.dot(a, b)
         
-        if np.allclose(c, -1):
-            # Vectors are opposite - return 180° rotation
-            return -np.eye(3)
-        
-        s = np.linalg.norm(v)
-        
-        if s < 1e-10:
-            # Vectors are already aligned
-            return np.eye(3)
+        if c < -1 + 1e-10:
+            # Vectors are opposite - rotate 180° about any axis orthogonal to a
+            axis = np.cross(a, [1.0, 0.0, 0.0])
+            if np.dot(axis, axis) < 1e-12:
+                axis = np.cross(a, [0.0, 1.0, 0.0])
+            axis = axis / math.sqrt(float(axis @ axis))
+            return 2 * np.outer(axis, axis) - np.eye(3)
         
         # Skew-symmetric cross-product matrix
         vx = np.array([
@@ -236,7 +230,7 @@ class ArrowMeshGenerator:
             [-v[1], v[0], 0]
         ])
         
-        R = np.eye(3) + vx + (vx @ vx) * ((1 - c) / (s ** 2))
+        R = np.eye(3) + vx + (vx @ vx) / (1 + c)
         
         return R
     
@@ -276,13 +270,12 @@ class ArrowMeshGenerator:
             f.write(f"# Generated: {mesh_data['metadata']['generation_date']}\n")
             f.write("#\n")
             
-            # Vertices
-            for v in mesh_data['vertices']:
-                f.write(f"v {v[0]:.6e} {v[1]:.6e} {v[2]:.6e}\n")
-            
-            # Faces (OBJ indices start at 1, not 0)
-            for face in mesh_data['faces']:
-                f.write(f"f {face[0]+1} {face[1]+1} {face[2]+1}\n")
+            # Vertices and faces (OBJ indices start at 1, not 0), formatted
+            # in one pass and written with one call
+            vertices = np.asarray(mesh_data['vertices'])
+            faces = np.asarray(mesh_data['faces']) + 1
+            f.write((self.VERTEX_FORMAT * len(vertices)) % tuple(vertices.ravel().tolist())
+                    + (self.FACE_FORMAT * len(faces)) % tuple(faces.ravel().tolist()))
         
         print(f"✓ Exported mesh with {len(mesh_data['vertices'])} vertices and {len(mesh_data['faces'])} faces to {output_path}")
     
@@ -311,7 +304,7 @@ class ArrowMeshGenerator:
         print("="*60 + "\n")
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Generate CMB velocity vector arrow mesh (L2 - SIMULATED visual aid for L0 data)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -356,7 +349,7 @@ EXAMPLES:
         help='Output directory (default: ../../data/cmb_vector)'
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Generate arrow mesh
     print("\nGenerating CMB velocity vector arrow...")
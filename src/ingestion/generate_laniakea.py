@@ -31,6 +31,7 @@ should use actual Cosmicflows-4 velocity field data.
 
 DEPENDENCIES:
     pip install --user numpy
+    pip install --user numba  # Optional, compiles the filament kernel
 
 USAGE:
     # Generate 5000 galaxy points and flow lines
@@ -41,7 +42,68 @@ import argparse
 import numpy as np
 from pathlib import Path
 from datetime import datetime
-from typing import List, Tuple, Dict
+from typing import Tuple, Dict
+
+try:
+    import numba  # Optional: compiled filament kernel
+except ImportError:
+    numba = None
+
+
+def _filament_positions_numpy(attractors, idx1, idx2, t, scatter, center, radii):
+    """NumPy filament positions and ellipsoid test, one array pass per step."""
+    pos1 = attractors[idx1]
+    positions = pos1 + t[:, None] * (attractors[idx2] - pos1) + scatter
+    inside = (((positions - center) / radii) ** 2).sum(axis=1) < 1.0
+    return positions, inside
+
+
+if numba is not None:
+    # The on-disk cache is keyed by file, not module name, and its entries
+    # re-import the module that compiled them: a cache written under
+    # src.ingestion.generate_laniakea cannot be loaded when this file runs
+    # as a script, so script runs compile without caching
+    @numba.njit(parallel=True, cache=__name__ != '__main__')
+    def _filament_positions_compiled(attractors, idx1, idx2, t, scatter, center, radii):
+        """Compiled filament positions: one fused loop over the galaxies."""
+        n = idx1.shape[0]
+        positions = np.empty((n, 3))
+        inside = np.empty(n, dtype=np.bool_)
+        for i in numba.prange(n):
+            normalized = 0.0
+            for axis in range(3):
+                start = attractors[idx1[i], axis]
+                p = start + t[i] * (attractors[idx2[i], axis] - start) + scatter[i, axis]
+                positions[i, axis] = p
+                rel = (p - center[axis]) / radii[axis]
+                normalized += rel * rel
+            inside[i] = normalized < 1.0
+        return positions, inside
+
+
+def filament_positions(attractors: np.ndarray, idx1: np.ndarray, idx2: np.ndarray,
+                       t: np.ndarray, scatter: np.ndarray, center: np.ndarray,
+                       radii: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Place galaxies on attractor filaments and test them against the boundary.
+    
+    Galaxy i sits at fraction t[i] of the way from attractor idx1[i] to
+    attractor idx2[i], plus scatter[i]. Uses the compiled kernel when
+    numba is installed.
+    
+    Args:
+        attractors: (A, 3) attractor positions in Mpc
+        idx1, idx2: Filament end attractor indices per galaxy
+        t: Position along the filament per galaxy
+        scatter: (N, 3) offsets in Mpc
+        center, radii: Boundary ellipsoid center and semi-axes in Mpc
+    
+    Returns:
+        ((N, 3) positions in Mpc, boolean mask of galaxies inside the boundary)
+    """
+    if numba is not None:
+        return _filament_positions_compiled(attractors, idx1, idx2, t, scatter, center, radii)
+    return _filament_positions_numpy(attractors, idx1, idx2, t, scatter, center, radii)
 
 
 class LaniakeaGenerator:
@@ -78,19 +140,33 @@ class LaniakeaGenerator:
     
     # Laniakea boundary (approximate)
     BOUNDARY_CENTER_MPC = np.array([30.0, 0.0, 0.0])  # Offset toward Great Attractor
+    BOUNDARY_RADII_MPC = np.array([80.0, 60.0, 60.0])  # Semi-axes (major toward Great Attractor)
+    # Draws per missing galaxy, over the observed acceptance rate, so one
+    # more batch usually fills the count
+    OVERSAMPLE_FACTOR = 1.2
     
-    def __init__(self, num_galaxies=5000, flow_sample_rate=0.2):
+    # .speck data rows; colorb_v 0.5 = INFERRED (maps to Gold in color scheme)
+    GALAXY_ROW_FORMAT = "%.6e %.6e %.6e 0.500\n"
+    FLOW_ROW_FORMAT = "%.6e %.6e %.6e %.6e %.6e %.6e\n"
+    
+    def __init__(self, num_galaxies=5000, flow_sample_rate=0.2, seed=None):
         """
         Initialize Laniakea generator.
         
         Args:
-            num_galaxies: Number of galaxy points to generate
+            num_galaxies: Number of galaxy points to generate (all inside the boundary)
             flow_sample_rate: Fraction of galaxies to show flow lines for
+            seed: Random seed (None = fresh randomness on every run)
         """
         self.num_galaxies = num_galaxies
         self.flow_sample_rate = flow_sample_rate
+        self.rng = np.random.default_rng(seed)
+        
+        # Attractor names and (A, 3) positions in Mpc, in ATTRACTORS order
+        self._attr_names = list(self.ATTRACTORS)
+        self._attr_pos = np.stack([self.ATTRACTORS[n]['position_mpc'] for n in self._attr_names])
         
-    def generate_filament_network(self) -> List[Dict]:
+    def generate_filament_network(self) -> Dict[str, np.ndarray]:
         """
         Generate galaxy positions along cosmic web filaments.
         
@@ -99,69 +175,91 @@ class LaniakeaGenerator:
         - Galaxy density higher near attractors
         - Some scatter perpendicular to filaments
         
+        Galaxies outside the boundary are rejected and drawn again in
+        batches until exactly num_galaxies are inside.
+        
         Returns:
-            List of galaxy dictionaries with positions
+            Galaxy arrays: 'index' (draw number, the galaxy's id) and
+            'position_mpc' ((N, 3) positions; exports convert to meters)
         """
-        galaxies = []
-        
-        # Get attractor list
-        attractor_names = list(self.ATTRACTORS.keys())
-        attractor_positions = [self.ATTRACTORS[a]['position_mpc'] for a in attractor_names]
-        
-        # Generate galaxies
-        for i in range(self.num_galaxies):
-            # Pick two random attractors to define a filament
-            idx1, idx2 = np.random.choice(len(attractor_positions), 2, replace=False)
-            pos1 = attractor_positions[idx1]
-            pos2 = attractor_positions[idx2]
-            
-            # Position along filament (beta distribution for clustering near attractors)
-            t = np.random.beta(2, 2)  # Peaks at 0.5, falls off toward ends
-            
-            # Base position on filament
-            base_pos = pos1 + t * (pos2 - pos1)
-            
-            # Add perpendicular scatter (thins filament)
-            scatter = np.random.randn(3) * 5.0  # 5 Mpc scatter
-            position_mpc = base_pos + scatter
-            
-            # Check if inside Laniakea boundary (ellipsoidal region)
-            if self._inside_laniakea(position_mpc):
-                galaxies.append({
-                    'id': f'Laniakea_Galaxy_{i:05d}',
-                    'position_mpc': position_mpc,
-                    'position_m': position_mpc * self.MPC_TO_M
-                })
-        
-        print(f"✓ Generated {len(galaxies)} galaxies within Laniakea boundary")
+        # Draw batches until enough galaxies fall inside Laniakea boundary
+        # (ellipsoidal region); only the accepted ones of each batch are kept
+        accepted, indices = [], []
+        remaining = self.num_galaxies
+        drawn = 0
+        batch_size = int(np.ceil(self.OVERSAMPLE_FACTOR * remaining))
+        while remaining > 0:
+            positions_mpc, inside = self._draw_filament_batch(batch_size)
+            kept = np.flatnonzero(inside)[:remaining]
+            accepted.append(positions_mpc[kept])
+            indices.append(drawn + kept)
+            drawn += batch_size
+            remaining -= len(kept)
+            accept_rate = max((self.num_galaxies - remaining) / drawn, 0.01)
+            batch_size = int(np.ceil(self.OVERSAMPLE_FACTOR * remaining / accept_rate))
+        
+        positions_mpc = np.concatenate(accepted) if accepted else np.empty((0, 3))
+        galaxies = {
+            'index': np.concatenate(indices) if indices else np.empty(0, dtype=np.int64),
+            'position_mpc': positions_mpc
+        }
+        
+        print(f"✓ Generated {len(positions_mpc)} galaxies within Laniakea boundary")
         return galaxies
     
-    def _inside_laniakea(self, position_mpc: np.ndarray) -> bool:
+    def galaxy_ids(self, galaxies: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Galaxy id strings ('Laniakea_Galaxy_00042'), built on demand.
+        
+        The .speck exports don't write ids, so generation only keeps the
+        'index' array; consumers that need names derive them here.
+        
+        Args:
+            galaxies: Galaxy arrays from generate_filament_network()
+        
+        Returns:
+            String array with one id per galaxy
+        """
+        return np.char.add('Laniakea_Galaxy_', np.char.zfill(galaxies['index'].astype(str), 5))
+    
+    def _draw_filament_batch(self, n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Draw n filament galaxies: (n, 3) positions in Mpc and the inside mask."""
+        num_attractors = len(self._attr_pos)
+        
+        # Pick two distinct random attractors per galaxy to define its filament
+        idx1 = self.rng.integers(0, num_attractors, n)
+        idx2 = (idx1 + self.rng.integers(1, num_attractors, n)) % num_attractors
+        # Position along filament (beta distribution for clustering near attractors)
+        t = self.rng.beta(2, 2, n)  # Peaks at 0.5, falls off toward ends
+        
+        # Base position on filament plus perpendicular scatter (thins filament)
+        scatter = self.rng.standard_normal((n, 3)) * 5.0  # 5 Mpc scatter
+        return filament_positions(
+            self._attr_pos, idx1, idx2, t, scatter,
+            self.BOUNDARY_CENTER_MPC, self.BOUNDARY_RADII_MPC
+        )
+    
+    def _inside_laniakea(self, position_mpc: np.ndarray) -> np.ndarray:
         """
-        Check if position is inside Laniakea boundary.
+        Check if positions are inside Laniakea boundary.
         
         Uses ellipsoidal approximation centered on Great Attractor.
         
         Args:
-            position_mpc: Position in Mpc
+            position_mpc: Position in Mpc, or (N, 3) array of positions
         
         Returns:
-            True if inside Laniakea
+            True if inside Laniakea (boolean array for N positions)
         """
         # Ellipsoid centered on boundary center, stretched toward Great Attractor
         relative_pos = position_mpc - self.BOUNDARY_CENTER_MPC
         
-        # Ellipsoidal radii (Mpc)
-        a = 80.0  # Semi-major axis (toward Great Attractor)
-        b = 60.0  # Semi-minor axes
-        c = 60.0
-        
         # Ellipsoid equation: (x/a)^2 + (y/b)^2 + (z/c)^2 < 1
-        normalized = (relative_pos[0]/a)**2 + (relative_pos[1]/b)**2 + (relative_pos[2]/c)**2
+        normalized = ((relative_pos / self.BOUNDARY_RADII_MPC) ** 2).sum(axis=-1)
         
         return normalized < 1.0
     
-    def generate_flow_vectors(self, galaxies: List[Dict]) -> List[Dict]:
+    def generate_flow_vectors(self, galaxies: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
         """
         Generate velocity flow vectors toward Great Attractor.
         
@@ -169,67 +267,53 @@ class LaniakeaGenerator:
         primarily the Great Attractor.
         
         Args:
-            galaxies: List of galaxy dictionaries
+            galaxies: Galaxy arrays from generate_filament_network()
         
         Returns:
-            List of flow line dictionaries (start + end positions)
+            Flow arrays: (S, 3) 'start_position_mpc' and 'end_position_mpc',
+            and each flow's 'target_attractor' name
         """
-        flows = []
-        
         # Sample subset of galaxies for flow visualization
-        num_flows = int(len(galaxies) * self.flow_sample_rate)
-        sampled_indices = np.random.choice(len(galaxies), num_flows, replace=False)
-        
-        great_attractor_pos = self.ATTRACTORS['GreatAttractor']['position_mpc']
+        positions_mpc = galaxies['position_mpc']
+        num_flows = int(len(positions_mpc) * self.flow_sample_rate)
+        sampled_indices = self.rng.choice(len(positions_mpc), num_flows, replace=False)
+        sampled = positions_mpc[sampled_indices]
+        
+        # Flow direction: toward nearest attractor (simplified model)
+        # In reality, use Cosmicflows-4 velocity field
+        # Squared distance from every sampled galaxy to every attractor
+        diff = sampled[:, None, :] - self._attr_pos[None, :, :]
+        nearest = (diff * diff).sum(axis=2).argmin(axis=1)
+        
+        # Flow vector direction
+        flow_direction = self._attr_pos[nearest] - sampled
+        inv_length = 1.0 / np.sqrt(np.einsum('ij,ij->i', flow_direction, flow_direction))
+        flow_direction_normalized = flow_direction * inv_length[:, None]
+        
+        # Flow magnitude (velocity ~630 km/s, visualized as 10 Mpc arrow)
+        flow_magnitude_mpc = 10.0
+        end_positions_mpc = sampled + flow_direction_normalized * flow_magnitude_mpc
+        
+        flows = {
+            'start_position_mpc': sampled,
+            'end_position_mpc': end_positions_mpc,
+            'target_attractor': np.array(self._attr_names)[nearest]
+        }
         
-        for idx in sampled_indices:
-            galaxy = galaxies[idx]
-            pos = galaxy['position_mpc']
-            
-            # Flow direction: toward nearest attractor (simplified model)
-            # In reality, use Cosmicflows-4 velocity field
-            
-            # Calculate distance to each attractor
-            distances = {}
-            for name, attractor in self.ATTRACTORS.items():
-                dist = np.linalg.norm(pos - attractor['position_mpc'])
-                distances[name] = dist
-            
-            # Flow toward nearest attractor
-            nearest_attractor = min(distances, key=distances.get)
-            target_pos = self.ATTRACTORS[nearest_attractor]['position_mpc']
-            
-            # Flow vector direction
-            flow_direction = target_pos - pos
-            flow_direction_normalized = flow_direction / np.linalg.norm(flow_direction)
-            
-            # Flow magnitude (velocity ~630 km/s, visualized as 10 Mpc arrow)
-            flow_magnitude_mpc = 10.0
-            flow_vector = flow_direction_normalized * flow_magnitude_mpc
-            
-            end_pos_mpc = pos + flow_vector
-            
-            flows.append({
-                'start_position_mpc': pos,
-                'end_position_mpc': end_pos_mpc,
-                'start_position_m': pos * self.MPC_TO_M,
-                'end_position_m': end_pos_mpc * self.MPC_TO_M,
-                'target_attractor': nearest_attractor
-            })
-        
-        print(f"✓ Generated {len(flows)} flow vectors")
+        print(f"✓ Generated {num_flows} flow vectors")
         return flows
     
-    def export_galaxies_to_speck(self, galaxies: List[Dict], output_path: str):
+    def export_galaxies_to_speck(self, galaxies: Dict[str, np.ndarray], output_path: str):
         """
         Export galaxy positions to .speck format.
         
         Args:
-            galaxies: List of galaxy dictionaries
+            galaxies: Galaxy arrays from generate_filament_network()
             output_path: Output file path
         """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        positions_m = galaxies['position_mpc'] * self.MPC_TO_M
         
         with open(output_path, 'w') as f:
             # Header
@@ -238,7 +322,7 @@ class LaniakeaGenerator:
             f.write("#   SOURCE: Tully et al. 2014 (Nature 513, 71–73)\n")
             f.write("#   DOI: 10.1038/nature13674\n")
             f.write(f"#   Generated: {datetime.now().isoformat()}\n")
-            f.write(f"#   Number of galaxies: {len(galaxies)}\n")
+            f.write(f"#   Number of galaxies: {len(positions_m)}\n")
             f.write("#\n")
             f.write("# NOTE: This is a procedural approximation based on published topology.\n")
             f.write("#       Future versions will use Cosmicflows-4 actual data.\n")
@@ -251,24 +335,22 @@ class LaniakeaGenerator:
             f.write("# Coordinates: Cartesian (meters), Galactic frame\n")
             f.write("#\n")
             
-            # Data rows
-            for galaxy in galaxies:
-                x, y, z = galaxy['position_m']
-                colorb_v = 0.5  # INFERRED (maps to Gold in color scheme)
-                f.write(f"{x:.6e} {y:.6e} {z:.6e} {colorb_v:.3f}\n")
+            # Data rows, formatted in one pass and written with one call
+            f.write((self.GALAXY_ROW_FORMAT * len(positions_m)) % tuple(positions_m.ravel().tolist()))
         
-        print(f"✓ Exported {len(galaxies)} galaxies to {output_path}")
+        print(f"✓ Exported {len(positions_m)} galaxies to {output_path}")
     
-    def export_flows_to_speck(self, flows: List[Dict], output_path: str):
+    def export_flows_to_speck(self, flows: Dict[str, np.ndarray], output_path: str):
         """
         Export flow vectors to .speck format as line segments.
         
         Args:
-            flows: List of flow dictionaries
+            flows: Flow arrays from generate_flow_vectors()
             output_path: Output file path
         """
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
+        segments_m = np.hstack([flows['start_position_mpc'], flows['end_position_mpc']]) * self.MPC_TO_M
         
         with open(output_path, 'w') as f:
             # Header
@@ -277,7 +359,7 @@ class LaniakeaGenerator:
             f.write("#   SOURCE: Tully et al. 2014 (Cosmicflows-2)\n")
             f.write("#   DOI: 10.1038/nature13674\n")
             f.write(f"#   Generated: {datetime.now().isoformat()}\n")
-            f.write(f"#   Number of flow lines: {len(flows)}\n")
+            f.write(f"#   Number of flow lines: {len(segments_m)}\n")
             f.write("#\n")
             f.write("# Flow vectors point toward local attractors\n")
             f.write("# Primary: Great Attractor (Norma Cluster)\n")
@@ -288,12 +370,9 @@ class LaniakeaGenerator:
             f.write("#\n")
             
             # Data rows (line segments)
-            for flow in flows:
-                x1, y1, z1 = flow['start_position_m']
-                x2, y2, z2 = flow['end_position_m']
-                f.write(f"{x1:.6e} {y1:.6e} {z1:.6e} {x2:.6e} {y2:.6e} {z2:.6e}\n")
+            f.write((self.FLOW_ROW_FORMAT * len(segments_m)) % tuple(segments_m.ravel().tolist()))
         
-        print(f"✓ Exported {len(flows)} flow lines to {output_path}")
+        print(f"✓ Exported {len(segments_m)} flow lines to {output_path}")
     
     def export_attractors_to_json(self, output_path: str):
         """
@@ -321,7 +400,7 @@ class LaniakeaGenerator:
         
         print(f"✓ Exported attractor data to {output_path}")
     
-    def print_statistics(self, galaxies: List[Dict], flows: List[Dict]):
+    def print_statistics(self, galaxies: Dict[str, np.ndarray], flows: Dict[str, np.ndarray]):
         """Print generation statistics."""
         print(f"\n{'='*60}")
         print("LANIAKEA SUPERCLUSTER - GENERATION SUMMARY")
@@ -334,13 +413,13 @@ class LaniakeaGenerator:
         print(f"  Total galaxies (real): ~100,000")
         print(f"  Velocity flow: ~630 km/s toward Great Attractor")
         print(f"\nGENERATED DATA:")
-        print(f"  Galaxy points: {len(galaxies)}")
-        print(f"  Flow vectors: {len(flows)}")
+        positions = galaxies['position_mpc']
+        print(f"  Galaxy points: {len(positions)}")
+        print(f"  Flow vectors: {len(flows['start_position_mpc'])}")
         print(f"  Attractors: {len(self.ATTRACTORS)}")
         
         # Spatial statistics
-        if galaxies:
-            positions = np.array([g['position_mpc'] for g in galaxies])
+        if len(positions):
             center = np.mean(positions, axis=0)
             std = np.std(positions, axis=0)
             print(f"\nSPATIAL DISTRIBUTION:")
@@ -356,7 +435,7 @@ class LaniakeaGenerator:
         print(f"{'='*60}\n")
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Generate Laniakea supercluster visualization (L1 - INFERRED)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -373,6 +452,9 @@ EXAMPLES:
   # Generate more galaxies with more flow lines
   python generate_laniakea.py --galaxies 10000 --flow-rate 0.3
   
+  # Reproducible output
+  python generate_laniakea.py --seed 42
+  
   # Custom output directory
   python generate_laniakea.py --output-dir ../../data/laniakea
         """
@@ -382,17 +464,20 @@ EXAMPLES:
                        help='Number of galaxy points to generate (default: 5000)')
     parser.add_argument('--flow-rate', type=float, default=0.2,
                        help='Fraction of galaxies to show flow lines for (default: 0.2)')
+    parser.add_argument('--seed', type=int,
+                       help='Random seed for reproducible output (default: random)')
     parser.add_argument('--output-dir', default='../../data/laniakea',
                        help='Output directory (default: ../../data/laniakea)')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     print("\nGenerating Laniakea supercluster structure...")
     
     # Initialize generator
     generator = LaniakeaGenerator(
         num_galaxies=args.galaxies,
-        flow_sample_rate=args.flow_rate
+        flow_sample_rate=args.flow_rate,
+        seed=args.seed
     )
     
     # Generate structure
@@ -19,12 +19,127 @@ MATHEMATICAL MODEL:
 CONSTITUTION COMPLIANCE:
 - Invariant of Labeling: Output tagged as L1 (INFERRED)
 - Invariant of Reference: Motion relative to Galactic Center frame
+
+DEPENDENCIES:
+    pip install --user numpy
+    pip install --user numba  # Optional, compiles the orbit kernel
+
+PERFORMANCE:
+    With numba the orbit kernel runs its samples in parallel (prange) on
+    numba's thread pool, one thread per core by default. Set
+    NUMBA_NUM_THREADS to cap it, e.g. when several build phases share the
+    machine.
 """
 
+import math
+import os
 import numpy as np
 import argparse
+from dataclasses import dataclass, replace
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+try:
+    import numba  # Optional: compiled orbit kernel
+except ImportError:
+    numba = None
+
+
+def _fill_orbit_numpy(out_pc, theta_end, phi_end, radius_pc, amplitude_pc):
+    """NumPy orbit positions, written in place into out_pc; returns the z range."""
+    n = out_pc.shape[1]
+    theta = np.linspace(0.0, theta_end, n)
+    np.cos(theta, out=out_pc[0])
+    np.sin(theta, out=out_pc[1])
+    out_pc[:2] *= radius_pc
+    np.sin(np.linspace(0.0, phi_end, n), out=out_pc[2])
+    out_pc[2] *= amplitude_pc
+    return np.min(out_pc[2], initial=np.inf), np.max(out_pc[2], initial=-np.inf)
+
+
+if numba is not None:
+    # Every fastmath flag except nnan/ninf: the z range starts from ±inf.
+    # Compiled code is cached under __pycache__ so later runs skip the
+    # compile, except for script runs: a cache entry re-imports the module
+    # that wrote it, and src.ingestion is not importable from this directory
+    @numba.njit(parallel=True, fastmath={'reassoc', 'contract', 'afn', 'arcp', 'nsz'},
+                cache=__name__ != '__main__')
+    def _fill_orbit_compiled(out_pc, theta_end, phi_end, radius_pc, amplitude_pc):
+        """Compiled orbit positions: one fused loop writing all three rows and reducing the z range."""
+        n = out_pc.shape[1]
+        steps = max(n - 1, 1)
+        z_min = np.inf
+        z_max = -np.inf
+        for i in numba.prange(n):
+            fraction = i / steps
+            theta = theta_end * fraction
+            z = amplitude_pc * math.sin(phi_end * fraction)
+            out_pc[0, i] = radius_pc * math.cos(theta)
+            out_pc[1, i] = radius_pc * math.sin(theta)
+            out_pc[2, i] = z
+            z_min = min(z_min, z)
+            z_max = max(z_max, z)
+        return z_min, z_max
+
+
+def fill_orbit(out_pc, theta_end, phi_end, radius_pc, amplitude_pc):
+    """
+    Write the Sun's helical orbit positions into a preallocated array.
+    
+    Circular orbit of radius_pc in the X-Y plane plus a sinusoidal vertical
+    oscillation along Z, sampled at N evenly spaced times. The orbital phase
+    theta and vertical phase phi run linearly from 0 to theta_end and
+    phi_end, so no time array is needed. Uses the compiled kernel when
+    numba is installed: sine, cosine and the z range reduction happen in
+    one pass with no temporary arrays.
+    
+    Args:
+        out_pc: (3, N) output x, y, z rows in parsecs
+        theta_end: Orbital phase at the last sample in radians
+        phi_end: Vertical oscillation phase at the last sample in radians
+        radius_pc: Orbital radius in parsecs
+        amplitude_pc: Vertical amplitude in parsecs
+    
+    Returns:
+        (minimum z, maximum z) in parsecs; (inf, -inf) for no samples
+    """
+    fill = _fill_orbit_compiled if numba is not None else _fill_orbit_numpy
+    return fill(out_pc, theta_end, phi_end, radius_pc, amplitude_pc)
+
+
+@dataclass(frozen=True)
+class OrbitMetadata:
+    """Provenance metadata for a generated orbit."""
+    generation_date: str
+    parameters: Dict[str, float]
+    epistemic_status: str = 'L1'
+    epistemic_label: str = 'INFERRED'
+    source: str = 'Galactic dynamics models'
+    reference_frame: str = 'Galactic Center'
+    notes: str = 'Simplified model assuming circular orbit and sinusoidal vertical oscillation'
+    z_range_pc: Optional[Tuple[float, float]] = None  # Set per generated orbit
+
+
+def write_bytes(path, data: bytes):
+    """
+    Write a fully rendered export with raw os.write calls.
+    
+    The text is formatted in memory first, so the file is written without
+    Python's buffered text layer: one system call per chunk the kernel
+    accepts (usually a single one).
+    
+    Args:
+        path: Output file path
+        data: Encoded file contents
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 
 class SunGalacticOrbitGenerator:
@@ -42,6 +157,10 @@ class SunGalacticOrbitGenerator:
     KPC_TO_M = 3.0857e19  # Kiloparsec to meters
     MYR_TO_S = 3.154e13  # Million years to seconds
     
+    # Export rows: time in Myr, then coordinates
+    SPECK_ROW_FORMAT = "%.6f %.6e %.6e %.6e\n"
+    CSV_ROW_FORMAT = "%.6f,%.6e,%.6e,%.6e,%.6e,%.6e,%.6e\n"
+    
     def __init__(self, num_samples=10000, time_span_myr=230.0):
         """
         Initialize the orbit generator.
@@ -52,65 +171,51 @@ class SunGalacticOrbitGenerator:
         """
         self.num_samples = num_samples
         self.time_span_myr = time_span_myr
+        self.metadata = self._generate_metadata()
         
     def generate_orbit(self):
         """
         Generate the helical orbital path.
         
         Returns:
-            dict: Contains 'times', 'positions', and 'metadata'
+            dict: 'times_myr', one 1-D array per coordinate in parsecs
+            ('x_pc', 'y_pc', 'z_pc'; exports convert to meters), and 'metadata':
+            the generator's OrbitMetadata with the samples' z_range_pc (min, max)
         """
         # Time array (in million years)
         times_myr = np.linspace(0, self.time_span_myr, self.num_samples)
         
-        # Angular position (radians)
-        # theta = 2π * (t / T_orbital)
-        theta = 2 * np.pi * (times_myr / self.ORBITAL_PERIOD_MYR)
-        
-        # Vertical oscillation
-        # z = A * sin(2π * t / T_vertical)
-        z_oscillation = self.VERTICAL_AMPLITUDE_PC * np.sin(
-            2 * np.pi * times_myr / self.VERTICAL_PERIOD_MYR
-        )
-        
-        # Cartesian coordinates (in parsecs, Galactic frame)
-        # X-Y plane: Circular orbit
-        # Z axis: Perpendicular to galactic disk
-        x_pc = self.ORBITAL_RADIUS_KPC * 1000 * np.cos(theta)
-        y_pc = self.ORBITAL_RADIUS_KPC * 1000 * np.sin(theta)
-        z_pc = z_oscillation
-        
-        # Convert to meters for OpenSpace
-        positions_m = np.column_stack([
-            x_pc * self.PC_TO_M,
-            y_pc * self.PC_TO_M,
-            z_pc * self.PC_TO_M
-        ])
+        # Angular position theta = 2π * (t / T_orbital) on a circular orbit
+        # in the X-Y plane, vertical oscillation z = A * sin(2π * t / T_vertical)
+        # along Z (perpendicular to galactic disk); Galactic frame, parsecs.
+        # Both phases are linear in t, so only their end values are needed
+        theta_end = 2 * np.pi * self.time_span_myr / self.ORBITAL_PERIOD_MYR
+        phi_end = 2 * np.pi * self.time_span_myr / self.VERTICAL_PERIOD_MYR
+        positions_pc = np.empty((3, self.num_samples))
+        z_min, z_max = fill_orbit(positions_pc, theta_end, phi_end,
+                                  self.ORBITAL_RADIUS_KPC * 1000, self.VERTICAL_AMPLITUDE_PC)
+        metadata = replace(self.metadata, z_range_pc=(float(z_min), float(z_max)))
         
         return {
             'times_myr': times_myr,
-            'positions_m': positions_m,
-            'positions_pc': np.column_stack([x_pc, y_pc, z_pc]),
-            'metadata': self._generate_metadata()
+            'x_pc': positions_pc[0],
+            'y_pc': positions_pc[1],
+            'z_pc': positions_pc[2],
+            'metadata': metadata
         }
     
     def _generate_metadata(self):
-        """Generate provenance metadata."""
-        return {
-            'epistemic_status': 'L1',
-            'epistemic_label': 'INFERRED',
-            'source': 'Galactic dynamics models',
-            'reference_frame': 'Galactic Center',
-            'generation_date': datetime.now().isoformat(),
-            'parameters': {
+        """Generate provenance metadata, once per generator."""
+        return OrbitMetadata(
+            generation_date=datetime.now().isoformat(),
+            parameters={
                 'orbital_period_myr': self.ORBITAL_PERIOD_MYR,
                 'vertical_period_myr': self.VERTICAL_PERIOD_MYR,
                 'vertical_amplitude_pc': self.VERTICAL_AMPLITUDE_PC,
                 'orbital_radius_kpc': self.ORBITAL_RADIUS_KPC,
                 'orbital_velocity_kms': self.ORBITAL_VELOCITY_KMS
-            },
-            'notes': 'Simplified model assuming circular orbit and sinusoidal vertical oscillation'
-        }
+            }
+        )
     
     def export_to_speck(self, output_path, data):
         """
@@ -123,25 +228,27 @@ class SunGalacticOrbitGenerator:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            # Header with metadata
-            f.write("# Sun's Galactic Orbit\n")
-            f.write(f"# EPISTEMIC STATUS: {data['metadata']['epistemic_status']} ({data['metadata']['epistemic_label']})\n")
-            f.write(f"# SOURCE: {data['metadata']['source']}\n")
-            f.write(f"# REFERENCE FRAME: {data['metadata']['reference_frame']}\n")
-            f.write(f"# Generated: {data['metadata']['generation_date']}\n")
-            f.write(f"# Orbital Period: {self.ORBITAL_PERIOD_MYR} Myr\n")
-            f.write(f"# Vertical Period: {self.VERTICAL_PERIOD_MYR} Myr\n")
-            f.write(f"# Vertical Amplitude: {self.VERTICAL_AMPLITUDE_PC} pc\n")
-            f.write("#\n")
-            f.write("# Format: time_myr x_m y_m z_m\n")
-            f.write("#\n")
-            
-            # Data points
-            for i in range(len(data['times_myr'])):
-                t = data['times_myr'][i]
-                x, y, z = data['positions_m'][i]
-                f.write(f"{t:.6f} {x:.6e} {y:.6e} {z:.6e}\n")
+        # Header with metadata
+        metadata = data['metadata']
+        header = (
+            "# Sun's Galactic Orbit\n"
+            f"# EPISTEMIC STATUS: {metadata.epistemic_status} ({metadata.epistemic_label})\n"
+            f"# SOURCE: {metadata.source}\n"
+            f"# REFERENCE FRAME: {metadata.reference_frame}\n"
+            f"# Generated: {metadata.generation_date}\n"
+            f"# Orbital Period: {self.ORBITAL_PERIOD_MYR} Myr\n"
+            f"# Vertical Period: {self.VERTICAL_PERIOD_MYR} Myr\n"
+            f"# Vertical Amplitude: {self.VERTICAL_AMPLITUDE_PC} pc\n"
+            "#\n"
+            "# Format: time_myr x_m y_m z_m\n"
+            "#\n"
+        )
+        
+        # Data points (meters for OpenSpace)
+        rows = np.column_stack([data['times_myr'], data['x_pc'], data['y_pc'], data['z_pc']])
+        rows[:, 1:] *= self.PC_TO_M
+        body = (self.SPECK_ROW_FORMAT * len(rows)) % tuple(rows.ravel().tolist())
+        write_bytes(output_path, (header + body).encode())
         
         print(f"✓ Exported {len(data['times_myr'])} points to {output_path}")
     
@@ -156,16 +263,12 @@ class SunGalacticOrbitGenerator:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            # CSV header
-            f.write("time_myr,x_pc,y_pc,z_pc,x_m,y_m,z_m\n")
-            
-            # Data rows
-            for i in range(len(data['times_myr'])):
-                t = data['times_myr'][i]
-                x_pc, y_pc, z_pc = data['positions_pc'][i]
-                x_m, y_m, z_m = data['positions_m'][i]
-                f.write(f"{t:.6f},{x_pc:.6e},{y_pc:.6e},{z_pc:.6e},{x_m:.6e},{y_m:.6e},{z_m:.6e}\n")
+        # CSV header and data rows
+        rows = np.column_stack([data[column] for column in
+                                ('times_myr', 'x_pc', 'y_pc', 'z_pc', 'x_pc', 'y_pc', 'z_pc')])
+        rows[:, 4:] *= self.PC_TO_M
+        body = (self.CSV_ROW_FORMAT * len(rows)) % tuple(rows.ravel().tolist())
+        write_bytes(output_path, ("time_myr,x_pc,y_pc,z_pc,x_m,y_m,z_m\n" + body).encode())
         
         print(f"✓ Exported {len(data['times_myr'])} points to {output_path}")
     
@@ -174,9 +277,10 @@ class SunGalacticOrbitGenerator:
         print("\n" + "="*60)
         print("SUN'S GALACTIC ORBIT - GENERATION SUMMARY")
         print("="*60)
-        print(f"\nEPISTEMIC STATUS: {data['metadata']['epistemic_status']} ({data['metadata']['epistemic_label']})")
-        print(f"SOURCE: {data['metadata']['source']}")
-        print(f"REFERENCE FRAME: {data['metadata']['reference_frame']}")
+        metadata = data['metadata']
+        print(f"\nEPISTEMIC STATUS: {metadata.epistemic_status} ({metadata.epistemic_label})")
+        print(f"SOURCE: {metadata.source}")
+        print(f"REFERENCE FRAME: {metadata.reference_frame}")
         print(f"\nPARAMETERS:")
         print(f"  Orbital Period: {self.ORBITAL_PERIOD_MYR} million years")
         print(f"  Vertical Oscillation Period: {self.VERTICAL_PERIOD_MYR} million years")
@@ -189,8 +293,8 @@ class SunGalacticOrbitGenerator:
         print(f"  Time resolution: {self.time_span_myr / self.num_samples * 1000:.2f} thousand years/sample")
         
         # Positional statistics
-        z_min = np.min(data['positions_pc'][:, 2])
-        z_max = np.max(data['positions_pc'][:, 2])
+        # Reduced by the orbit kernel; no pass over the samples here
+        z_min, z_max = metadata.z_range_pc
         print(f"\nVERTICAL RANGE:")
         print(f"  Min Z: {z_min:.2f} pc ({z_min * 3.26:.2f} ly)")
         print(f"  Max Z: {z_max:.2f} pc ({z_max * 3.26:.2f} ly)")
@@ -198,7 +302,7 @@ class SunGalacticOrbitGenerator:
         print("="*60 + "\n")
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Generate Sun's galactic orbit path (L1 - INFERRED)",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -217,6 +321,9 @@ EXAMPLES:
   
   # Output to custom directory
   python generate_sun_path.py --output-dir ../../data/orbits
+  
+  # Very fine orbit on 4 threads (needs numba)
+  NUMBA_NUM_THREADS=4 python generate_sun_path.py --samples 5000000
         """
     )
     
@@ -248,7 +355,7 @@ EXAMPLES:
         help='Output format (default: both)'
     )
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Generate orbit
     print("\nGenerating Sun's galactic orbit...")
@@ -28,16 +28,20 @@ USAGE:
 """
 
 import argparse
+import csv
+import io
 import json
 import sys
+import tempfile
 from datetime import datetime
-from typing import Dict, List, Optional
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
 
 try:
     import numpy as np
     from astroquery.gaia import Gaia
     import psycopg2
-    from psycopg2.extras import execute_values
 except ImportError as e:
     print(f"ERROR: Missing dependency: {e}")
     print("Install with: pip install --user astroquery psycopg2-binary numpy")
@@ -51,6 +55,34 @@ class GaiaIngestionPipeline:
     GAIA_DR3_DOI = "10.1051/0004-6361/202243940"
     GAIA_DR3_SOURCE = "Gaia DR3"
     GAIA_DR3_RELEASE_DATE = "2022-06-13"
+    # Provenance JSONB with the per-star fields left as %-placeholders;
+    # floats use repr, as json.dumps does
+    PROVENANCE_TEMPLATE = (
+        '{"source": %s, "doi": %s, "release_date": %s, '
+        '"parallax_error_mas": %%r, "parallax_over_error": %%r, "gaia_source_id": "%%d"}'
+    ) % (json.dumps(GAIA_DR3_SOURCE), json.dumps(GAIA_DR3_DOI), json.dumps(GAIA_DR3_RELEASE_DATE))
+    
+    # TAP results are dumped to an uncompressed CSV file and read back in
+    # batches, so peak memory is one batch whatever the row count
+    RESULT_FORMAT = 'csv'
+    BATCH_SIZE = 100_000
+    INTEGER_COLUMNS = ('source_id',)
+    
+    # Staging table for COPY; dropped when the insert transaction commits
+    STAGE_COLUMNS = ('id', 'ra', 'dec', 'distance_pc', 'parallax_mas',
+                     'magnitude_g', 'color_index_bp_rp', 'provenance')
+    STAGE_TABLE_SQL = """
+        CREATE TEMP TABLE stage_gaia (
+            id TEXT,
+            ra DOUBLE PRECISION,
+            dec DOUBLE PRECISION,
+            distance_pc DOUBLE PRECISION,
+            parallax_mas DOUBLE PRECISION,
+            magnitude_g DOUBLE PRECISION,
+            color_index_bp_rp DOUBLE PRECISION,
+            provenance JSONB
+        ) ON COMMIT DROP
+    """
     
     def __init__(self, db_config: Dict[str, str]):
         """
@@ -74,16 +106,17 @@ class GaiaIngestionPipeline:
             print(f"✗ Database connection failed: {e}")
             sys.exit(1)
     
-    def query_gaia(self, limit: int = 100000, magnitude_limit: float = 12.0) -> List[Dict]:
+    def query_gaia(self, output_file, limit: int = 100000, magnitude_limit: float = 12.0) -> Path:
         """
         Query Gaia DR3 for bright stars.
         
         Args:
+            output_file: Path the CSV results are written to
             limit: Maximum number of stars to fetch
             magnitude_limit: Magnitude cutoff (brighter = smaller number)
         
         Returns:
-            List of star dictionaries with Gaia data
+            Path of the CSV results, to be read with read_batches()
         """
         print(f"\n{'='*60}")
         print("QUERYING GAIA DR3")
@@ -113,32 +146,60 @@ class GaiaIngestionPipeline:
         
         print(f"\nExecuting ADQL query...")
         try:
-            job = Gaia.launch_job_async(query)
-            results = job.get_results()
-            print(f"✓ Retrieved {len(results)} stars from Gaia DR3")
+            # dump_to_file saves the results without parsing them into a Table
+            Gaia.launch_job_async(query, output_format=self.RESULT_FORMAT,
+                                  dump_to_file=True, output_file=str(output_file))
+            print(f"✓ Saved Gaia DR3 results to {output_file}")
             
-            # Convert to list of dicts
-            stars = []
-            for row in results:
-                stars.append({
-                    'source_id': str(row['source_id']),
-                    'ra': float(row['ra']),
-                    'dec': float(row['dec']),
-                    'parallax': float(row['parallax']),
-                    'parallax_error': float(row['parallax_error']),
-                    'magnitude_g': float(row['phot_g_mean_mag']),
-                    'color_bp_rp': float(row['bp_rp']) if row['bp_rp'] is not None else None,
-                    'pmra': float(row['pmra']) if row['pmra'] is not None else None,
-                    'pmdec': float(row['pmdec']) if row['pmdec'] is not None else None
-                })
-            
-            return stars
+            return Path(output_file)
             
         except Exception as e:
             print(f"✗ Gaia query failed: {e}")
             sys.exit(1)
     
-    def validate_and_adjudicate(self, stars: List[Dict]) -> List[Dict]:
+    def read_batches(self, path, batch_size: Optional[int] = None) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Read query results in fixed-size batches of columns.
+        
+        Args:
+            path: CSV results from query_gaia()
+            batch_size: Rows per batch (default: BATCH_SIZE)
+        
+        Yields:
+            One array per result column; missing floats are NaN
+        """
+        batch_size = batch_size or self.BATCH_SIZE
+        with open(path, newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            while True:
+                rows = list(islice(reader, batch_size))
+                if not rows:
+                    return
+                # One string array per batch, cast column by column
+                table = np.array(rows, dtype=str).T
+                yield {
+                    name: (column.astype(np.int64) if name in self.INTEGER_COLUMNS
+                           else self._parse_float_column(column))
+                    for name, column in zip(header, table)
+                }
+    
+    @staticmethod
+    def _parse_float_column(column: np.ndarray) -> np.ndarray:
+        """Cast a string column to float64 in one call, NaN for empty fields."""
+        present = column != ''
+        if present.all():
+            return column.astype(np.float64)
+        values = np.full(len(column), np.nan)
+        values[present] = column[present].astype(np.float64)
+        return values
+    
+    @staticmethod
+    def _float_column(stars, name: str) -> np.ndarray:
+        """Column of a Gaia result as float64, NaN where the value is missing."""
+        return np.ma.filled(np.ma.asarray(stars[name], dtype=np.float64), np.nan)
+    
+    def validate_and_adjudicate(self, stars) -> Dict[str, np.ndarray]:
         """
         Validate data and adjudicate epistemic status.
         
@@ -147,88 +208,83 @@ class GaiaIngestionPipeline:
         - Reject any star without parallax_error (no error margin)
         
         Args:
-            stars: Raw Gaia data
+            stars: One batch of Gaia results from read_batches()
         
         Returns:
-            Validated stars with epistemic status and provenance
+            Validated star columns with epistemic status and provenance;
+            missing colors are NaN
         """
         print(f"\n{'='*60}")
         print("EPISTEMIC ADJUDICATION (Invariant I)")
         print(f"{'='*60}")
         
-        validated = []
-        rejected_count = 0
+        # Labeling Check: Must have error margin (missing values are NaN,
+        # which fails the comparison)
+        parallax_error = self._float_column(stars, 'parallax_error')
+        valid = parallax_error > 0
+        rejected_count = len(valid) - int(valid.sum())
         
-        for star in stars:
-            # Labeling Check: Must have error margin
-            if star['parallax_error'] is None or star['parallax_error'] <= 0:
-                rejected_count += 1
-                continue
-            
+        source_id = np.asarray(stars['source_id'])[valid]
+        parallax = self._float_column(stars, 'parallax')[valid]
+        parallax_error = parallax_error[valid]
+        
+        # Build provenance JSONB from the template (no dict or json.dumps per star)
+        provenance = [
+            self.PROVENANCE_TEMPLATE % (error, over_error, sid)
+            for sid, error, over_error in zip(source_id.tolist(), parallax_error.tolist(),
+                                               (parallax / parallax_error).tolist())
+        ]
+        
+        validated = {
+            'id': np.char.add('GaiaDR3_', source_id.astype(str)),
+            'truth_label': 'OBSERVED',  # Invariant I: Explicit label
+            'ra': self._float_column(stars, 'ra')[valid],
+            'dec': self._float_column(stars, 'dec')[valid],
             # Calculate distance from parallax (in parsecs)
             # Distance = 1000 / parallax_mas
-            distance_pc = 1000.0 / star['parallax']
-            
-            # Build provenance JSONB
-            provenance = {
-                'source': self.GAIA_DR3_SOURCE,
-                'doi': self.GAIA_DR3_DOI,
-                'release_date': self.GAIA_DR3_RELEASE_DATE,
-                'parallax_error_mas': star['parallax_error'],
-                'parallax_over_error': star['parallax'] / star['parallax_error'],
-                'gaia_source_id': star['source_id']
-            }
-            
-            # Add validated star
-            validated.append({
-                'id': f"GaiaDR3_{star['source_id']}",
-                'truth_label': 'OBSERVED',  # Invariant I: Explicit label
-                'ra': star['ra'],
-                'dec': star['dec'],
-                'distance_pc': distance_pc,
-                'parallax_mas': star['parallax'],
-                'magnitude_g': star['magnitude_g'],
-                'color_bp_rp': star['color_bp_rp'],
-                'provenance': json.dumps(provenance)
-            })
+            'distance_pc': 1000.0 / parallax,
+            'parallax_mas': parallax,
+            'magnitude_g': self._float_column(stars, 'phot_g_mean_mag')[valid],
+            'color_bp_rp': self._float_column(stars, 'bp_rp')[valid],
+            'provenance': provenance
+        }
         
-        print(f"✓ Validated: {len(validated)} stars")
+        print(f"✓ Validated: {len(parallax)} stars")
         print(f"✗ Rejected: {rejected_count} stars (missing error margin)")
-        print(f"  Pass rate: {len(validated) / len(stars) * 100:.1f}%")
+        print(f"  Pass rate: {len(parallax) / len(valid) * 100:.1f}%")
         
         return validated
     
-    def insert_to_db(self, stars: List[Dict]):
+    def insert_to_db(self, stars: Dict[str, np.ndarray]):
         """
         Insert validated stars into PostGIS database.
         
         Args:
-            stars: Validated star data with epistemic labels
+            stars: Validated star columns from validate_and_adjudicate()
         """
         print(f"\n{'='*60}")
         print("DATABASE INSERTION")
         print(f"{'='*60}")
         
-        # Prepare data for batch insert
-        # Format: (id, truth_label, location, parallax, magnitude, color, provenance)
-        values = []
-        for star in stars:
-            # Create PostGIS POINTZ (RA, Dec, Distance)
-            # Note: PostGIS GEOGRAPHY uses (longitude, latitude, elevation)
-            # We map: RA -> longitude, Dec -> latitude, Distance -> elevation
-            location_wkt = f"SRID=4326;POINTZ({star['ra']} {star['dec']} {star['distance_pc']})"
-            
-            values.append((
-                star['id'],
-                star['truth_label'],
-                location_wkt,
-                star['parallax_mas'],
-                star['magnitude_g'],
-                star['color_bp_rp'],
-                star['provenance']
-            ))
+        # Stream rows through COPY into a staging table with plain columns
+        # Format: (id, ra, dec, distance, parallax, magnitude, color, provenance)
+        # Missing colors go in as NULL (an unquoted empty CSV field)
+        color = stars['color_bp_rp'].astype(object)
+        color[np.isnan(stars['color_bp_rp'])] = None
+        
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(zip(
+            stars['id'], stars['ra'].tolist(), stars['dec'].tolist(),
+            stars['distance_pc'].tolist(), stars['parallax_mas'].tolist(),
+            stars['magnitude_g'].tolist(), color.tolist(), stars['provenance']
+        ))
+        buffer.seek(0)
         
-        # Batch insert
+        # Build every location in one statement, skipping stars already
+        # ingested with an anti-join (one hash join instead of a primary-key
+        # probe per row)
+        # Note: PostGIS GEOGRAPHY uses (longitude, latitude, elevation)
+        # We map: RA -> longitude, Dec -> latitude, Distance -> elevation
         insert_query = """
             INSERT INTO cosmic_objects (
                 id,
@@ -238,19 +294,34 @@ class GaiaIngestionPipeline:
                 magnitude_g,
                 color_index_bp_rp,
                 provenance
-            ) VALUES %s
-            ON CONFLICT (id) DO NOTHING
+            )
+            SELECT
+                s.id,
+                %s::epistemic_status_type,
+                ST_SetSRID(ST_MakePoint(s.ra, s.dec, s.distance_pc), 4326)::geography,
+                s.parallax_mas,
+                s.magnitude_g,
+                s.color_index_bp_rp,
+                s.provenance
+            FROM stage_gaia s
+            WHERE NOT EXISTS (
+                SELECT 1 FROM cosmic_objects c WHERE c.id = s.id
+            )
         """
         
         try:
-            execute_values(
-                self.cursor,
-                insert_query,
-                values,
-                template="(%s, %s::epistemic_status_type, ST_GeographyFromText(%s), %s, %s, %s, %s::jsonb)"
+            self.cursor.execute(self.STAGE_TABLE_SQL)
+            self.cursor.copy_expert(
+                f"COPY stage_gaia ({', '.join(self.STAGE_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+                buffer
             )
+            # Temp tables are never auto-analyzed; give the planner row counts
+            self.cursor.execute("ANALYZE stage_gaia")
+            self.cursor.execute(insert_query, (stars['truth_label'],))
+            inserted = self.cursor.rowcount
             self.conn.commit()
-            print(f"✓ Inserted {len(stars)} stars into cosmic_objects table")
+            print(f"✓ Inserted {inserted} stars into cosmic_objects table "
+                  f"({len(stars['id']) - inserted} already present)")
             
         except Exception as e:
             self.conn.rollback()
@@ -263,20 +334,18 @@ class GaiaIngestionPipeline:
         print("DATABASE STATISTICS")
         print(f"{'='*60}")
         
-        # Count by epistemic status
+        # Count by epistemic status; ROLLUP adds the total row from the same scan
         self.cursor.execute("""
-            SELECT truth_label, COUNT(*) 
-            FROM cosmic_objects 
-            GROUP BY truth_label
+            SELECT truth_label, COUNT(*), GROUPING(truth_label)
+            FROM cosmic_objects
+            GROUP BY ROLLUP (truth_label)
+            ORDER BY GROUPING(truth_label), truth_label
         """)
         
-        for label, count in self.cursor.fetchall():
+        for label, count, is_total in self.cursor.fetchall():
+            if is_total:
+                label = "TOTAL"
             print(f"  {label}: {count:,} objects")
-        
-        # Total count
-        self.cursor.execute("SELECT COUNT(*) FROM cosmic_objects")
-        total = self.cursor.fetchone()[0]
-        print(f"  TOTAL: {total:,} objects")
     
     def close(self):
         """Close database connection."""
@@ -286,7 +355,7 @@ class GaiaIngestionPipeline:
             self.conn.close()
 
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(
         description="Ingest Gaia DR3 data into Epistemic Engine database",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -325,7 +394,7 @@ EXAMPLES:
     parser.add_argument('--test', action='store_true',
                        help='Test mode: limit to 100 stars')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     
     # Test mode override
     if args.test:
@@ -348,17 +417,20 @@ EXAMPLES:
         # 1. Connect to database
         pipeline.connect_db()
         
-        # 2. Query Gaia
-        stars = pipeline.query_gaia(
-            limit=args.limit,
-            magnitude_limit=args.magnitude_limit
-        )
-        
-        # 3. Validate and adjudicate
-        validated_stars = pipeline.validate_and_adjudicate(stars)
-        
-        # 4. Insert to database
-        pipeline.insert_to_db(validated_stars)
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # 2. Query Gaia
+            results_path = pipeline.query_gaia(
+                Path(tmp_dir) / 'gaia_dr3.csv',
+                limit=args.limit,
+                magnitude_limit=args.magnitude_limit
+            )
+            
+            for stars in pipeline.read_batches(results_path):
+                # 3. Validate and adjudicate
+                validated_stars = pipeline.validate_and_adjudicate(stars)
+                
+                # 4. Insert to database
+                pipeline.insert_to_db(validated_stars)
         
         # 5. Print statistics
         pipeline.print_statistics()
@@ -0,0 +1,151 @@
+"""
+Epistemic Engine - CMB Arrow Mesh Tests
+========================================
+
+PURPOSE: Validate the CMB velocity arrow mesh generator
+
+Tests ensure that:
+1. Cylinder and cone vertices lie on their rings, caps and apex
+2. Faces index valid vertices in the documented winding order
+3. The assembled arrow points from the origin along the CMB direction
+4. OBJ export writes one v line per vertex and 1-based f lines
+5. The alignment matrix is a proper rotation, also for opposite vectors
+6. Vertices keep the full precision of the OBJ format at default scale
+7. The mesh has no duplicate vertices left to merge
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.ingestion.generate_cmb_arrow import ArrowMeshGenerator
+
+
+# =============================================================================
+# PRIMITIVE TESTS
+# =============================================================================
+
+class TestArrowPrimitives:
+    """Test the cylinder and cone building blocks."""
+    
+    def test_cylinder_rings_and_cap(self):
+        """Vertex 2*i is bottom ring point i, 2*i + 1 the top point above it."""
+        generator = ArrowMeshGenerator()
+        offset = np.array([1.0, 2.0, 3.0])
+        vertices, faces = generator._generate_cylinder(
+            radius=2.0, height=5.0, segments=8, offset=offset)
+        vertices = np.asarray(vertices) - offset
+        
+        assert vertices.shape == (17, 3)
+        assert np.allclose(np.hypot(vertices[:16, 0], vertices[:16, 1]), 2.0)
+        assert np.allclose(vertices[0:16:2, 2], 0.0)
+        assert np.allclose(vertices[1:16:2, 2], 5.0)
+        assert np.allclose(vertices[0:16:2, :2], vertices[1:16:2, :2])
+        assert np.allclose(vertices[16], [0.0, 0.0, 5.0])
+        
+        faces = np.asarray(faces)
+        assert faces.shape == (3 * 8, 3)
+        assert faces[:2].tolist() == [[0, 1, 3], [0, 3, 2]]
+        assert faces[-1].tolist() == [16, 1, 15]
+    
+    def test_cone_ring_and_apex(self):
+        """Cone base points lie on the ring; every side face ends at the apex."""
+        generator = ArrowMeshGenerator()
+        vertices, faces = generator._generate_cone(
+            radius=3.0, height=4.0, segments=6, offset=np.zeros(3))
+        vertices = np.asarray(vertices)
+        
+        assert vertices.shape == (7, 3)
+        assert np.allclose(np.hypot(vertices[:6, 0], vertices[:6, 1]), 3.0)
+        assert np.allclose(vertices[:6, 2], 0.0)
+        assert np.allclose(vertices[6], [0.0, 0.0, 4.0])
+        
+        faces = np.asarray(faces)
+        assert faces.tolist() == [[i, (i + 1) % 6, 6] for i in range(6)]
+
+
+# =============================================================================
+# ARROW TESTS
+# =============================================================================
+
+class TestArrowMesh:
+    """Test the assembled, rotated arrow."""
+    
+    def test_arrow_points_along_cmb_direction(self):
+        """The cone apex sits at length * direction; ring radii survive the rotation."""
+        generator = ArrowMeshGenerator(length=10.0, shaft_radius=0.5,
+                                       head_radius=1.5, head_length=3.0)
+        mesh = generator.generate_arrow_mesh(segments=16)
+        vertices = np.asarray(mesh['vertices'])
+        direction = mesh['direction']
+        
+        assert vertices.shape == (2 * 16 + 1 + 16 + 1, 3)
+        assert math.isclose(np.linalg.norm(direction), 1.0, rel_tol=1e-6)
+        assert np.allclose(vertices[-1], 10.0 * direction)
+        
+        # Distance from the arrow axis is preserved by the rotation
+        along = vertices @ direction
+        radial = np.linalg.norm(vertices - np.outer(along, direction), axis=1)
+        assert np.allclose(radial[:32], 0.5)
+        assert np.allclose(radial[33:49], 1.5)
+        assert np.allclose(along[33:49], 7.0)
+    
+    def test_no_duplicate_vertices(self):
+        """Every vertex position is distinct; the cap center and apex are shared by their faces."""
+        generator = ArrowMeshGenerator()
+        mesh = generator.generate_arrow_mesh(segments=32)
+        
+        assert len(np.unique(mesh['vertices'], axis=0)) == len(mesh['vertices'])
+        counts = np.bincount(np.asarray(mesh['faces']).ravel())
+        assert counts[64] == 32 and counts[-1] == 32
+    
+    @pytest.mark.parametrize("target", [
+        (0.3, -0.5, 0.8),   # general direction
+        (0.0, 0.0, 1.0),    # already aligned
+        (0.0, 0.0, -1.0),   # opposite
+    ])
+    def test_rotation_matrix_is_proper_rotation(self, target):
+        """The matrix maps +Z onto the target and is orthonormal with det +1."""
+        generator = ArrowMeshGenerator()
+        target = np.array(target) / np.linalg.norm(target)
+        
+        R = generator._rotation_matrix_from_vectors(np.array([0.0, 0.0, 1.0]), target)
+        
+        assert np.allclose(R @ [0.0, 0.0, 1.0], target)
+        assert np.allclose(R @ R.T, np.eye(3))
+        assert math.isclose(np.linalg.det(R), 1.0, rel_tol=1e-6)
+    
+    def test_vertices_keep_obj_precision(self):
+        """At the default 1e20 m scale, the apex is written with the exact %.6e digits."""
+        generator = ArrowMeshGenerator(length=1e20, shaft_radius=1e18)
+        mesh = generator.generate_arrow_mesh(segments=32)
+        vertices = mesh['vertices']
+        direction = mesh['direction']
+        
+        # float32 (about 7.2 digits) would change the last written digit
+        assert vertices.dtype == np.float64
+        assert [f"{c:.6e}" for c in vertices[-1]] == [f"{c:.6e}" for c in 1e20 * direction]
+        
+        along = vertices @ direction
+        radial = np.linalg.norm(vertices - np.outer(along, direction), axis=1)
+        assert np.allclose(radial[:64], 1e18, rtol=1e-12, atol=0)
+    
+    def test_obj_export_lines(self, tmp_path):
+        """Vertex lines match the per-vertex format; faces are 1-based."""
+        generator = ArrowMeshGenerator()
+        mesh = generator.generate_arrow_mesh(segments=8)
+        output = tmp_path / "arrow.obj"
+        
+        generator.export_to_obj(output, mesh)
+        
+        lines = output.read_text().splitlines()
+        v_lines = [line for line in lines if line.startswith('v ')]
+        f_lines = [line for line in lines if line.startswith('f ')]
+        assert v_lines == [f"v {v[0]:.6e} {v[1]:.6e} {v[2]:.6e}"
+                           for v in mesh['vertices']]
+        assert f_lines == [f"f {a + 1} {b + 1} {c + 1}" for a, b, c in mesh['faces']]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -16,6 +16,42 @@ import numpy as np
 from pathlib import Path
 
 
+# Epistemic status lookup tables, indexed by status code
+# (0 = OBSERVED, 1 = INFERRED, 2 = SIMULATED; Truth Slider level = code + 1)
+STATUS_NAMES = ('OBSERVED', 'INFERRED', 'SIMULATED')
+STATUS_COLORS = np.array([
+    [0.4, 0.8, 1.0],     # Blue (#66CCFF)
+    [1.0, 0.84, 0.0],    # Gold (#FFD700)
+    [1.0, 0.27, 0.27],   # Red (#FF4444)
+], dtype=np.float32)
+
+
+def parallax_to_distance(parallax_mas):
+    """Convert parallaxes in milliarcseconds to float32 distances in parsecs."""
+    parallax_mas = np.asarray(parallax_mas, dtype=np.float32)
+    if np.any(parallax_mas <= 0):
+        raise ValueError("Parallax must be positive")
+    return np.float32(1000.0) / parallax_mas
+
+
+def validate_complete_batch(labels, parallaxes, provenances):
+    """
+    Check Invariants I and II for a batch of objects given as columns.
+    
+    Args:
+        labels: truth_label per object
+        parallaxes: Parallax in mas per object
+        provenances: Provenance per object (None if missing)
+    
+    Returns:
+        Boolean array, True where the object passes every check
+    """
+    valid_labels = np.isin(np.asarray(labels, dtype=object), STATUS_NAMES)
+    valid_parallax = np.asarray(parallaxes, dtype=np.float32) > 0
+    has_provenance = np.array([p is not None for p in provenances], dtype=bool)
+    return valid_labels & valid_parallax & has_provenance
+
+
 # =============================================================================
 # INVARIANT I: LABELING (PROVENANCE)
 # =============================================================================
@@ -116,44 +152,31 @@ class TestInvariantII_Reference:
         
         This tests the conversion: distance_pc = 1000 / parallax_mas
         """
-        # Test cases: (parallax_mas, expected_distance_pc)
-        test_cases = [
-            (1.0, 1000.0),      # 1 mas → 1000 pc
-            (10.0, 100.0),      # 10 mas → 100 pc
-            (100.0, 10.0),      # 100 mas → 10 pc
-            (0.1, 10000.0),     # 0.1 mas → 10000 pc
-        ]
-        
-        def parallax_to_distance(parallax_mas):
-            """Convert parallax in milliarcseconds to distance in parsecs."""
-            if parallax_mas <= 0:
-                raise ValueError("Parallax must be positive")
-            return 1000.0 / parallax_mas
-        
-        for parallax, expected_distance in test_cases:
-            distance = parallax_to_distance(parallax)
-            assert np.isclose(distance, expected_distance), \
-                f"Parallax {parallax} mas should give {expected_distance} pc, got {distance} pc"
+        # Test cases: parallax_mas and expected_distance_pc
+        parallaxes = np.array([
+            1.0,        # 1 mas → 1000 pc
+            10.0,       # 10 mas → 100 pc
+            100.0,      # 100 mas → 10 pc
+            0.1,        # 0.1 mas → 10000 pc
+        ], dtype=np.float32)
+        expected_distances = np.array([1000.0, 100.0, 10.0, 10000.0])
+        
+        distances = parallax_to_distance(parallaxes)
+        assert distances.dtype == np.float32, "Distances keep the octree's float32 precision"
+        assert np.allclose(distances, expected_distances), \
+            f"Parallaxes {parallaxes} mas should give {expected_distances} pc, got {distances} pc"
     
     def test_negative_parallax_rejected(self):
         """Test that negative parallax (unphysical) is rejected."""
-        
-        def parallax_to_distance(parallax_mas):
-            if parallax_mas <= 0:
-                raise ValueError("Parallax must be positive")
-            return 1000.0 / parallax_mas
-        
         with pytest.raises(ValueError, match="Parallax must be positive"):
             parallax_to_distance(-5.0)
+        
+        # One unphysical value rejects the whole array
+        with pytest.raises(ValueError, match="Parallax must be positive"):
+            parallax_to_distance([10.0, -5.0, 1.0])
     
     def test_zero_parallax_rejected(self):
         """Test that zero parallax (infinite distance) is rejected."""
-        
-        def parallax_to_distance(parallax_mas):
-            if parallax_mas <= 0:
-                raise ValueError("Parallax must be positive")
-            return 1000.0 / parallax_mas
-        
         with pytest.raises(ValueError, match="Parallax must be positive"):
             parallax_to_distance(0.0)
     
@@ -165,36 +188,35 @@ class TestInvariantII_Reference:
         relative to Milky Way center.
         """
         def spherical_to_cartesian(ra_deg, dec_deg, distance_pc):
-            """Convert spherical to Cartesian coordinates."""
-            ra_rad = np.radians(ra_deg)
-            dec_rad = np.radians(dec_deg)
+            """Convert arrays of spherical coordinates to (N, 3) Cartesian positions."""
+            ra_rad = np.radians(np.asarray(ra_deg, dtype=np.float32))
+            dec_rad = np.radians(np.asarray(dec_deg, dtype=np.float32))
+            distance_pc = np.asarray(distance_pc, dtype=np.float32)
             
-            x = distance_pc * np.cos(dec_rad) * np.cos(ra_rad)
-            y = distance_pc * np.cos(dec_rad) * np.sin(ra_rad)
-            z = distance_pc * np.sin(dec_rad)
+            # cos(dec) is shared by x and y
+            distance_cd = distance_pc * np.cos(dec_rad)
+            positions = np.empty((ra_rad.size, 3), dtype=np.float32)
+            positions[:, 0] = distance_cd * np.cos(ra_rad)
+            positions[:, 1] = distance_cd * np.sin(ra_rad)
+            positions[:, 2] = distance_pc * np.sin(dec_rad)
             
-            return (x, y, z)
-        
-        # Test case: RA=0°, Dec=0°, Distance=100pc
-        # Should give: X=100, Y=0, Z=0
-        x, y, z = spherical_to_cartesian(0.0, 0.0, 100.0)
-        assert np.isclose(x, 100.0), f"Expected X=100, got {x}"
-        assert np.isclose(y, 0.0, atol=1e-10), f"Expected Y=0, got {y}"
-        assert np.isclose(z, 0.0, atol=1e-10), f"Expected Z=0, got {z}"
-        
-        # Test case: RA=90°, Dec=0°, Distance=100pc
-        # Should give: X=0, Y=100, Z=0
-        x, y, z = spherical_to_cartesian(90.0, 0.0, 100.0)
-        assert np.isclose(x, 0.0, atol=1e-10), f"Expected X=0, got {x}"
-        assert np.isclose(y, 100.0), f"Expected Y=100, got {y}"
-        assert np.isclose(z, 0.0, atol=1e-10), f"Expected Z=0, got {z}"
-        
-        # Test case: RA=0°, Dec=90°, Distance=100pc
-        # Should give: X=0, Y=0, Z=100
-        x, y, z = spherical_to_cartesian(0.0, 90.0, 100.0)
-        assert np.isclose(x, 0.0, atol=1e-10), f"Expected X=0, got {x}"
-        assert np.isclose(y, 0.0, atol=1e-10), f"Expected Y=0, got {y}"
-        assert np.isclose(z, 100.0), f"Expected Z=100, got {z}"
+            return positions
+        
+        # Test cases, converted in one call:
+        # RA=0°, Dec=0°, Distance=100pc should give X=100, Y=0, Z=0
+        # RA=90°, Dec=0°, Distance=100pc should give X=0, Y=100, Z=0
+        # RA=0°, Dec=90°, Distance=100pc should give X=0, Y=0, Z=100
+        positions = spherical_to_cartesian([0.0, 90.0, 0.0], [0.0, 0.0, 90.0], 100.0)
+        expected = np.array([
+            [100.0, 0.0, 0.0],
+            [0.0, 100.0, 0.0],
+            [0.0, 0.0, 100.0],
+        ])
+        assert positions.shape == (3, 3)
+        assert positions.dtype == np.float32
+        # float32 trig leaves zero components at ~1e-6 of the distance
+        assert np.allclose(positions, expected, atol=1e-4), \
+            f"Expected {expected}, got {positions}"
 
 
 # =============================================================================
@@ -211,22 +233,16 @@ class TestInvariantIII_Access:
         Constitution: "User must ALWAYS know which Truth Filter is active"
         Levels: OBSERVED (1), INFERRED (2), SIMULATED (3)
         """
-        TRUTH_LEVELS = {
-            1: 'OBSERVED',
-            2: 'INFERRED',
-            3: 'SIMULATED'
-        }
-        
-        assert len(TRUTH_LEVELS) == 3, "Truth Slider must have exactly 3 levels"
-        assert 1 in TRUTH_LEVELS, "Level 1 (OBSERVED) must exist"
-        assert 2 in TRUTH_LEVELS, "Level 2 (INFERRED) must exist"
-        assert 3 in TRUTH_LEVELS, "Level 3 (SIMULATED) must exist"
+        assert len(STATUS_NAMES) == 3, "Truth Slider must have exactly 3 levels"
+        assert STATUS_NAMES[1 - 1] == 'OBSERVED', "Level 1 (OBSERVED) must exist"
+        assert STATUS_NAMES[2 - 1] == 'INFERRED', "Level 2 (INFERRED) must exist"
+        assert STATUS_NAMES[3 - 1] == 'SIMULATED', "Level 3 (SIMULATED) must exist"
     
     def test_invalid_truth_level_rejected(self):
         """Test that invalid truth levels (0, 4, etc.) are rejected."""
         
         def set_truth_level(level):
-            if level < 1 or level > 3:
+            if not 1 <= level <= len(STATUS_NAMES):
                 raise ValueError(f"Invalid truth level: {level}. Must be 1, 2, or 3.")
             return level
         
@@ -248,23 +264,17 @@ class TestInvariantIII_Access:
         
         Constitution Layer 3: Color coding for visual distinction
         """
-        EPISTEMIC_COLORS = {
-            'OBSERVED': (0.4, 0.8, 1.0),    # Blue (#66CCFF)
-            'INFERRED': (1.0, 0.84, 0.0),   # Gold (#FFD700)
-            'SIMULATED': (1.0, 0.27, 0.27)  # Red (#FF4444)
-        }
-        
-        # Check all statuses have colors
-        required_statuses = ['OBSERVED', 'INFERRED', 'SIMULATED']
-        for status in required_statuses:
-            assert status in EPISTEMIC_COLORS, \
-                f"Missing color mapping for {status}"
-            
-            # Check color is valid RGB tuple
-            color = EPISTEMIC_COLORS[status]
-            assert len(color) == 3, f"Color for {status} must be RGB tuple"
-            assert all(0.0 <= c <= 1.0 for c in color), \
-                f"Color values for {status} must be in range [0, 1]"
+        # Check all statuses have colors, as RGB rows in [0, 1]
+        assert STATUS_COLORS.shape == (len(STATUS_NAMES), 3), \
+            "Every status needs one RGB color"
+        assert ((STATUS_COLORS >= 0.0) & (STATUS_COLORS <= 1.0)).all(), \
+            "Color values must be in range [0, 1]"
+        
+        # Per-star colors are one fancy-index into the table
+        statuses = np.array([0, 2, 1, 0])
+        colors = STATUS_COLORS[statuses]
+        assert colors.shape == (4, 3)
+        assert colors[1].tolist() == STATUS_COLORS[2].tolist()
 
 
 # =============================================================================
@@ -307,7 +317,7 @@ class TestConstitutionIntegration:
             
             # Invariant II: Coordinates
             if 'position' in data and 'parallax_mas' in data['position']:
-                if data['position']['parallax_mas'] <= 0:
+                if np.float32(data['position']['parallax_mas']) <= 0:
                     raise ValueError("Invalid parallax")
             
             return True
@@ -321,6 +331,16 @@ class TestConstitutionIntegration:
         
         with pytest.raises(ValueError):
             validate_complete(invalid_data)
+    
+    def test_batch_validation(self):
+        """A column batch is validated in one pass, one verdict per object."""
+        labels = np.array(['OBSERVED', 'BAD', None, 'SIMULATED', 'INFERRED'], dtype=object)
+        parallaxes = np.array([3.9, 1.0, 1.0, -0.5, 2.0], dtype=np.float32)
+        provenances = [{'source': 'Gaia DR3'}, {}, {}, {}, None]
+        
+        valid = validate_complete_batch(labels, parallaxes, provenances)
+        
+        assert valid.tolist() == [True, False, False, False, False]
 
 
 # =============================================================================
@@ -0,0 +1,183 @@
+"""
+Epistemic Engine - Laniakea Generator Tests
+============================================
+
+PURPOSE: Validate the procedural Laniakea galaxy and flow generator
+
+Tests ensure that:
+1. Exactly the requested galaxies lie inside the Laniakea ellipsoid, near filaments
+2. Flow vectors are 10 Mpc long and point at the nearest attractor
+3. .speck exports keep the per-row text format
+4. The compiled filament kernel matches the NumPy version
+5. A seed makes the generated data reproducible
+6. Galaxy ids are derived from the draw number on demand
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+from src.ingestion.generate_laniakea import LaniakeaGenerator
+
+
+# =============================================================================
+# GALAXY TESTS
+# =============================================================================
+
+class TestFilamentNetwork:
+    """Test galaxy placement along attractor filaments."""
+    
+    def test_galaxies_inside_boundary(self):
+        """Exactly num_galaxies pass the ellipsoid test; rejected points are redrawn."""
+        generator = LaniakeaGenerator(num_galaxies=2000, seed=1)
+        
+        galaxies = generator.generate_filament_network()
+        positions = galaxies['position_mpc']
+        
+        assert positions.shape[1] == 3
+        assert len(positions) == 2000
+        assert len(galaxies['index']) == 2000
+        assert generator._inside_laniakea(positions).all()
+        assert np.all(np.diff(galaxies['index']) > 0)
+    
+    def test_galaxy_ids_from_index(self):
+        """Ids are built from the draw number in the Laniakea_Galaxy_NNNNN format."""
+        generator = LaniakeaGenerator()
+        galaxies = {'index': np.array([0, 7, 4321, 123456])}
+        
+        assert generator.galaxy_ids(galaxies).tolist() == [
+            f'Laniakea_Galaxy_{i:05d}' for i in galaxies['index']]
+    
+    def test_ellipsoid_test_matches_scalar(self):
+        """The array ellipsoid test agrees with testing one position at a time."""
+        generator = LaniakeaGenerator()
+        points = np.random.default_rng(3).uniform(-80.0, 140.0, (500, 3))
+        
+        inside = generator._inside_laniakea(points)
+        
+        assert inside.shape == (500,)
+        assert inside.tolist() == [bool(generator._inside_laniakea(p)) for p in points]
+    
+    def test_seed_reproduces_output(self):
+        """The same seed gives the same galaxies and flows; another seed does not."""
+        def generate(seed):
+            generator = LaniakeaGenerator(num_galaxies=500, seed=seed)
+            galaxies = generator.generate_filament_network()
+            return galaxies, generator.generate_flow_vectors(galaxies)
+        
+        (galaxies, flows), (galaxies2, flows2) = generate(7), generate(7)
+        assert np.array_equal(galaxies['position_mpc'], galaxies2['position_mpc'])
+        assert np.array_equal(flows['end_position_mpc'], flows2['end_position_mpc'])
+        assert not np.array_equal(generate(8)[0]['position_mpc'], galaxies['position_mpc'])
+    
+    def test_compiled_filament_kernel_matches_numpy(self):
+        """The numba kernel places and tests galaxies like the NumPy version."""
+        pytest.importorskip("numba")
+        from src.ingestion.generate_laniakea import (
+            _filament_positions_compiled, _filament_positions_numpy)
+        
+        rng = np.random.default_rng(6)
+        attractors = np.array([a['position_mpc'] for a in LaniakeaGenerator.ATTRACTORS.values()])
+        idx1 = rng.integers(0, 4, 1000)
+        idx2 = (idx1 + rng.integers(1, 4, 1000)) % 4
+        args = (attractors, idx1, idx2, rng.beta(2, 2, 1000), rng.standard_normal((1000, 3)) * 5.0,
+                LaniakeaGenerator.BOUNDARY_CENTER_MPC, LaniakeaGenerator.BOUNDARY_RADII_MPC)
+        
+        positions, inside = _filament_positions_compiled(*args)
+        expected_positions, expected_inside = _filament_positions_numpy(*args)
+        assert np.allclose(positions, expected_positions)
+        assert np.array_equal(inside, expected_inside)
+    
+    def test_galaxies_cluster_between_attractors(self):
+        """Galaxies sit within a few scatter widths of some attractor-to-attractor segment."""
+        generator = LaniakeaGenerator(num_galaxies=1000, seed=2)
+        positions = generator.generate_filament_network()['position_mpc']
+        attractors = np.array([a['position_mpc'] for a in generator.ATTRACTORS.values()])
+        
+        def segment_distance(p, a, b):
+            t = np.clip(((p - a) @ (b - a)) / ((b - a) @ (b - a)), 0.0, 1.0)
+            return np.linalg.norm(p - (a + t[:, None] * (b - a)), axis=1)
+        
+        nearest = np.min([segment_distance(positions, attractors[i], attractors[j])
+                          for i in range(len(attractors))
+                          for j in range(i + 1, len(attractors))], axis=0)
+        # 5 Mpc scatter per axis: 6 sigma covers every draw in practice
+        assert nearest.max() < 6 * 5.0 * np.sqrt(3)
+
+
+
+# =============================================================================
+# FLOW TESTS
+# =============================================================================
+
+class TestFlowVectors:
+    """Test flow lines toward the nearest attractor."""
+    
+    def test_flows_point_to_nearest_attractor(self):
+        """Each flow starts at a galaxy and runs 10 Mpc toward its nearest attractor."""
+        generator = LaniakeaGenerator(num_galaxies=1000, flow_sample_rate=0.25, seed=4)
+        galaxies = generator.generate_filament_network()
+        
+        flows = generator.generate_flow_vectors(galaxies)
+        
+        assert len(flows['start_position_mpc']) == int(len(galaxies['position_mpc']) * 0.25)
+        starts = {tuple(p) for p in galaxies['position_mpc']}
+        for start, end, name in zip(flows['start_position_mpc'], flows['end_position_mpc'],
+                                    flows['target_attractor']):
+            assert tuple(start) in starts
+            distances = {name: np.linalg.norm(start - a['position_mpc'])
+                         for name, a in generator.ATTRACTORS.items()}
+            target = min(distances, key=distances.get)
+            assert name == target
+            
+            step = end - start
+            to_target = generator.ATTRACTORS[target]['position_mpc'] - start
+            assert math.isclose(np.linalg.norm(step), 10.0, rel_tol=1e-6)
+            assert np.allclose(step / 10.0, to_target / np.linalg.norm(to_target))
+
+
+
+# =============================================================================
+# EXPORT TESTS
+# =============================================================================
+
+class TestSpeckExport:
+    """Test the galaxy and flow .speck files."""
+    
+    def test_rows_match_per_record_format(self, tmp_path):
+        """Bulk-written rows equal formatting each galaxy and flow on its own."""
+        generator = LaniakeaGenerator(num_galaxies=300, seed=5)
+        galaxies = generator.generate_filament_network()
+        flows = generator.generate_flow_vectors(galaxies)
+        
+        generator.export_galaxies_to_speck(galaxies, tmp_path / "galaxies.speck")
+        generator.export_flows_to_speck(flows, tmp_path / "flows.speck")
+        
+        def data_rows(path):
+            return [line for line in path.read_text().splitlines()
+                    if line and not line.startswith(('#', 'datavar'))]
+        
+        assert data_rows(tmp_path / "galaxies.speck") == [
+            "{:.6e} {:.6e} {:.6e} 0.500".format(*p)
+            for p in galaxies['position_mpc'] * generator.MPC_TO_M]
+        assert data_rows(tmp_path / "flows.speck") == [
+            "{:.6e} {:.6e} {:.6e} {:.6e} {:.6e} {:.6e}".format(*start, *end)
+            for start, end in zip(flows['start_position_mpc'] * generator.MPC_TO_M,
+                                  flows['end_position_mpc'] * generator.MPC_TO_M)]
+    
+    def test_empty_exports(self, tmp_path):
+        """No galaxies or flows still writes the headers."""
+        generator = LaniakeaGenerator()
+        
+        empty = np.empty((0, 3))
+        generator.export_galaxies_to_speck({'position_mpc': empty}, tmp_path / "galaxies.speck")
+        generator.export_flows_to_speck({'start_position_mpc': empty, 'end_position_mpc': empty},
+                                        tmp_path / "flows.speck")
+        
+        assert "datavar 0 colorb_v" in (tmp_path / "galaxies.speck").read_text()
+        assert (tmp_path / "flows.speck").read_text().endswith("#\n")
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
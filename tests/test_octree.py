@@ -8,15 +8,53 @@ Tests ensure that:
 1. Binary files have correct header structure
 2. Star data is correctly packed/unpacked
 3. Edge cases (0 stars, large files) are handled
+4. The builder partitions and exports an in-memory catalog correctly
 """
 
+import io
+import math
 import pytest
 import struct
-import tempfile
+import subprocess
+import sys
+import textwrap
 from pathlib import Path
 import numpy as np
 
 
+# Star record of the binary format: struct 'ffffi', little-endian (same
+# layout as export_binary_octree.STAR_RECORD, which needs psycopg2 to import)
+RECORD_DTYPE = np.dtype([
+    ('position', '<f4', 3),
+    ('magnitude', '<f4'),
+    ('epistemic_status', '<i4')
+])
+# A node file without stars: the header alone (export_binary_octree.EMPTY_NODE_BYTES)
+EMPTY_NODE_BYTES = struct.pack('<i', 0)
+
+
+MAX_STARS_PER_NODE = 50000
+
+
+def validate_headers(headers, max_stars=MAX_STARS_PER_NODE):
+    """
+    Check the star counts read from many node headers in one pass.
+    
+    Raises:
+        ValueError: Naming the index of every negative or oversized count
+    """
+    headers = np.asarray(headers)
+    bad = (headers < 0) | (headers > max_stars)
+    if bad.any():
+        raise ValueError(f"Invalid star count in nodes {np.flatnonzero(bad).tolist()}")
+
+
+@pytest.fixture
+def bin_buf():
+    """In-memory binary file for tests of struct (de)serialization only."""
+    return io.BytesIO()
+
+
 # =============================================================================
 # BINARY FORMAT TESTS
 # =============================================================================
@@ -24,7 +62,7 @@ import numpy as np
 class TestBinaryOctreeFormat:
     """Test binary octree file format compliance."""
     
-    def test_binary_header_structure(self):
+    def test_binary_header_structure(self, bin_buf):
         """
         Test that binary file has correct header (int32 star count).
         
@@ -35,40 +73,30 @@ class TestBinaryOctreeFormat:
                 - float32 magnitude
                 - int32 epistemic_status
         """
-        # Create a test binary file with known structure
+        # Build a test binary file with known structure in memory
         num_stars = 42
+        f = bin_buf
         
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.bin', delete=False) as f:
-            temp_path = Path(f.name)
-            
-            # Write header
-            f.write(struct.pack('i', num_stars))
-            
-            # Write stars
-            for i in range(num_stars):
-                # position (x, y, z), magnitude, epistemic_status
-                f.write(struct.pack('ffffi',
-                    float(i),      # x
-                    float(i * 2),  # y
-                    float(i * 3),  # z
-                    5.0,           # magnitude
-                    0              # OBSERVED
-                ))
-        
-        try:
-            # Read back and verify
-            with open(temp_path, 'rb') as f:
-                # Read header
-                header_bytes = f.read(4)
-                assert len(header_bytes) == 4, "Header must be exactly 4 bytes"
-                
-                read_num_stars = struct.unpack('i', header_bytes)[0]
-                assert read_num_stars == num_stars, \
-                    f"Header should read {num_stars}, got {read_num_stars}"
-        finally:
-            temp_path.unlink()
+        # Write header
+        f.write(struct.pack('i', num_stars))
+        
+        # Write stars: position (x, y, z) = (i, 2i, 3i), magnitude,
+        # epistemic_status (OBSERVED), all records in one write
+        records = np.zeros(num_stars, dtype=RECORD_DTYPE)
+        records['position'] = np.arange(num_stars)[:, None] * [1, 2, 3]
+        records['magnitude'] = 5.0
+        f.write(records.tobytes())
+        
+        # Read back and verify
+        f.seek(0)
+        header_bytes = f.read(4)
+        assert len(header_bytes) == 4, "Header must be exactly 4 bytes"
+        
+        read_num_stars = struct.unpack('i', header_bytes)[0]
+        assert read_num_stars == num_stars, \
+            f"Header should read {num_stars}, got {read_num_stars}"
     
-    def test_binary_star_data_packing(self):
+    def test_binary_star_data_packing(self, bin_buf):
         """Test that star data is correctly packed."""
         
         # Test star data
@@ -80,40 +108,34 @@ class TestBinaryOctreeFormat:
             'epistemic_status': 1  # INFERRED
         }
         
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.bin', delete=False) as f:
-            temp_path = Path(f.name)
-            
-            # Write header (1 star)
-            f.write(struct.pack('i', 1))
-            
-            # Write star
-            f.write(struct.pack('ffffi',
-                test_star['x'],
-                test_star['y'],
-                test_star['z'],
-                test_star['magnitude'],
-                test_star['epistemic_status']
-            ))
-        
-        try:
-            # Read back and verify
-            with open(temp_path, 'rb') as f:
-                # Read header
-                num_stars = struct.unpack('i', f.read(4))[0]
-                assert num_stars == 1
-                
-                # Read star
-                star_data = struct.unpack('ffffi', f.read(20))  # 4*5 = 20 bytes
-                
-                assert np.isclose(star_data[0], test_star['x']), "X position mismatch"
-                assert np.isclose(star_data[1], test_star['y']), "Y position mismatch"
-                assert np.isclose(star_data[2], test_star['z']), "Z position mismatch"
-                assert np.isclose(star_data[3], test_star['magnitude']), "Magnitude mismatch"
-                assert star_data[4] == test_star['epistemic_status'], "Epistemic status mismatch"
-        finally:
-            temp_path.unlink()
+        f = bin_buf
+        
+        # Write header (1 star)
+        f.write(struct.pack('i', 1))
+        
+        # Write star
+        record = np.zeros(1, dtype=RECORD_DTYPE)
+        record['position'] = (test_star['x'], test_star['y'], test_star['z'])
+        record['magnitude'] = test_star['magnitude']
+        record['epistemic_status'] = test_star['epistemic_status']
+        f.write(record.tobytes())
+        
+        # Read back and verify
+        f.seek(0)
+        # Read header
+        num_stars = struct.unpack('i', f.read(4))[0]
+        assert num_stars == 1
+        
+        # Read star
+        star_data = struct.unpack('ffffi', f.read(20))  # 4*5 = 20 bytes
+        
+        assert math.isclose(star_data[0], test_star['x'], rel_tol=1e-6), "X position mismatch"
+        assert math.isclose(star_data[1], test_star['y'], rel_tol=1e-6), "Y position mismatch"
+        assert math.isclose(star_data[2], test_star['z'], rel_tol=1e-6), "Z position mismatch"
+        assert math.isclose(star_data[3], test_star['magnitude'], rel_tol=1e-6), "Magnitude mismatch"
+        assert star_data[4] == test_star['epistemic_status'], "Epistemic status mismatch"
     
-    def test_epistemic_status_encoding(self):
+    def test_epistemic_status_encoding(self, bin_buf):
         """Test that epistemic status is correctly encoded as int32."""
         
         EPISTEMIC_MAP = {
@@ -123,23 +145,19 @@ class TestBinaryOctreeFormat:
         }
         
         for status_name, status_code in EPISTEMIC_MAP.items():
-            with tempfile.NamedTemporaryFile(mode='wb', suffix='.bin', delete=False) as f:
-                temp_path = Path(f.name)
-                
-                # Write header + one star with this status
-                f.write(struct.pack('i', 1))
-                f.write(struct.pack('ffffi', 0.0, 0.0, 0.0, 5.0, status_code))
+            # Write header + one star with this status, reusing the buffer
+            f = bin_buf
+            f.seek(0)
+            f.truncate()
+            f.write(struct.pack('i', 1))
+            f.write(struct.pack('ffffi', 0.0, 0.0, 0.0, 5.0, status_code))
             
-            try:
-                # Read back
-                with open(temp_path, 'rb') as f:
-                    f.read(4)  # Skip header
-                    star_data = struct.unpack('ffffi', f.read(20))
-                    
-                    assert star_data[4] == status_code, \
-                        f"{status_name} should encode as {status_code}, got {star_data[4]}"
-            finally:
-                temp_path.unlink()
+            # Read back
+            f.seek(4)  # Skip header
+            star_data = struct.unpack('ffffi', f.read(20))
+            
+            assert star_data[4] == status_code, \
+                f"{status_name} should encode as {status_code}, got {star_data[4]}"
 
 
 # =============================================================================
@@ -149,101 +167,83 @@ class TestBinaryOctreeFormat:
 class TestBinaryOctreeEdgeCases:
     """Test edge cases and error handling."""
     
-    def test_zero_stars_file(self):
+    def test_zero_stars_file(self, bin_buf):
         """
         Test that file with 0 stars is valid.
         
         Edge case: Empty octree node (possible in sparse regions)
         """
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.bin', delete=False) as f:
-            temp_path = Path(f.name)
-            
-            # Write header with 0 stars
-            f.write(struct.pack('i', 0))
-            # No body data
-        
-        try:
-            # Read back - should not crash
-            with open(temp_path, 'rb') as f:
-                num_stars = struct.unpack('i', f.read(4))[0]
-                assert num_stars == 0, "Should read 0 stars"
-                
-                # File should be exactly 4 bytes (header only)
-                f.seek(0, 2)  # Seek to end
-                file_size = f.tell()
-                assert file_size == 4, f"Empty file should be 4 bytes, got {file_size}"
-        finally:
-            temp_path.unlink()
+        f = bin_buf
+        
+        # Write header with 0 stars
+        f.write(EMPTY_NODE_BYTES)
+        # No body data
+        
+        # Read back - should not crash
+        f.seek(0)
+        num_stars = struct.unpack('i', f.read(4))[0]
+        assert num_stars == 0, "Should read 0 stars"
+        
+        # File should be exactly 4 bytes (header only)
+        f.seek(0, 2)  # Seek to end
+        file_size = f.tell()
+        assert file_size == 4, f"Empty file should be 4 bytes, got {file_size}"
     
-    def test_large_star_count(self):
+    def test_large_star_count(self, bin_buf):
         """Test that large star counts (50k limit) are handled."""
         
-        MAX_STARS_PER_NODE = 50000
-        
         # Create file with max stars (just header, no body for speed)
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.bin', delete=False) as f:
-            temp_path = Path(f.name)
-            f.write(struct.pack('i', MAX_STARS_PER_NODE))
-        
-        try:
-            with open(temp_path, 'rb') as f:
-                num_stars = struct.unpack('i', f.read(4))[0]
-                assert num_stars == MAX_STARS_PER_NODE, \
-                    f"Should read {MAX_STARS_PER_NODE} stars"
-                
-                # Expected file size: 4 + (20 * num_stars) bytes
-                # We only wrote header, so expect 4 bytes
-                f.seek(0, 2)
-                assert f.tell() == 4
-        finally:
-            temp_path.unlink()
+        f = bin_buf
+        f.write(struct.pack('i', MAX_STARS_PER_NODE))
+        
+        f.seek(0)
+        num_stars = struct.unpack('i', f.read(4))[0]
+        assert num_stars == MAX_STARS_PER_NODE, \
+            f"Should read {MAX_STARS_PER_NODE} stars"
+        validate_headers([0, num_stars])
+        
+        # Expected file size: 4 + (20 * num_stars) bytes
+        # We only wrote header, so expect 4 bytes
+        f.seek(0, 2)
+        assert f.tell() == 4
     
-    def test_negative_star_count_invalid(self):
+    def test_negative_star_count_invalid(self, bin_buf):
         """Test that negative star count is detected as invalid."""
         
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.bin', delete=False) as f:
-            temp_path = Path(f.name)
-            
-            # Write invalid header (negative count)
-            f.write(struct.pack('i', -10))
+        f = bin_buf
         
-        try:
-            with open(temp_path, 'rb') as f:
-                num_stars = struct.unpack('i', f.read(4))[0]
-                
-                # Validation logic (would be in actual reader)
-                assert num_stars < 0, "Detected negative count"
-                
-                # Reader should reject this
-                if num_stars < 0:
-                    with pytest.raises(ValueError):
-                        raise ValueError("Invalid star count: negative value")
-        finally:
-            temp_path.unlink()
+        # Write invalid header (negative count)
+        f.write(struct.pack('i', -10))
+        
+        # Headers of several nodes, read in one pass
+        headers = np.frombuffer(f.getvalue()[:4] + struct.pack('<ii', 7, MAX_STARS_PER_NODE + 1),
+                                dtype='<i4')
+        assert headers[0] == -10, "Detected negative count"
+        
+        # Reader should reject this, and the oversized node with it
+        with pytest.raises(ValueError, match=r"nodes \[0, 2\]"):
+            validate_headers(headers)
     
-    def test_file_size_consistency(self):
+    def test_file_size_consistency(self, tmp_path):
         """Test that file size matches expected size from header."""
         
         num_stars = 100
         expected_size = 4 + (20 * num_stars)  # header + (20 bytes * stars)
         
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.bin', delete=False) as f:
-            temp_path = Path(f.name)
-            
+        temp_path = tmp_path / "octree.bin"
+        with open(temp_path, 'wb') as f:
             # Write header
             f.write(struct.pack('i', num_stars))
             
             # Write stars
-            for i in range(num_stars):
-                f.write(struct.pack('ffffi', 0.0, 0.0, 0.0, 5.0, 0))
+            records = np.zeros(num_stars, dtype=RECORD_DTYPE)
+            records['magnitude'] = 5.0
+            f.write(records.tobytes())
         
-        try:
-            # Check file size
-            actual_size = temp_path.stat().st_size
-            assert actual_size == expected_size, \
-                f"File size should be {expected_size}, got {actual_size}"
-        finally:
-            temp_path.unlink()
+        # Check file size
+        actual_size = temp_path.stat().st_size
+        assert actual_size == expected_size, \
+            f"File size should be {expected_size}, got {actual_size}"
 
 
 # =============================================================================
@@ -277,8 +277,12 @@ class TestLODHierarchy:
         LOD_PARENT_FRACTION = 0.10
         keep_count = max(1, int(len(stars) * LOD_PARENT_FRACTION))
         
-        sorted_stars = sorted(stars, key=lambda s: s['magnitude'])
-        parent_stars = sorted_stars[:keep_count]
+        # Select without sorting the discarded stars: partition the
+        # magnitudes, then order only the kept ones
+        mags = np.fromiter((s['magnitude'] for s in stars), dtype=np.float32, count=len(stars))
+        idx = np.argpartition(mags, keep_count - 1)[:keep_count]
+        idx = idx[np.argsort(mags[idx])]
+        parent_stars = [stars[i] for i in idx]
         
         # For 10 stars, brightest 10% = 1 star
         assert len(parent_stars) == 1
@@ -290,19 +294,19 @@ class TestLODHierarchy:
         MAX_STARS_PER_NODE = 50000
         MAX_DEPTH = 5
         
-        def should_split(num_stars, depth):
-            return num_stars > MAX_STARS_PER_NODE and depth < MAX_DEPTH
+        def should_split(counts, depths):
+            """Split decision for many nodes at once, as one boolean mask."""
+            return (np.asarray(counts) > MAX_STARS_PER_NODE) & (np.asarray(depths) < MAX_DEPTH)
         
-        # Should split
-        assert should_split(60000, 0) is True
-        assert should_split(50001, 3) is True
+        counts = np.array([
+            60000, 50001,   # Should split
+            40000, 50000,   # Should not split (below threshold)
+            60000,          # Should not split (max depth)
+        ])
+        depths = np.array([0, 3, 0, 0, 5])
         
-        # Should not split (below threshold)
-        assert should_split(40000, 0) is False
-        assert should_split(50000, 0) is False
-        
-        # Should not split (max depth)
-        assert should_split(60000, 5) is False
+        assert should_split(counts, depths).tolist() == [True, True, False, False, False]
+        assert np.flatnonzero(should_split(counts, depths)).tolist() == [0, 1]
 
 
 # =============================================================================
@@ -312,7 +316,7 @@ class TestLODHierarchy:
 class TestBinaryOctreeIntegration:
     """Integration test for full octree workflow."""
     
-    def test_write_read_roundtrip(self):
+    def test_write_read_roundtrip(self, tmp_path):
         """
         Test that we can write and read back identical data.
         
@@ -325,32 +329,369 @@ class TestBinaryOctreeIntegration:
             (7.0e20, 8.0e20, 9.0e20, 9.0, 2),  # SIMULATED
         ]
         
-        with tempfile.NamedTemporaryFile(mode='wb', suffix='.bin', delete=False) as f:
-            temp_path = Path(f.name)
-            
+        temp_path = tmp_path / "octree.bin"
+        with open(temp_path, 'wb') as f:
             # Write
-            f.write(struct.pack('i', len(test_stars)))
-            for star in test_stars:
-                f.write(struct.pack('ffffi', *star))
+            records = np.array([((x, y, z), mag, status) for x, y, z, mag, status in test_stars],
+                               dtype=RECORD_DTYPE)
+            np.array([len(test_stars)], dtype='<i4').tofile(f)
+            records.tofile(f)
         
-        try:
-            # Read back
-            with open(temp_path, 'rb') as f:
-                num_stars = struct.unpack('i', f.read(4))[0]
-                assert num_stars == len(test_stars)
+        # Read back
+        with open(temp_path, 'rb') as f:
+            num_stars = int(np.fromfile(f, dtype='<i4', count=1)[0])
+            assert num_stars == len(test_stars)
+            
+            read = np.fromfile(f, dtype=RECORD_DTYPE, count=num_stars)
+            assert np.array_equal(read, records), "Records mismatch"
+            assert read['epistemic_status'].tolist() == [0, 1, 2], "Epistemic status mismatch"
+
+
+# =============================================================================
+# OCTREE BUILDER TESTS
+# =============================================================================
+
+def make_builder(num_stars=1000, seed=42):
+    """Create a BinaryOctreeBuilder with a random in-memory catalog (no database)."""
+    pytest.importorskip("psycopg2")
+    from src.ingestion.export_binary_octree import BinaryOctreeBuilder
+    
+    rng = np.random.default_rng(seed)
+    builder = BinaryOctreeBuilder(db_config={}, max_depth=3)
+    builder.xs = rng.uniform(-1.0, 1.0, num_stars).astype(np.float32)
+    builder.ys = rng.uniform(-1.0, 1.0, num_stars).astype(np.float32)
+    builder.zs = rng.uniform(-1.0, 1.0, num_stars).astype(np.float32)
+    builder.mags = rng.uniform(0.0, 15.0, num_stars).astype(np.float32)
+    builder.status = rng.integers(0, 3, num_stars).astype(np.int32)
+    return builder
+
+
+def unit_bounds():
+    """Bounding box of the random test catalog."""
+    from src.ingestion.export_binary_octree import BoundingBox
+    return BoundingBox(-1.0, 1.0, -1.0, 1.0, -1.0, 1.0)
+
+
+def read_node(path):
+    """Read a .bin node file into a structured array."""
+    from src.ingestion.export_binary_octree import STAR_RECORD
+    
+    data = path.read_bytes()
+    num_stars = struct.unpack('i', data[:4])[0]
+    records = np.frombuffer(data[4:], dtype=STAR_RECORD)
+    assert len(records) == num_stars
+    return records
+
+
+class TestOctreeBuilder:
+    """Test in-memory partitioning and export of the octree builder."""
+    
+    def test_status_mapped_in_sql(self):
+        """truth_label is mapped to the EPISTEMIC_MAP codes by the query itself."""
+        builder = make_builder()
+        
+        assert builder.epistemic_status_sql() == (
+            "CASE truth_label WHEN 'OBSERVED' THEN 0 WHEN 'INFERRED' THEN 1 "
+            "WHEN 'SIMULATED' THEN 2 ELSE 0 END"
+        )
+    
+    def test_bounds_filter_is_bound_parameter(self):
+        """The epistemic filter is passed as a query parameter, not spliced into SQL."""
+        class FakeCursor:
+            def execute(self, query, params):
+                self.query, self.params = query, params
+            
+            def fetchone(self):
+                return (1.0, 2.0, 3.0, 4.0, 5.0, 6.0)
+        
+        builder = make_builder()
+        builder.epistemic_filter = "OBSERVED' OR '1'='1"
+        builder.cursor = FakeCursor()
+        
+        builder.get_global_bounds()
+        
+        assert builder.cursor.query.rstrip().endswith("WHERE truth_label = %s")
+        assert builder.cursor.params == ["OBSERVED' OR '1'='1"]
+    
+    def test_children_are_contiguous_octants(self):
+        """After the Morton sort each octant is one slice on the correct side of the center."""
+        builder = make_builder()
+        builder.sort_by_morton(unit_bounds())
+        num_stars = len(builder.xs)
+        
+        children = builder.child_slices(slice(0, num_stars), depth=0)
+        
+        assert len(children) == 8
+        assert children[0].start == 0 and children[-1].stop == num_stars
+        for octant, child in enumerate(children):
+            assert child.stop >= child.start
+            assert np.all((builder.xs[child] > 0) == bool(octant & 0b100))
+            assert np.all((builder.ys[child] > 0) == bool(octant & 0b010))
+            assert np.all((builder.zs[child] > 0) == bool(octant & 0b001))
+    
+    def test_compiled_morton_keys_match_numpy(self):
+        """The numba kernel computes the same keys as the NumPy version."""
+        pytest.importorskip("numba")
+        from src.ingestion.export_binary_octree import (
+            _morton_grid, _morton_keys_compiled, _morton_keys_numpy)
+        
+        builder = make_builder()
+        # Include stars on and outside the bounds
+        builder.xs[:3] = (-1.0, 1.0, 2.5)
+        lo, scale = _morton_grid(unit_bounds(), 5)
+        
+        expected = _morton_keys_numpy(builder.xs, builder.ys, builder.zs, lo, scale, 5)
+        actual = _morton_keys_compiled(builder.xs, builder.ys, builder.zs, lo, scale, 5)
+        assert actual.dtype == np.uint64
+        assert np.array_equal(actual, expected)
+    
+    def test_lod_subset_is_brightest_first(self):
+        """The LOD subset holds the brightest 10%, sorted by magnitude."""
+        builder = make_builder()
+        
+        lod = builder.select_lod_subset(slice(0, len(builder.xs)), 0.10)
+        
+        expected = np.sort(builder.mags)[:100]
+        assert np.array_equal(builder.mags[lod], expected)
+    
+    def test_node_filename_from_path_bits(self):
+        """Octant paths packed 3 bits per level name files digit by digit."""
+        pytest.importorskip("psycopg2")
+        from src.ingestion.export_binary_octree import node_filename
+        
+        assert node_filename(0, 0) == "0-0-0-0.bin"
+        assert node_filename(1, 7) == "1-7.bin"
+        assert node_filename(3, (0 << 6) | (3 << 3) | 5) == "3-0-3-5.bin"
+    
+    def test_build_octree_roundtrip(self, tmp_path, monkeypatch):
+        """Leaves hold every star once; parents hold their brightest stars."""
+        builder = make_builder()
+        monkeypatch.setattr(builder, 'MAX_STARS_PER_NODE', 200)
+        builder.sort_by_morton(unit_bounds())
+        
+        builder.build_octree(slice(0, len(builder.xs)), tmp_path)
+        
+        root = read_node(tmp_path / "0-0-0-0.bin")
+        assert len(root) == 100
+        assert np.allclose(root['magnitude'], np.sort(builder.mags)[:100])
+        
+        leaf_count = 0
+        for path in tmp_path.glob("*.bin"):
+            depth = int(path.stem.split('-')[0])
+            children = list(tmp_path.glob(f"{depth + 1}-{path.stem.split('-', 1)[1]}-*.bin"))
+            if depth > 0 and not children:
+                leaf_count += len(read_node(path))
+        assert leaf_count == len(builder.xs)
+        assert builder.total_nodes == len(list(tmp_path.glob("*.bin")))
+    
+    def test_parallel_build_matches_sequential(self, tmp_path, monkeypatch):
+        """Subtrees built in worker processes produce the same files."""
+        (tmp_path / "seq").mkdir()
+        (tmp_path / "par").mkdir()
+        sequential = make_builder()
+        monkeypatch.setattr(sequential, 'MAX_STARS_PER_NODE', 200)
+        sequential.sort_by_morton(unit_bounds())
+        sequential.build_octree(slice(0, len(sequential.xs)), tmp_path / "seq")
+        
+        parallel = make_builder()
+        monkeypatch.setattr(parallel, 'MAX_STARS_PER_NODE', 200)
+        parallel.workers = 2
+        parallel.sort_by_morton(unit_bounds())
+        parallel.build_octree_parallel(slice(0, len(parallel.xs)), tmp_path / "par")
+        
+        seq_files = sorted(p.name for p in (tmp_path / "seq").glob("*.bin"))
+        par_files = sorted(p.name for p in (tmp_path / "par").glob("*.bin"))
+        assert par_files == seq_files
+        for name in seq_files:
+            assert (tmp_path / "par" / name).read_bytes() == (tmp_path / "seq" / name).read_bytes()
+        assert parallel.total_nodes == sequential.total_nodes
+        assert parallel.total_stars_exported == sequential.total_stars_exported
+    
+    def test_packed_subtrees_hold_the_node_files(self, tmp_path, monkeypatch):
+        """--pack writes the same node bytes as separate files, indexed by node_id."""
+        from src.ingestion.export_binary_octree import node_id, read_node_pack
+        for name in ("files", "seq", "par"):
+            (tmp_path / name).mkdir()
+        monkeypatch.setattr('src.ingestion.export_binary_octree.BinaryOctreeBuilder.MAX_STARS_PER_NODE', 200)
+        
+        builder = make_builder()
+        builder.sort_by_morton(unit_bounds())
+        builder.build_octree(slice(0, len(builder.xs)), tmp_path / "files")
+        files = {p.name: p.read_bytes() for p in (tmp_path / "files").glob("*.bin")}
+        
+        def names(pack):
+            # node_id -> file name: drop the depth marker bit, then octal digits
+            return {node: f"{depth}-{'-'.join(format(node ^ (1 << 3 * depth), f'0{depth}o'))}.bin"
+                    if depth else "0-0-0-0.bin"
+                    for node in pack for depth in [(node.bit_length() - 1) // 3]}
+        
+        builder.pack = True
+        builder.build_octree(slice(0, len(builder.xs)), tmp_path / "seq")
+        assert [p.name for p in (tmp_path / "seq").iterdir()] == ["0-0-0-0.pack"]
+        pack = read_node_pack(tmp_path / "seq" / "0-0-0-0.pack")
+        assert next(iter(pack)) == node_id(0, 0)
+        assert {names(pack)[node]: blob for node, blob in pack.items()} == files
+        
+        builder.workers = 2
+        builder.build_octree_parallel(slice(0, len(builder.xs)), tmp_path / "par")
+        packed = {}
+        for path in (tmp_path / "par").glob("*.pack"):
+            pack = read_node_pack(path)
+            packed.update({names(pack)[node]: blob for node, blob in pack.items()})
+        assert packed == files
+        assert len(list((tmp_path / "par").glob("*.pack"))) == 9
+    
+    def test_workers_receive_catalog_by_name(self):
+        """Workers attach to the shared catalog; only names and shapes are pickled."""
+        import pickle
+        from src.ingestion.export_binary_octree import (
+            BinaryOctreeBuilder, attach_catalog, share_catalog)
+        
+        sizes = []
+        for num_stars in (1000, 100000):
+            builder = make_builder(num_stars=num_stars)
+            builder.sort_by_morton(unit_bounds())
+            blocks, catalog = share_catalog(builder)
+            try:
+                sizes.append(len(pickle.dumps((catalog, builder.subtree_settings()))))
                 
-                for i, expected_star in enumerate(test_stars):
-                    star_data = struct.unpack('ffffi', f.read(20))
-                    
-                    for j, value in enumerate(expected_star):
-                        if j < 4:  # floats
-                            assert np.isclose(star_data[j], value), \
-                                f"Star {i}, field {j}: expected {value}, got {star_data[j]}"
-                        else:  # int
-                            assert star_data[j] == value, \
-                                f"Star {i}, field {j}: expected {value}, got {star_data[j]}"
-        finally:
-            temp_path.unlink()
+                worker = BinaryOctreeBuilder({}, max_depth=builder.max_depth)
+                attached = attach_catalog(worker, catalog)
+                for column in BinaryOctreeBuilder.CATALOG_COLUMNS:
+                    assert np.array_equal(getattr(worker, column), getattr(builder, column))
+                for column in BinaryOctreeBuilder.CATALOG_COLUMNS:
+                    setattr(worker, column, None)
+                for block in attached:
+                    block.close()
+            finally:
+                for block in blocks:
+                    block.close()
+                    block.unlink()
+        
+        assert max(sizes) < 1024
+    
+    def test_parallel_build_exits_after_compiled_kernel(self, tmp_path):
+        """A parallel build after the Morton sort exits instead of hanging at shutdown."""
+        pytest.importorskip("psycopg2")
+        script = textwrap.dedent(f"""
+            import numpy as np
+            from pathlib import Path
+            from src.ingestion.export_binary_octree import BinaryOctreeBuilder, BoundingBox
+            
+            if __name__ == '__main__':
+                rng = np.random.default_rng(1)
+                builder = BinaryOctreeBuilder({{}}, max_depth=3, workers=2)
+                builder.xs, builder.ys, builder.zs = (
+                    rng.uniform(-1, 1, 2000).astype(np.float32) for _ in range(3))
+                builder.mags = rng.uniform(0, 15, 2000).astype(np.float32)
+                builder.status = np.zeros(2000, dtype=np.int32)
+                builder.MAX_STARS_PER_NODE = 200
+                builder.sort_by_morton(BoundingBox(-1, 1, -1, 1, -1, 1))
+                builder.build_octree_parallel(slice(0, 2000), Path({str(tmp_path)!r}))
+        """)
+        result = subprocess.run([sys.executable, "-c", script], cwd=Path(__file__).parent.parent,
+                                capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr
+        assert (tmp_path / "0-0-0-0.bin").exists()
+    
+    def test_record_layout_matches_struct_format(self):
+        """Packed records are byte-identical to struct.pack('ffffi', ...)."""
+        pytest.importorskip("psycopg2")
+        from src.ingestion.export_binary_octree import STAR_RECORD
+        
+        record = np.zeros(1, dtype=STAR_RECORD)
+        record['position'] = (1.5, -2.0, 3.25)
+        record['magnitude'] = 7.5
+        record['epistemic_status'] = 2
+        
+        assert STAR_RECORD.itemsize == 20
+        assert record.tobytes() == struct.pack('<ffffi', 1.5, -2.0, 3.25, 7.5, 2)
+    
+    def test_mmap_and_buffered_writes_match(self, tmp_path, monkeypatch):
+        """Node files written through mmap are identical to buffered writes."""
+        builder = make_builder()
+        node = slice(0, len(builder.xs))
+        
+        builder.export_node_binary(node, tmp_path / "buffered.bin")
+        monkeypatch.setattr(builder, 'MMAP_THRESHOLD', 0)
+        builder.export_node_binary(node, tmp_path / "mapped.bin")
+        
+        buffered = (tmp_path / "buffered.bin").read_bytes()
+        assert len(buffered) == 4 + 20 * len(builder.xs)
+        assert (tmp_path / "mapped.bin").read_bytes() == buffered
+    
+    def test_plain_node_is_memory_mapped(self, tmp_path):
+        """Plain node files are mapped, not copied, and hold the exported records."""
+        from src.ingestion.export_binary_octree import read_node_binary
+        
+        builder = make_builder()
+        builder.export_node_binary(slice(0, len(builder.xs)), tmp_path / "node.bin")
+        builder.export_node_binary(slice(0, 0), tmp_path / "empty.bin")
+        
+        records = read_node_binary(tmp_path / "node.bin")
+        assert isinstance(records, np.memmap)
+        assert not records.flags.writeable
+        assert records.tobytes() == read_node(tmp_path / "node.bin").tobytes()
+        assert records['position'][:, 0].tolist() == builder.xs.tolist()
+        assert len(read_node_binary(tmp_path / "empty.bin")) == 0
+    
+    def test_empty_node_is_constant_header(self, tmp_path):
+        """Nodes without stars are written as the precomputed zero-count header."""
+        from src.ingestion.export_binary_octree import EMPTY_NODE_BYTES as exporter_empty
+        
+        builder = make_builder()
+        builder.export_node_binary(slice(0, 0), tmp_path / "empty.bin")
+        
+        assert exporter_empty == EMPTY_NODE_BYTES
+        assert (tmp_path / "empty.bin").read_bytes() == EMPTY_NODE_BYTES
+        assert builder.node_bytes(slice(5, 5)) is exporter_empty
+    
+    def test_compressed_node_roundtrip(self, tmp_path):
+        """Blosc-compressed node files decompress to the plain records."""
+        pytest.importorskip("blosc")
+        from src.ingestion.export_binary_octree import read_node_binary
+        
+        builder = make_builder()
+        node = slice(0, len(builder.xs))
+        builder.export_node_binary(node, tmp_path / "plain.bin")
+        builder.compress = True
+        builder.export_node_binary(node, tmp_path / "packed.bin")
+        builder.export_node_binary(slice(0, 0), tmp_path / "empty.bin")
+        
+        plain = read_node_binary(tmp_path / "plain.bin")
+        packed = read_node_binary(tmp_path / "packed.bin", compressed=True)
+        assert packed.tobytes() == plain.tobytes()
+        assert (tmp_path / "packed.bin").stat().st_size < (tmp_path / "plain.bin").stat().st_size
+        assert len(read_node_binary(tmp_path / "empty.bin", compressed=True)) == 0
+    
+    def test_half_lod_parent_roundtrip(self, tmp_path, monkeypatch):
+        """--half-lod parents store float16 positions close to the originals; leaves stay exact."""
+        from src.ingestion.export_binary_octree import (
+            LOD_NODE_HEADER, LOD_FORMAT_FLOAT16, LOD_FORMAT_FLOAT32, read_node_binary)
+        
+        builder = make_builder(num_stars=2000)
+        builder.half_lod = True
+        builder.sort_by_morton(unit_bounds())
+        monkeypatch.setattr(builder, 'MAX_STARS_PER_NODE', 500)
+        
+        builder.build_octree(slice(0, len(builder.xs)), tmp_path)
+        
+        root = tmp_path / "0-0-0-0.bin"
+        num_stars, lod_format = LOD_NODE_HEADER.unpack_from(root.read_bytes())[:2]
+        assert lod_format == LOD_FORMAT_FLOAT16
+        assert root.stat().st_size == LOD_NODE_HEADER.size + 14 * num_stars
+        
+        parent = read_node_binary(root, half_lod=True)
+        lod = builder.select_lod_subset(slice(0, len(builder.xs)), builder.LOD_PARENT_FRACTION)
+        expected = np.stack([builder.xs[lod], builder.ys[lod], builder.zs[lod]], axis=1)
+        # float16 keeps 11 significant bits of the frame-relative position
+        assert np.allclose(parent['position'], expected, atol=2.0 / 2048)
+        assert np.array_equal(parent['magnitude'], builder.mags[lod])
+        
+        leaf = tmp_path / "1-0.bin"
+        assert LOD_NODE_HEADER.unpack_from(leaf.read_bytes())[1] == LOD_FORMAT_FLOAT32
+        records = read_node_binary(leaf, half_lod=True)
+        assert np.isin(records['position'][:, 0], builder.xs).all()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,483 @@
+"""
+Epistemic Engine - Build Pipeline Tests
+========================================
+
+PURPOSE: Validate the build orchestrator's phase scheduling
+
+Tests ensure that:
+1. Independent phases are grouped into the same execution level
+2. Dependent phases only run after their prerequisites
+3. Invalid dependency graphs are rejected
+4. Environment probes detect missing files and directories
+5. Worker-pool execution maps scripts to modules and keeps lines intact
+6. The build cache only skips phases whose script, args and outputs match
+7. The scheduler starts phases as soon as their own dependencies finish
+8. The hand-written argument parser agrees with the argparse parser
+9. A real build exits once it has finished
+"""
+
+import io
+import shutil
+import subprocess
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+import run_pipeline
+from run_pipeline import (
+    BUILD_PHASES,
+    BuildOrchestrator,
+    BuildPhase,
+    _PrefixedStream,
+    _run_in_process,
+    _run_module_main,
+    build_parser,
+    compute_execution_levels,
+    critical_path,
+    environment_sentinel,
+    find_existing_paths,
+    is_phase_cached,
+    parse_args,
+    script_module_name,
+    select_phases,
+    write_phase_manifest,
+)
+
+
+def make_phase(script_path, depends_on=None):
+    """Create a minimal BuildPhase for scheduling tests."""
+    return BuildPhase(
+        phase_id=1,
+        name=script_path,
+        script_path=script_path,
+        args=[],
+        success_message=f"{script_path} done",
+        depends_on=depends_on
+    )
+
+
+# =============================================================================
+# DEPENDENCY SCHEDULING TESTS
+# =============================================================================
+
+class TestExecutionLevels:
+    """Test topological grouping of build phases."""
+    
+    def test_independent_phases_share_level(self):
+        """Phases without dependencies all run in the first level."""
+        phases = [make_phase("a.py"), make_phase("b.py"), make_phase("c.py")]
+        
+        levels = compute_execution_levels(phases)
+        
+        assert len(levels) == 1
+        assert [p.script_path for p in levels[0]] == ["a.py", "b.py", "c.py"]
+    
+    def test_dependent_phase_runs_after_prerequisite(self):
+        """A phase is scheduled in a later level than its dependencies."""
+        phases = [
+            make_phase("export.py", depends_on=["ingest.py"]),
+            make_phase("ingest.py"),
+            make_phase("laniakea.py"),
+        ]
+        
+        levels = compute_execution_levels(phases)
+        
+        assert [[p.script_path for p in level] for level in levels] == [
+            ["ingest.py", "laniakea.py"],
+            ["export.py"],
+        ]
+    
+    def test_unselected_dependency_is_satisfied(self):
+        """Dependencies outside the selected phases do not block a run."""
+        phases = [make_phase("octree.py", depends_on=["ingest.py"])]
+        
+        levels = compute_execution_levels(phases)
+        
+        assert [[p.script_path for p in level] for level in levels] == [["octree.py"]]
+    
+    def test_circular_dependency_rejected(self):
+        """A dependency cycle cannot be scheduled."""
+        phases = [
+            make_phase("a.py", depends_on=["b.py"]),
+            make_phase("b.py", depends_on=["a.py"]),
+        ]
+        
+        with pytest.raises(ValueError, match="Circular phase dependencies"):
+            compute_execution_levels(phases)
+    
+    def test_default_pipeline_levels(self):
+        """Database exports wait for Gaia ingestion; generators run first."""
+        levels = compute_execution_levels(BUILD_PHASES)
+        first_level = {p.script_path for p in levels[0]}
+        
+        assert "src/ingestion/generate_sun_path.py" in first_level
+        assert "src/ingestion/generate_cmb_arrow.py" in first_level
+        assert "src/ingestion/generate_laniakea.py" in first_level
+        assert "src/ingestion/export_binary_octree.py" not in first_level
+    
+    def test_critical_path_follows_longest_chain(self):
+        """The critical path is the heaviest dependency chain, not the longest phase."""
+        ingest = make_phase("ingest.py")
+        export = make_phase("export.py", depends_on=["ingest.py"])
+        laniakea = make_phase("laniakea.py")
+        durations = {"ingest.py": 3.0, "export.py": 2.0, "laniakea.py": 4.0}
+        
+        length, path = critical_path([ingest, laniakea, export], durations)
+        
+        assert length == pytest.approx(5.0)
+        assert path == [ingest, export]
+
+
+class TestPhaseSelection:
+    """Test filtering of phases by ID and database requirement."""
+    
+    @pytest.mark.parametrize("include_database, selected, expected", [
+        (False, None, ("generate_sun_path", "generate_cmb_arrow", "generate_laniakea")),
+        (True, None, ("generate_sun_path", "generate_cmb_arrow", "ingest_gaia",
+                      "export_to_speck", "generate_laniakea", "export_binary_octree")),
+        (False, {1}, ("generate_sun_path", "generate_cmb_arrow")),
+        (True, {2, 5}, ("ingest_gaia", "export_to_speck", "export_binary_octree")),
+        (False, {2, 5}, ()),
+        (True, {3}, ()),
+    ])
+    def test_filters_by_id_and_database(self, include_database, selected, expected):
+        """Phases are kept by selected ID and database requirement, in order."""
+        selected = frozenset(selected) if selected is not None else None
+        
+        phases = select_phases(BUILD_PHASES, include_database, selected)
+        
+        assert tuple(script_module_name(p.script_path).rsplit('.', 1)[1]
+                     for p in phases) == expected
+
+
+# =============================================================================
+# ENVIRONMENT CHECK TESTS
+# =============================================================================
+
+class TestEnvironmentProbe:
+    """Test the batched filesystem probe used by check_environment."""
+    
+    def test_existing_and_missing_paths(self, tmp_path):
+        """Present files and directories are found; missing ones are not."""
+        (tmp_path / "src" / "db").mkdir(parents=True)
+        (tmp_path / "src" / "db" / "schema.sql").write_text("-- schema")
+        
+        paths = [
+            str(tmp_path / "src" / "db"),
+            str(tmp_path / "src" / "db" / "schema.sql"),
+            str(tmp_path / "src" / "db" / "missing.sql"),
+            str(tmp_path / "no_such_dir" / "script.py"),
+        ]
+        
+        existing = find_existing_paths(paths)
+        
+        assert existing == set(paths[:2])
+
+
+# =============================================================================
+# WORKER POOL TESTS
+# =============================================================================
+
+class TestWorkerExecution:
+    """Test in-process execution of build scripts."""
+    
+    def test_script_module_name(self):
+        """Script paths map to importable module names."""
+        assert script_module_name("src/ingestion/generate_sun_path.py") == \
+            "src.ingestion.generate_sun_path"
+    
+    def test_every_phase_has_main(self):
+        """All build scripts expose main(argv) for the worker pool."""
+        import importlib
+        import inspect
+        
+        for phase in BUILD_PHASES:
+            try:
+                module = importlib.import_module(script_module_name(phase.script_path))
+            except SystemExit:
+                # Script exits on missing optional dependencies (e.g. psycopg2)
+                continue
+            assert 'argv' in inspect.signature(module.main).parameters
+    
+    def test_prefixed_stream_writes_whole_lines(self):
+        """Partial writes are held back until the line is complete."""
+        target = io.StringIO()
+        stream = _PrefixedStream(target, "[x] ")
+        
+        stream.write("\nfirst")
+        assert target.getvalue() == "[x] \n"
+        
+        stream.write(" line\nsecond\n")
+        stream.write("tail")
+        stream.flush()
+        
+        assert target.getvalue() == "[x] \n[x] first line\n[x] second\n[x] tail"
+    
+    def test_in_process_output_is_prefixed(self, tmp_path, monkeypatch, capsys):
+        """In-process phases get prefixed output and sys.stdout is restored."""
+        import sys
+        
+        (tmp_path / "fake_phase.py").write_text(
+            "import sys\n"
+            "def main(argv=None):\n"
+            "    print('args', argv)\n"
+            "    sys.exit(3)\n"
+        )
+        monkeypatch.syspath_prepend(str(tmp_path))
+        stdout = sys.stdout
+        
+        assert _run_in_process("fake_phase", ["--x"], "[fake] ") == 3
+        assert sys.stdout is stdout
+        assert capsys.readouterr().out == "[fake] args ['--x']\n"
+    
+    def test_module_without_main_falls_back(self):
+        """Modules without main() report None so the caller can use a subprocess."""
+        assert _run_module_main("src.ingestion", []) is None
+
+
+# =============================================================================
+# BUILD CACHE TESTS
+# =============================================================================
+
+class TestBuildCache:
+    """Test skipping of phases whose outputs are up to date."""
+    
+    @pytest.fixture
+    def cached_phase(self, tmp_path, monkeypatch):
+        """A phase with one generated output and a written manifest."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "gen.py").write_text("# generator")
+        (tmp_path / "out.speck").write_text("0 0 0")
+        
+        phase = BuildPhase(
+            phase_id=1,
+            name="gen",
+            script_path="gen.py",
+            args=["--samples", "10"],
+            success_message="gen done",
+            outputs=["out.speck"]
+        )
+        write_phase_manifest(phase, tmp_path / "cache")
+        return phase
+    
+    def test_unchanged_phase_is_cached(self, cached_phase, tmp_path):
+        """Same script, args and outputs hit the cache."""
+        assert is_phase_cached(cached_phase, tmp_path / "cache")
+    
+    def test_changes_invalidate_cache(self, cached_phase, tmp_path):
+        """Different args or modified outputs miss the cache."""
+        cache_dir = tmp_path / "cache"
+        
+        cached_phase.args = ["--samples", "20"]
+        assert not is_phase_cached(cached_phase, cache_dir)
+        
+        cached_phase.args = ["--samples", "10"]
+        (tmp_path / "out.speck").write_text("1 1 1")
+        assert not is_phase_cached(cached_phase, cache_dir)
+    
+    def test_phase_without_outputs_never_cached(self, tmp_path):
+        """Phases that declare no outputs always run."""
+        phase = make_phase("src/ingestion/ingest_gaia.py")
+        write_phase_manifest(phase, tmp_path)
+        
+        assert not is_phase_cached(phase, tmp_path)
+        assert not list(tmp_path.iterdir())
+    
+    def test_environment_sentinel_tracks_requirements(self, tmp_path, monkeypatch):
+        """The environment marker changes when requirements.txt changes."""
+        import os
+        
+        monkeypatch.chdir(tmp_path)
+        assert environment_sentinel(tmp_path) is None
+        
+        (tmp_path / "requirements.txt").write_text("numpy\n")
+        os.utime("requirements.txt", ns=(1, 1))
+        first = environment_sentinel(tmp_path)
+        os.utime("requirements.txt", ns=(2, 2))
+        
+        assert first is not None
+        assert environment_sentinel(tmp_path) != first
+    
+    def test_environment_sentinel_tracks_required_paths(self, tmp_path, monkeypatch):
+        """The marker changes when a required path disappears or NumPy is uninstalled."""
+        import importlib.util
+        
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "requirements.txt").write_text("numpy\n")
+        script = tmp_path / BUILD_PHASES[0].script_path
+        script.parent.mkdir(parents=True)
+        script.write_text("")
+        first = environment_sentinel(tmp_path)
+        
+        script.unlink()
+        assert environment_sentinel(tmp_path) != first
+        
+        script.write_text("")
+        assert environment_sentinel(tmp_path) == first
+        
+        monkeypatch.setattr(importlib.util, 'find_spec', lambda name: None)
+        assert environment_sentinel(tmp_path) != first
+
+
+# =============================================================================
+# SCHEDULER TESTS
+# =============================================================================
+
+class TestScheduler:
+    """Test dependency-driven phase execution."""
+    
+    def run_with(self, monkeypatch, phases, fake_run_script, max_workers):
+        """Run the orchestrator over `phases` with a stubbed run_script."""
+        monkeypatch.setattr(run_pipeline, 'BUILD_PHASES', phases)
+        for var in run_pipeline.BLAS_THREAD_VARS:
+            monkeypatch.setenv(var, "1")
+        monkeypatch.setattr(run_pipeline, 'run_script', fake_run_script)
+        orchestrator = BuildOrchestrator(max_workers=max_workers, use_workers=False)
+        return orchestrator, orchestrator.run()
+    
+    def test_dependent_does_not_wait_for_whole_level(self, monkeypatch):
+        """c.py starts while the unrelated a.py from the first level still runs."""
+        phases = [make_phase("a.py"), make_phase("b.py"),
+                  make_phase("c.py", depends_on=["b.py"])]
+        c_started = threading.Event()
+        
+        def fake_run_script(script_path, args, dry_run=False, prefix="", pool=None,
+                            in_process=False):
+            if script_path == "a.py":
+                assert c_started.wait(timeout=5), "c.py waited for a.py"
+            elif script_path == "c.py":
+                c_started.set()
+            return True, None
+        
+        orchestrator, success = self.run_with(monkeypatch, phases, fake_run_script, 2)
+        
+        assert success
+        assert len(orchestrator.completed_phases) == 3
+    
+    def test_failure_stops_dependents(self, monkeypatch):
+        """Phases depending on a failed phase never start."""
+        phases = [make_phase("a.py"), make_phase("b.py", depends_on=["a.py"])]
+        started = []
+        
+        def fake_run_script(script_path, args, dry_run=False, prefix="", pool=None,
+                            in_process=False):
+            started.append(script_path)
+            return False, "boom"
+        
+        orchestrator, success = self.run_with(monkeypatch, phases, fake_run_script, 2)
+        
+        assert not success
+        assert started == ["a.py"]
+        assert orchestrator.failed_phase is phases[0]
+    
+    def test_gc_paused_only_during_run(self, monkeypatch):
+        """The garbage collector is disabled while phases run and restored after."""
+        import gc
+        
+        states = []
+        
+        def fake_run_script(script_path, args, dry_run=False, prefix="", pool=None,
+                            in_process=False):
+            states.append(gc.isenabled())
+            return True, None
+        
+        self.run_with(monkeypatch, [make_phase("a.py")], fake_run_script, 1)
+        
+        assert states == [False]
+        assert gc.isenabled()
+    
+    def test_gc_resumed_for_in_process_phases(self, monkeypatch):
+        """Build scripts running in the orchestrator keep the garbage collector."""
+        import gc
+        
+        states = []
+        monkeypatch.setattr(run_pipeline, '_call_main',
+                            lambda module_name, args: states.append(gc.isenabled()))
+        
+        gc.disable()
+        try:
+            _run_in_process("fake_phase", [])
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+        
+        assert states == [True]
+    
+    def test_blas_limits_restored_after_run(self, monkeypatch):
+        """Thread limits apply while phases run and are removed afterwards."""
+        import os
+        
+        monkeypatch.setattr(run_pipeline, 'BUILD_PHASES', [make_phase("a.py")])
+        monkeypatch.setenv("OMP_NUM_THREADS", "3")
+        monkeypatch.delenv("OPENBLAS_NUM_THREADS", raising=False)
+        monkeypatch.delenv("MKL_NUM_THREADS", raising=False)
+        seen = []
+        
+        def fake_run_script(script_path, args, dry_run=False, prefix="", pool=None,
+                            in_process=False):
+            seen.append({var: os.environ.get(var) for var in run_pipeline.BLAS_THREAD_VARS})
+            return True, None
+        
+        monkeypatch.setattr(run_pipeline, 'run_script', fake_run_script)
+        assert BuildOrchestrator(max_workers=1, use_workers=False, use_cache=False).run()
+        
+        threads = str(os.cpu_count() or 1)
+        assert seen == [{"OMP_NUM_THREADS": "3", "OPENBLAS_NUM_THREADS": threads,
+                         "MKL_NUM_THREADS": threads}]
+        assert os.environ["OMP_NUM_THREADS"] == "3"
+        assert "OPENBLAS_NUM_THREADS" not in os.environ
+        assert "MKL_NUM_THREADS" not in os.environ
+
+
+# =============================================================================
+# COMMAND LINE TESTS
+# =============================================================================
+
+class TestCommandLine:
+    """Test the fast command-line parser."""
+    
+    @pytest.mark.parametrize("argv", [
+        [],
+        ["--with-database", "--dry-run"],
+        ["--phases", "1,4", "--jobs", "2"],
+        ["--phases=5", "--jobs=3", "--force", "--no-workers", "--force-check"],
+    ])
+    def test_matches_argparse(self, argv):
+        """Valid command lines parse the same as with argparse."""
+        assert vars(parse_args(argv)) == vars(build_parser().parse_args(argv))
+    
+    @pytest.mark.parametrize("argv", [
+        ["--help"],
+        ["--bogus"],
+        ["--jobs"],
+        ["--jobs", "many"],
+        ["--jobs", "0"],
+        ["--jobs", "-1"],
+        ["--jobs=-1"],
+    ])
+    def test_falls_back_to_argparse(self, argv):
+        """Help and invalid input are handled by argparse, which exits."""
+        with pytest.raises(SystemExit):
+            parse_args(argv)
+    
+    def test_pipeline_exits_after_build(self, tmp_path):
+        """A real Phase 1 build exits after its summary instead of hanging at shutdown."""
+        root = Path(__file__).parent.parent
+        shutil.copytree(root / "src", tmp_path / "src",
+                        ignore=shutil.ignore_patterns("__pycache__"))
+        for name in ("run_pipeline.py", "requirements.txt"):
+            shutil.copy(root / name, tmp_path / name)
+        (tmp_path / "data").mkdir()
+        
+        result = subprocess.run([sys.executable, "run_pipeline.py", "--phases", "1", "--force"],
+                                cwd=tmp_path, capture_output=True, text=True, timeout=120)
+        
+        assert result.returncode == 0, result.stdout + result.stderr
+        assert (tmp_path / "data/sun_orbit/sun_galactic_orbit.speck").exists()
+        assert (tmp_path / "data/cmb_vector/cmb_velocity_arrow.obj").exists()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -12,9 +12,90 @@ Tests ensure:
 
 import pytest
 import re
+import warnings
 from pathlib import Path
 
 
+SCHEMA_PATH = Path('src/db/schema.sql')
+
+# Schema patterns, compiled once at import. All but enum_value are written in
+# lower case and run against the lower-cased schema, so none needs IGNORECASE.
+# Gaps between tokens are bounded to one statement ([^;]) or one line, never an
+# unbounded .* over the file.
+SCHEMA_PATTERNS = {
+    # CREATE TYPE epistemic_status_type AS ENUM (...)
+    'enum': re.compile(r'create\s+type\s+epistemic_status_type\s+as\s+enum'),
+    'enum_definition': re.compile(
+        r"create\s+type\s+epistemic_status_type\s+as\s+enum\s*\(([^)]*)\)"),
+    # Enum labels are case-sensitive: matched against the original text
+    'enum_value': re.compile(r'''['"](OBSERVED|INFERRED|SIMULATED)['"]'''),
+    'cosmic_table': re.compile(r'create\s+table[^;]*?cosmic_objects'),
+    # truth_label ... NOT NULL
+    'truth_label_not_null': re.compile(r'truth_label\s+\w+\s+not\s+null'),
+    'provenance_not_null': re.compile(r'provenance\s+jsonb\s+not\s+null'),
+    # location GEOGRAPHY(POINTZ, ...)
+    'location_geography': re.compile(r'location\s+geography\s*\(\s*pointz'),
+    # CREATE INDEX ... ON cosmic_objects (truth_label)
+    'truth_label_index': re.compile(
+        r'create\s+index[^;]*on\s+cosmic_objects\s*\(\s*truth_label\s*\)'),
+    'spatial_index': re.compile(r'create\s+index[^;]*using\s+gist\s*\(\s*location\s*\)'),
+    'geohash_index': re.compile(r'create\s+index[^;\n]*idx_cosmic_geohash\s+on\s+cosmic_objects\s*'
+                                r'\(\s*st_geohash\(location::geometry,\s*20\)\s*\)'),
+    'postgis': re.compile(r'create\s+extension[^;\n]*postgis'),
+    # Every "token present" check, found in one finditer pass (see schema_tokens)
+    'tokens': re.compile(
+        r'(?P<parallax>parallax)'
+        r'|(?P<magnitude>magnitude)'
+        r'|(?P<table_comment>comment\s+on\s+table\s+cosmic_objects)'
+        r'|(?P<enum>epistemic_status_type)'
+        r'|(?P<geography>geography)'
+        r'|(?P<pointz>pointz)'
+        r'|(?P<not_null>truth_label[^\n;]*not\s+null)'
+        r'|(?P<index>index[^\n;]*truth_label)'),
+    # Version or date (YYYY-MM-DD) in a line or block comment
+    'version_comment': re.compile(
+        r'--[^\n]*(?:version|\d{4}-\d{2}-\d{2})'
+        r'|/\*[^*]*version'),
+    # Column names forbidden by Invariant II, matched in one pass
+    'absolute_column': re.compile(r'\babsolute_(?:position|x|y|z)\b'),
+}
+
+# Stored coordinate columns and the PostGIS function that generates each
+GENERATED_COLUMN_PATTERNS = {
+    column: re.compile(rf'{column}\s+double\s+precision\s+generated\s+always\s+as\s*'
+                       rf'\(\s*{function}\(location::geometry\)\s*\)\s*stored')
+    for column, function in (('ra_deg', 'st_x'), ('dec_deg', 'st_y'), ('distance_pc', 'st_z'))
+}
+
+
+@pytest.fixture(scope="session")
+def schema_content():
+    """Load schema.sql file content, once per test session."""
+    try:
+        return SCHEMA_PATH.read_text(encoding='utf-8')
+    except FileNotFoundError:
+        pytest.skip("schema.sql not found")
+
+
+@pytest.fixture(scope="session")
+def schema_content_lower(schema_content):
+    """Lower-cased schema, for plain case-insensitive substring checks."""
+    return schema_content.lower()
+
+
+@pytest.fixture(scope="session")
+def schema_tokens(schema_content_lower):
+    """Names of the token groups found in the schema, from one scan per session."""
+    # Stop scanning as soon as every token has been seen
+    pattern = SCHEMA_PATTERNS['tokens']
+    seen = set()
+    for match in pattern.finditer(schema_content_lower):
+        seen.add(match.lastgroup)
+        if seen.issuperset(pattern.groupindex):
+            break
+    return frozenset(seen)
+
+
 # =============================================================================
 # SCHEMA FILE TESTS
 # =============================================================================
@@ -22,18 +103,7 @@ from pathlib import Path
 class TestDatabaseSchema:
     """Test that database schema enforces Constitutional requirements."""
     
-    @pytest.fixture
-    def schema_content(self):
-        """Load schema.sql file content."""
-        schema_path = Path('src/db/schema.sql')
-        
-        if not schema_path.exists():
-            pytest.skip("schema.sql not found")
-        
-        with open(schema_path, 'r') as f:
-            return f.read()
-    
-    def test_epistemic_status_enum_exists(self, schema_content):
+    def test_epistemic_status_enum_exists(self, schema_content_lower):
         """
         Test that schema defines epistemic_status_type enum.
         
@@ -42,100 +112,87 @@ class TestDatabaseSchema:
         Expected pattern:
             CREATE TYPE epistemic_status_type AS ENUM (...)
         """
-        pattern = r'CREATE\s+TYPE\s+epistemic_status_type\s+AS\s+ENUM'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE), \
+        assert SCHEMA_PATTERNS['enum'].search(schema_content_lower), \
             "Schema must define epistemic_status_type AS ENUM"
     
-    def test_enum_values_correct(self, schema_content):
+    def test_enum_values_correct(self, schema_content, schema_content_lower):
         """
         Test that enum contains exactly OBSERVED, INFERRED, SIMULATED.
         
         Constitution: "Only these three values are legally allowed"
         """
         # Find enum definition
-        pattern = r"CREATE\s+TYPE\s+epistemic_status_type\s+AS\s+ENUM\s*\((.*?)\)"
-        match = re.search(pattern, schema_content, re.IGNORECASE | re.DOTALL)
+        match = SCHEMA_PATTERNS['enum_definition'].search(schema_content_lower)
         
         assert match, "Could not find enum definition"
         
-        enum_values = match.group(1)
-        
-        # Check for required values
-        assert "'OBSERVED'" in enum_values or '"OBSERVED"' in enum_values, \
-            "Enum must include 'OBSERVED'"
-        assert "'INFERRED'" in enum_values or '"INFERRED"' in enum_values, \
-            "Enum must include 'INFERRED'"
-        assert "'SIMULATED'" in enum_values or '"SIMULATED"' in enum_values, \
-            "Enum must include 'SIMULATED'"
+        # Check for required values in one scan, in the original casing
+        values = schema_content[match.start(1):match.end(1)]
+        found = {m.group(1) for m in SCHEMA_PATTERNS['enum_value'].finditer(values)}
+        assert found == {'OBSERVED', 'INFERRED', 'SIMULATED'}, \
+            f"Enum must include 'OBSERVED', 'INFERRED' and 'SIMULATED', found {sorted(found)}"
     
-    def test_cosmic_objects_table_exists(self, schema_content):
+    def test_cosmic_objects_table_exists(self, schema_content_lower):
         """Test that cosmic_objects table is defined."""
-        pattern = r'CREATE\s+TABLE.*cosmic_objects'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE | re.DOTALL), \
+        assert SCHEMA_PATTERNS['cosmic_table'].search(schema_content_lower), \
             "Schema must define cosmic_objects table"
     
-    def test_truth_label_not_null(self, schema_content):
+    def test_truth_label_not_null(self, schema_content_lower):
         """
         Test that truth_label column has NOT NULL constraint.
         
         Constitution Invariant I: "truth_label column is NOT NULL"
         """
         # Find truth_label column definition
-        # Pattern: truth_label ... NOT NULL
-        pattern = r'truth_label\s+\w+\s+NOT\s+NULL'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE), \
+        assert SCHEMA_PATTERNS['truth_label_not_null'].search(schema_content_lower), \
             "truth_label must have NOT NULL constraint"
     
-    def test_provenance_not_null(self, schema_content):
+    def test_provenance_not_null(self, schema_content_lower):
         """
         Test that provenance column has NOT NULL constraint.
         
         Constitution: "Provenance JSONB NOT NULL"
         """
-        pattern = r'provenance\s+JSONB\s+NOT\s+NULL'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE), \
+        assert SCHEMA_PATTERNS['provenance_not_null'].search(schema_content_lower), \
             "provenance must be JSONB NOT NULL"
     
-    def test_location_geography_type(self, schema_content):
+    def test_location_geography_type(self, schema_content_lower):
         """
         Test that location uses GEOGRAPHY type (not GEOMETRY).
         
         Constitution Invariant II: Spherical coordinates (GEOGRAPHY)
         """
-        # Pattern: location GEOGRAPHY(POINTZ, ...)
-        pattern = r'location\s+GEOGRAPHY\s*\(\s*POINTZ'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE), \
+        assert SCHEMA_PATTERNS['location_geography'].search(schema_content_lower), \
             "location must use GEOGRAPHY(POINTZ) for spherical coords"
     
-    def test_epistemic_index_exists(self, schema_content):
+    def test_epistemic_index_exists(self, schema_content_lower):
         """
         Test that index on truth_label exists for Truth Slider queries.
         
         Constitution Invariant III: Indexed for filtering
         """
-        # Pattern: CREATE INDEX ... ON cosmic_objects (truth_label)
-        pattern = r'CREATE\s+INDEX.*ON\s+cosmic_objects\s*\(\s*truth_label\s*\)'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE | re.DOTALL), \
+        assert SCHEMA_PATTERNS['truth_label_index'].search(schema_content_lower), \
             "Must have index on truth_label for Truth Slider performance"
     
-    def test_spatial_index_exists(self, schema_content):
+    def test_spatial_index_exists(self, schema_content_lower):
         """Test that spatial index (GIST) exists on location."""
-        pattern = r'CREATE\s+INDEX.*USING\s+GIST\s*\(\s*location\s*\)'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE | re.DOTALL), \
+        assert SCHEMA_PATTERNS['spatial_index'].search(schema_content_lower), \
             "Must have GIST index on location for spatial queries"
     
-    def test_postgis_extension_enabled(self, schema_content):
+    def test_coordinate_columns_generated(self, schema_content_lower):
+        """Exporters read stored coordinate columns generated from location."""
+        for column, pattern in GENERATED_COLUMN_PATTERNS.items():
+            assert pattern.search(schema_content_lower), \
+                f"{column} must be a stored column generated from location"
+    
+    def test_geohash_order_index(self, schema_content_lower):
+        """The octree export's ORDER BY is backed by an expression index."""
+        assert SCHEMA_PATTERNS['geohash_index'].search(schema_content_lower), \
+            "Must index ST_GeoHash(location::geometry, 20)"
+    
+    def test_postgis_extension_enabled(self, schema_content_lower):
         """Test that PostGIS extension is enabled."""
-        pattern = r'CREATE\s+EXTENSION.*postgis'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE), \
+        assert SCHEMA_PATTERNS['postgis'].search(schema_content_lower), \
             "Must enable PostGIS extension"
 
 
@@ -146,58 +203,30 @@ class TestDatabaseSchema:
 class TestSchemaSemantics:
     """Test semantic correctness of schema design."""
     
-    @pytest.fixture
-    def schema_content(self):
-        """Load schema.sql file content."""
-        schema_path = Path('src/db/schema.sql')
-        
-        if not schema_path.exists():
-            pytest.skip("schema.sql not found")
-        
-        with open(schema_path, 'r') as f:
-            return f.read()
-    
-    def test_no_absolute_coordinates_column(self, schema_content):
+    def test_no_absolute_coordinates_column(self, schema_content_lower):
         """
         Test that schema does not have 'absolute_*' coordinate columns.
         
         Constitution Invariant II: "Absolute coordinates are forbidden"
         """
-        # Check for suspicious column names
-        forbidden_patterns = [
-            r'\babsolute_position\b',
-            r'\babsolute_x\b',
-            r'\babsolute_y\b',
-            r'\babsolute_z\b'
-        ]
-        
-        for pattern in forbidden_patterns:
-            assert not re.search(pattern, schema_content, re.IGNORECASE), \
-                f"Schema must not contain absolute coordinate columns: {pattern}"
+        # Check for suspicious column names (search stops at the first one)
+        match = SCHEMA_PATTERNS['absolute_column'].search(schema_content_lower)
+        assert match is None, \
+            f"Schema must not contain absolute coordinate columns: {match.group(0)}"
     
-    def test_parallax_column_exists(self, schema_content):
-        """
-        Test that parallax column exists (for distance calculation).
-        
-        Parallax is the OBSERVED quantity; distance is INFERRED from it.
-        """
-        pattern = r'\bparallax'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE), \
-            "Schema should store parallax (observed quantity)"
+    @pytest.mark.parametrize("column, purpose", [
+        # Parallax is the OBSERVED quantity; distance is INFERRED from it
+        ('parallax', "observed quantity"),
+        ('magnitude', "brightness filtering"),
+    ])
+    def test_required_column_present(self, schema_tokens, column, purpose):
+        """Test that columns needed for distance and brightness queries exist."""
+        assert column in schema_tokens, \
+            f"Schema should store {column} ({purpose})"
     
-    def test_magnitude_column_exists(self, schema_content):
-        """Test that magnitude column exists (for brightness queries)."""
-        pattern = r'\bmagnitude'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE), \
-            "Schema should store magnitude for brightness filtering"
-    
-    def test_comment_on_table(self, schema_content):
+    def test_comment_on_table(self, schema_tokens):
         """Test that table has explanatory comment."""
-        pattern = r'COMMENT\s+ON\s+TABLE\s+cosmic_objects'
-        
-        assert re.search(pattern, schema_content, re.IGNORECASE), \
+        assert 'table_comment' in schema_tokens, \
             "Table should have descriptive comment"
 
 
@@ -208,18 +237,7 @@ class TestSchemaSemantics:
 class TestConstitutionalCompliance:
     """High-level validation against Constitutional requirements."""
     
-    @pytest.fixture
-    def schema_content(self):
-        """Load schema.sql file content."""
-        schema_path = Path('src/db/schema.sql')
-        
-        if not schema_path.exists():
-            pytest.skip("schema.sql not found")
-        
-        with open(schema_path, 'r') as f:
-            return f.read()
-    
-    def test_all_invariants_enforced(self, schema_content):
+    def test_all_invariants_enforced(self, schema_tokens):
         """
         Comprehensive test that all three invariants are present.
         
@@ -228,31 +246,22 @@ class TestConstitutionalCompliance:
         Invariant III: Index on truth_label
         """
         # Check Invariant I
-        assert 'epistemic_status_type' in schema_content, "Missing Invariant I (enum)"
-        assert re.search(r'truth_label.*NOT\s+NULL', schema_content, re.IGNORECASE), \
-            "Missing Invariant I (NOT NULL)"
+        assert 'enum' in schema_tokens, "Missing Invariant I (enum)"
+        assert 'not_null' in schema_tokens, "Missing Invariant I (NOT NULL)"
         
         # Check Invariant II
-        assert 'GEOGRAPHY' in schema_content, "Missing Invariant II (GEOGRAPHY type)"
-        assert 'POINTZ' in schema_content, "Missing Invariant II (POINTZ for 3D)"
+        assert 'geography' in schema_tokens, "Missing Invariant II (GEOGRAPHY type)"
+        assert 'pointz' in schema_tokens, "Missing Invariant II (POINTZ for 3D)"
         
         # Check Invariant III
-        assert re.search(r'INDEX.*truth_label', schema_content, re.IGNORECASE), \
-            "Missing Invariant III (truth_label index)"
+        assert 'index' in schema_tokens, "Missing Invariant III (truth_label index)"
     
-    def test_schema_has_version_or_date(self, schema_content):
+    def test_schema_has_version_or_date(self, schema_content_lower):
         """Test that schema includes version info or date in comments."""
-        # Look for common version/date patterns in comments
-        has_version_info = (
-            re.search(r'--.*version', schema_content, re.IGNORECASE) or
-            re.search(r'--.*\d{4}-\d{2}-\d{2}', schema_content) or  # Date: YYYY-MM-DD
-            re.search(r'/\*.*version', schema_content, re.IGNORECASE)
-        )
-        
-        # This is a good practice but not strictly required
-        # So we just warn if missing
-        if not has_version_info:
-            pytest.warns(UserWarning, match="Schema should include version/date")
+        # This is a good practice but not strictly required,
+        # so we only warn if missing
+        if not SCHEMA_PATTERNS['version_comment'].search(schema_content_lower):
+            warnings.warn("Schema should include version/date", UserWarning)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,249 @@
+"""
+Epistemic Engine - .speck Export Tests
+=======================================
+
+PURPOSE: Validate the Gaia .speck exporter without a database
+
+Tests ensure that:
+1. Vectorized coordinate conversion matches the per-star formula
+2. Luminosity is clamped to [0, 1]
+3. Query results are streamed into per-column arrays
+4. Exported rows keep the documented x y z colorb_v lum format
+5. Bulk row formatting matches the per-star format exactly
+6. Mixed epistemic status and gzip output keep the same rows
+7. Binary records hold the same values as the text rows
+8. The compiled coordinate kernel matches the NumPy version, and a single
+   star converted with math matches the array result
+"""
+
+import math
+
+import numpy as np
+import pytest
+
+psycopg2 = pytest.importorskip("psycopg2")
+
+from src.ingestion.export_to_speck import SpeckExporter
+
+
+def make_stars(num_stars=200, seed=7):
+    """Create column arrays shaped like SpeckExporter.query_stars() results."""
+    rng = np.random.default_rng(seed)
+    return {
+        'epistemic_status': (np.arange(num_stars) % 3).astype(np.int32),
+        'ra': rng.uniform(0.0, 360.0, num_stars),
+        'dec': rng.uniform(-90.0, 90.0, num_stars),
+        'distance_pc': rng.uniform(1.0, 1000.0, num_stars),
+        'magnitude_g': rng.uniform(-2.0, 18.0, num_stars),
+        'color_bp_rp': rng.uniform(0.0, 3.0, num_stars),
+    }
+
+
+# =============================================================================
+# CONVERSION TESTS
+# =============================================================================
+
+class TestSpeckConversion:
+    """Test coordinate and luminosity conversion."""
+    
+    def test_vectorized_matches_scalar(self):
+        """Array conversion gives the same result as the per-star formula."""
+        exporter = SpeckExporter({})
+        stars = make_stars()
+        
+        x, y, z = exporter.spherical_to_cartesian(
+            stars['ra'], stars['dec'], stars['distance_pc']
+        )
+        
+        for i in range(len(stars['ra'])):
+            ra_r = math.radians(stars['ra'][i])
+            dec_r = math.radians(stars['dec'][i])
+            d = stars['distance_pc'][i]
+            assert x[i] == pytest.approx(d * math.cos(dec_r) * math.cos(ra_r))
+            assert y[i] == pytest.approx(d * math.cos(dec_r) * math.sin(ra_r))
+            assert z[i] == pytest.approx(d * math.sin(dec_r))
+    
+    def test_scalar_matches_array(self):
+        """A single star goes through the math path and matches the array result."""
+        exporter = SpeckExporter({})
+        stars = make_stars(num_stars=5)
+        
+        x, y, z = exporter.spherical_to_cartesian(
+            stars['ra'], stars['dec'], stars['distance_pc'])
+        scalar = exporter.spherical_to_cartesian(
+            float(stars['ra'][3]), float(stars['dec'][3]), float(stars['distance_pc'][3]))
+        
+        assert all(type(value) is float for value in scalar)
+        assert scalar == pytest.approx((x[3], y[3], z[3]), rel=1e-12)
+    
+    def test_compiled_kernel_matches_numpy(self):
+        """The numba kernel gives the same positions as the NumPy version."""
+        pytest.importorskip("numba")
+        from src.ingestion.export_to_speck import (
+            _spherical_to_cartesian_compiled, _spherical_to_cartesian_numpy)
+        stars = make_stars()
+        stars['distance_pc'][0] = np.nan
+        args = (stars['ra'], stars['dec'], stars['distance_pc'])
+        
+        compiled = np.array(_spherical_to_cartesian_compiled(*args))
+        expected = np.array(_spherical_to_cartesian_numpy(*args))
+        # fastmath may reorder the arithmetic: compare at the distance scale
+        assert np.allclose(compiled, expected, rtol=0, atol=1e-9 * 1000.0, equal_nan=True)
+        assert np.isnan(compiled[:, 0]).all()
+    
+    def test_luminosity_clamped(self):
+        """Very bright and very faint stars are clamped to [0, 1]."""
+        exporter = SpeckExporter({})
+        lum = exporter.magnitude_to_luminosity(np.array([-5.0, 0.0, 7.5, 15.0, 20.0]))
+        
+        assert lum.tolist() == [1.0, 1.0, 0.5, 0.0, 0.0]
+
+
+# =============================================================================
+# QUERY TESTS
+# =============================================================================
+
+class FakeNamedCursor:
+    """Minimal stand-in for a psycopg2 server-side cursor."""
+    
+    def __init__(self, rows):
+        self.rows = list(rows)
+        self.itersize = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        return False
+    
+    def execute(self, query, params):
+        self.query, self.params = query, params
+    
+    def fetchmany(self, size):
+        block, self.rows = self.rows[:size], self.rows[size:]
+        return block
+
+
+class FakeConnection:
+    """Hands out a FakeNamedCursor over fixed rows."""
+    
+    def __init__(self, rows):
+        self.cursor_obj = FakeNamedCursor(rows)
+    
+    def cursor(self, name=None):
+        assert name is not None, "query_stars must use a server-side cursor"
+        return self.cursor_obj
+
+
+class TestSpeckQuery:
+    """Test streaming of query results into column arrays."""
+    
+    def test_blocks_collected_into_columns(self, monkeypatch):
+        """Rows fetched in several blocks end up in one array per column."""
+        rows = [(0, float(i), -float(i), 10.0 + i, 5.0, None) for i in range(5)]
+        exporter = SpeckExporter({})
+        exporter.conn = FakeConnection(rows)
+        monkeypatch.setattr(exporter, 'FETCH_BLOCK_SIZE', 2)
+        
+        stars = exporter.query_stars(magnitude_limit=10.0)
+        
+        assert set(stars) == set(SpeckExporter.STAR_COLUMNS)
+        assert stars['ra'].tolist() == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert stars['epistemic_status'].dtype == np.int32
+        assert stars['epistemic_status'].tolist() == [0] * 5
+        assert np.isnan(stars['color_bp_rp']).all()
+        assert exporter.conn.cursor_obj.params == ['OBSERVED', 10.0]
+        assert ("CASE truth_label WHEN 'OBSERVED' THEN 0 WHEN 'INFERRED' THEN 1 "
+                "WHEN 'SIMULATED' THEN 2 END") in exporter.conn.cursor_obj.query
+        # NULL magnitudes are replaced in the query, so no row is written as nan
+        assert "COALESCE(magnitude_g, 15.0) AS magnitude_g" in exporter.conn.cursor_obj.query
+
+
+# =============================================================================
+# EXPORT TESTS
+# =============================================================================
+
+class TestSpeckExport:
+    """Test the written .speck file."""
+    
+    def test_rows_match_stars(self, tmp_path):
+        """One data row per star with epistemic color and 5 columns."""
+        exporter = SpeckExporter({})
+        stars = make_stars()
+        output = tmp_path / "stars.speck"
+        
+        exporter.export_to_speck(stars, str(output))
+        
+        lines = output.read_text().splitlines()
+        assert "datavar 0 colorb_v  # Epistemic color (1.0 = OBSERVED)" in lines
+        rows = [line.split() for line in lines
+                if line and not line.startswith('#') and not line.startswith('datavar')]
+        assert len(rows) == len(stars['ra'])
+        
+        for row, status in zip(rows, stars['epistemic_status']):
+            label = SpeckExporter.EPISTEMIC_LABELS[status]
+            assert len(row) == 5
+            assert float(row[3]) == SpeckExporter.EPISTEMIC_COLORS[label]
+            assert 0.0 <= float(row[4]) <= 1.0
+    
+    def test_bulk_rows_match_per_star_format(self, tmp_path, monkeypatch):
+        """Block-formatted rows are identical to formatting each star on its own."""
+        exporter = SpeckExporter({})
+        monkeypatch.setattr(exporter, 'FORMAT_BLOCK_SIZE', 64)
+        stars = make_stars()
+        output = tmp_path / "stars.speck"
+        
+        exporter.export_to_speck(stars, str(output))
+        
+        x, y, z = exporter.spherical_to_cartesian(
+            stars['ra'], stars['dec'], stars['distance_pc'])
+        lum = exporter.magnitude_to_luminosity(stars['magnitude_g'])
+        expected = [
+            f"{x[i]:.6e} {y[i]:.6e} {z[i]:.6e} "
+            f"{SpeckExporter.STATUS_COLORS[stars['epistemic_status'][i]]:.3f} {lum[i]:.6f}"
+            for i in range(len(x))
+        ]
+        lines = output.read_text().splitlines()
+        assert lines[-len(expected):] == expected
+    
+    def test_mixed_status_runs_and_gzip(self, tmp_path):
+        """Runs of different status keep their order; .gz output matches plain text."""
+        import gzip
+        
+        exporter = SpeckExporter({})
+        stars = make_stars(num_stars=50)
+        stars['epistemic_status'] = np.repeat([0, 2, 0, 1], [10, 5, 20, 15]).astype(np.int32)
+        
+        exporter.export_to_speck(stars, str(tmp_path / "stars.speck"))
+        exporter.export_to_speck(stars, str(tmp_path / "stars.speck.gz"))
+        
+        plain = (tmp_path / "stars.speck").read_text().splitlines()
+        colors = [float(line.split()[3]) for line in plain[-50:]]
+        assert colors == SpeckExporter.STATUS_COLORS[stars['epistemic_status']].tolist()
+        
+        packed = gzip.decompress((tmp_path / "stars.speck.gz").read_bytes()).decode()
+        strip_date = lambda lines: [l for l in lines if not l.startswith('# Generated')]
+        assert strip_date(packed.splitlines()) == strip_date(plain)
+    
+    def test_binary_records_match_text_rows(self, tmp_path):
+        """--binary writes float32 x y z colorb_v lum records and a header sidecar."""
+        exporter = SpeckExporter({})
+        stars = make_stars()
+        
+        exporter.export_to_speck(stars, str(tmp_path / "stars.speck"))
+        exporter.export_to_speck_binary(stars, str(tmp_path / "stars.bin"))
+        
+        text = np.array([line.split() for line in
+                         (tmp_path / "stars.speck").read_text().splitlines()[-len(stars['ra']):]],
+                        dtype=np.float64)
+        records = np.fromfile(tmp_path / "stars.bin", dtype='<f4').reshape(-1, 5)
+        assert (tmp_path / "stars.bin").stat().st_size == 20 * len(stars['ra'])
+        assert np.allclose(records, text, rtol=1e-5, atol=1e-3)
+        
+        header = (tmp_path / "stars.bin.header").read_text()
+        assert "datavar 1 lum" in header
+        assert "# Binary records: stars.bin" in header
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])
@@ -0,0 +1,89 @@
+"""
+Epistemic Engine - Sun Galactic Orbit Tests
+============================================
+
+PURPOSE: Validate the Sun's galactic orbit generator
+
+Tests ensure that:
+1. The orbit stays on the 8.5 kpc circle with the documented vertical oscillation,
+   and reports the range of its samples' z
+2. .speck and .csv exports keep the per-row text format
+3. The compiled orbit kernel matches the NumPy version
+"""
+
+import numpy as np
+import pytest
+
+from src.ingestion.generate_sun_path import SunGalacticOrbitGenerator
+
+
+# =============================================================================
+# ORBIT TESTS
+# =============================================================================
+
+class TestOrbit:
+    """Test the generated helical path."""
+    
+    def test_circular_orbit_with_vertical_oscillation(self):
+        """Positions lie on the orbital circle; z follows the vertical sine."""
+        generator = SunGalacticOrbitGenerator(num_samples=1000, time_span_myr=230.0)
+        
+        data = generator.generate_orbit()
+        times = data['times_myr']
+        
+        assert len(times) == 1000
+        assert np.allclose(np.hypot(data['x_pc'], data['y_pc']), 8500.0)
+        assert np.allclose(data['z_pc'], 400.0 * np.sin(2 * np.pi * times / 60.0))
+        for axis in 'xyz':
+            assert data[f'{axis}_pc'].flags.c_contiguous
+        assert data['metadata'].z_range_pc == (data['z_pc'].min(), data['z_pc'].max())
+    
+    def test_compiled_orbit_kernel_matches_numpy(self):
+        """The numba kernel writes the same positions as the NumPy version."""
+        pytest.importorskip("numba")
+        from src.ingestion.generate_sun_path import _fill_orbit_compiled, _fill_orbit_numpy
+        
+        args = (2 * np.pi * 460.0 / 230.0, 2 * np.pi * 460.0 / 60.0, 8500.0, 400.0)
+        out_pc, expected_pc = np.empty((3, 1001)), np.empty((3, 1001))
+        
+        z_range = _fill_orbit_compiled(out_pc, *args)
+        expected_z_range = _fill_orbit_numpy(expected_pc, *args)
+        # fastmath may reorder the angle arithmetic: compare at the orbit's scale
+        assert np.allclose(out_pc, expected_pc, rtol=0, atol=1e-9 * 8500.0)
+        assert np.allclose(z_range, expected_z_range)
+        assert z_range == (out_pc[2].min(), out_pc[2].max())
+        assert _fill_orbit_compiled(np.empty((3, 0)), *args) == (np.inf, -np.inf)
+
+
+# =============================================================================
+# EXPORT TESTS
+# =============================================================================
+
+class TestExport:
+    """Test the written .speck and .csv files."""
+    
+    def test_rows_match_per_sample_format(self, tmp_path):
+        """Bulk-written rows equal formatting each sample on its own."""
+        generator = SunGalacticOrbitGenerator(num_samples=200)
+        data = generator.generate_orbit()
+        
+        generator.export_to_speck(tmp_path / "orbit.speck", data)
+        generator.export_to_csv(tmp_path / "orbit.csv", data)
+        
+        times = data['times_myr']
+        positions_pc = np.column_stack([data['x_pc'], data['y_pc'], data['z_pc']])
+        positions_m = positions_pc * generator.PC_TO_M
+        speck_rows = [line for line in (tmp_path / "orbit.speck").read_text().splitlines()
+                      if not line.startswith('#')]
+        assert speck_rows == [
+            f"{t:.6f} {x:.6e} {y:.6e} {z:.6e}" for t, (x, y, z) in zip(times, positions_m)]
+        
+        csv_lines = (tmp_path / "orbit.csv").read_text().splitlines()
+        assert csv_lines[0] == "time_myr,x_pc,y_pc,z_pc,x_m,y_m,z_m"
+        assert csv_lines[1:] == [
+            f"{t:.6f},{p[0]:.6e},{p[1]:.6e},{p[2]:.6e},{m[0]:.6e},{m[1]:.6e},{m[2]:.6e}"
+            for t, p, m in zip(times, positions_pc, positions_m)]
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v'])